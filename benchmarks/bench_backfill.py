@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark the parallel mmap backfill scan at different worker counts.
+
+Run from the repository root:
+    python -m benchmarks.bench_backfill [size_mb]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from src.agents import SecurityAgent
+from src.monitoring.backfill import scan_log_file
+
+
+def write_log(path, size_mb):
+    """Write a synthetic log of roughly size_mb megabytes"""
+    lines = [
+        "[2024-01-20 10:30:00] INFO: Normal system operation\n",
+        "[2024-01-20 10:30:01] WARNING: High CPU usage detected\n",
+        "[2024-01-20 10:30:02] ERROR: Database connection failed\n",
+    ] * 33 + ["[2024-01-20 10:30:03] ALERT: Smoke detected in server room\n"]
+    block = "".join(lines).encode()
+    with open(path, "wb") as f:
+        for _ in range(size_mb * 1024 * 1024 // len(block)):
+            f.write(block)
+
+
+def run_benchmark(size_mb=256):
+    detector = SecurityAgent().detector
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "history.log")
+        write_log(path, size_mb)
+        size = os.path.getsize(path)
+
+        print(f"{'workers':>8} {'MB/s':>10} {'anomalies':>10}")
+        worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+        for workers in worker_counts:
+            start = time.perf_counter()
+            anomalies = scan_log_file(path, detector, workers=workers)
+            elapsed = time.perf_counter() - start
+            rate = size / elapsed / (1024 * 1024)
+            print(f"{workers:>8} {rate:>10,.1f} {len(anomalies):>10}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark DurableMessageQueue send throughput, ack cost and replay time.
+
+Modes:
+  group commit    send_message() returns at once; fsync every 5 ms
+  send_many(100)  sync_on_send: each batch of 100 waits for its fsync
+  8 threads sync  sync_on_send: 8 senders share fsyncs (group commit)
+
+Run from the repository root:
+    python -m benchmarks.bench_durable_queue
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+
+from src.agents.base_agent import Message, MessagePriority, MessageType
+from src.communication.durable_queue import DurableMessageQueue
+from src.communication.message_queue import MessageQueue
+
+
+def make_messages(count):
+    return [
+        Message(
+            "security",
+            "admin",
+            MessageType.ALERT,
+            {
+                "anomaly": {
+                    "type": "security",
+                    "description": f"Failed login attempt from 10.0.0.{i % 256}",
+                    "severity": "high",
+                },
+                "message": "Alert!",
+            },
+            priority=MessagePriority.HIGH,
+        )
+        for i in range(count)
+    ]
+
+
+def timed(queue, send):
+    queue.register_agent("admin")
+    start = time.perf_counter()
+    send(queue)
+    if isinstance(queue, DurableMessageQueue):
+        queue.log.commit()
+    return time.perf_counter() - start
+
+
+def bench(name, count, make_queue, send):
+    directory = tempfile.mkdtemp(prefix="bench_wal_")
+    try:
+        queue = make_queue(directory)
+        elapsed = timed(queue, send)
+        print(f"{name:>18} {count / elapsed:>12,.0f}")
+        return queue, directory
+    except BaseException:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+
+def run_benchmark(count=200000):
+    messages = make_messages(count)
+    print(f"messages: {count:,}")
+    print(f"{'mode':>18} {'msg/s':>12}")
+
+    def send_each(queue):
+        for message in messages:
+            queue.send_message(message)
+
+    def send_batches(queue):
+        for start in range(0, count, 100):
+            queue.send_many(messages[start : start + 100])
+
+    def send_threads(queue, threads=8):
+        share = count // threads
+        workers = [
+            threading.Thread(
+                target=lambda chunk: [queue.send_message(m) for m in chunk],
+                args=(messages[i * share : (i + 1) * share],),
+            )
+            for i in range(threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    _, directory = bench("in-memory", count, lambda d: MessageQueue(), send_each)
+    shutil.rmtree(directory)
+
+    queue, directory = bench("group commit", count, DurableMessageQueue, send_each)
+    # Acknowledge half, then "crash" (no close) and measure replay
+    start = time.perf_counter()
+    for _ in range(count // 200):
+        queue.ack("admin", queue.get_messages("admin", 100))
+    ack_elapsed = time.perf_counter() - start
+    queue.log.commit()
+    start = time.perf_counter()
+    replayed = DurableMessageQueue(directory)
+    replay_elapsed = time.perf_counter() - start
+    print(f"{'ack (batches of 100)':>18} {count // 2 / ack_elapsed:>12,.0f}")
+    print(
+        f"replayed {replayed.replayed:,} of {count:,} in {replay_elapsed:.2f}s"
+        f" ({replayed.wal_metrics()['segments']} segments)"
+    )
+    replayed.close()
+    queue.log.close()
+    shutil.rmtree(directory)
+
+    for name, send in (
+        ("send_many(100)", send_batches),
+        ("8 threads sync", send_threads),
+    ):
+        queue, directory = bench(
+            name,
+            count,
+            lambda d: DurableMessageQueue(d, sync_on_send=True),
+            send,
+        )
+        queue.close()
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run_benchmark()
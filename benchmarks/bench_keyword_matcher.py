@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled KeywordMatcher against the original per-keyword loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_keyword_matcher
+"""
+
+import random
+import string
+import time
+
+from src.monitoring.keyword_matcher import KeywordMatcher
+
+
+def make_patterns(num_keywords, rng):
+    """Build a two-category pattern table with num_keywords random keywords"""
+    keywords = set()
+    while len(keywords) < num_keywords:
+        length = rng.randint(5, 12)
+        keywords.add("".join(rng.choices(string.ascii_lowercase, k=length)))
+    keywords = sorted(keywords)
+    half = len(keywords) // 2
+    return {"fire": keywords[:half], "security": keywords[half:]}
+
+
+def make_lines(patterns, num_lines, rng, hit_ratio=0.05):
+    """Build log lines where roughly hit_ratio of them contain a keyword"""
+    all_keywords = [kw for kws in patterns.values() for kw in kws]
+    lines = []
+    for i in range(num_lines):
+        message = "Normal system operation on node %d" % rng.randint(0, 999)
+        if rng.random() < hit_ratio:
+            message += " " + rng.choice(all_keywords).upper()
+        lines.append(f"[2024-01-20 10:30:{i % 60:02d}] INFO: {message}")
+    return lines
+
+
+def naive_scan(patterns, lines):
+    """The original SecurityAgent.detect_anomalies keyword loop"""
+    hits = 0
+    for line in lines:
+        for category, keywords in patterns.items():
+            for keyword in keywords:
+                if keyword in line.lower():
+                    hits += 1
+                    break
+    return hits
+
+
+def matcher_scan(matcher, lines):
+    hits = 0
+    for line in lines:
+        hits += len(matcher.match(line))
+    return hits
+
+
+def run_benchmark(num_lines=20000, keyword_counts=(10, 100, 1000)):
+    rng = random.Random(42)
+    print(f"{'keywords':>10} {'naive lines/s':>15} {'matcher lines/s':>17} {'speedup':>9}")
+    for num_keywords in keyword_counts:
+        patterns = make_patterns(num_keywords, rng)
+        lines = make_lines(patterns, num_lines, rng)
+
+        start = time.perf_counter()
+        naive_hits = naive_scan(patterns, lines)
+        naive_elapsed = time.perf_counter() - start
+
+        matcher = KeywordMatcher(patterns)
+        start = time.perf_counter()
+        matcher_hits = matcher_scan(matcher, lines)
+        matcher_elapsed = time.perf_counter() - start
+
+        assert naive_hits == matcher_hits, (naive_hits, matcher_hits)
+
+        naive_rate = num_lines / naive_elapsed
+        matcher_rate = num_lines / matcher_elapsed
+        print(
+            f"{num_keywords:>10} {naive_rate:>15,.0f} {matcher_rate:>17,.0f} "
+            f"{matcher_rate / naive_rate:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
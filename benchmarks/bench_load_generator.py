@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Benchmark LoadGenerator throughput writing unthrottled to /dev/null.
+
+Run from the repository root:
+    python -m benchmarks.bench_load_generator
+"""
+
+import os
+import time
+
+from log_monitoring.log_generator import LoadGenerator
+
+TARGET_LINES_PER_SEC = 500000
+
+
+def run_benchmark(rate=100000, duration=30):
+    print(f"{'profile':>10} {'lines':>12} {'lines/s':>12}")
+    for profile in LoadGenerator.PROFILES:
+        generator = LoadGenerator(rate=rate, profile=profile, seed=42)
+        start = time.perf_counter()
+        written = generator.write(os.devnull, duration, realtime=False)
+        elapsed = time.perf_counter() - start
+        print(f"{profile:>10} {written:>12,} {written / elapsed:>12,.0f}")
+    print(f"target: {TARGET_LINES_PER_SEC:,} lines/s")
+
+
+if __name__ == "__main__":
+    run_benchmark()
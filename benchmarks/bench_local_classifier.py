@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark LocalClassifier training time, held-out accuracy and routing
+decisions/sec (single incidents and batches).
+
+Run from the repository root:
+    python -m benchmarks.bench_local_classifier
+"""
+
+import random
+import time
+
+from src.routing.local_classifier import LocalClassifier
+
+FIRE_PHRASES = [
+    "Smoke detected in server room",
+    "Temperature high in rack {n}",
+    "Heat detected near power supply {n}",
+    "Fire alarm triggered on floor {n}",
+    "Burning smell reported in data hall {n}",
+]
+SECURITY_PHRASES = [
+    "Unauthorized access attempt from 10.0.0.{n}",
+    "Intrusion detected on host web-{n}",
+    "Suspicious activity by user admin{n}",
+    "Possible breach of database db-{n}",
+    "Repeated failed login for user ops{n}",
+]
+
+
+def make_incidents(count, seed=42):
+    """Synthetic incidents with a small share of misleading type fields"""
+    rng = random.Random(seed)
+    anomalies, labels = [], []
+    for _ in range(count):
+        is_fire = rng.random() < 0.5
+        phrase = rng.choice(FIRE_PHRASES if is_fire else SECURITY_PHRASES)
+        anomaly_type = "fire" if is_fire else "security"
+        if rng.random() < 0.05:
+            anomaly_type = "unknown"
+        anomalies.append(
+            {
+                "type": anomaly_type,
+                "description": phrase.format(n=rng.randrange(100)),
+                "severity": rng.choice(["low", "medium", "high"]),
+            }
+        )
+        labels.append("firefighter" if is_fire else "police")
+    return anomalies, labels
+
+
+def run_benchmark(num_train=20000, num_test=20000):
+    anomalies, labels = make_incidents(num_train + num_test)
+    train_x, train_y = anomalies[:num_train], labels[:num_train]
+    test_x, test_y = anomalies[num_train:], labels[num_train:]
+
+    model = LocalClassifier()
+    start = time.perf_counter()
+    model.fit(train_x, train_y)
+    train_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for anomaly in test_x:
+        model.classify(anomaly)
+    single_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.predict_proba(test_x)
+    batch_elapsed = time.perf_counter() - start
+
+    report = model.evaluate(test_x, test_y)
+    print(f"training:            {num_train:,} incidents in {train_elapsed:.2f}s")
+    print(f"accuracy:            {report['accuracy']:.3f}")
+    print(
+        f"coverage @ {model.threshold:.2f}:     {report['coverage']:.3f}"
+        f" (accuracy {report['confident_accuracy']:.3f})"
+    )
+    print(f"decisions/s single:  {num_test / single_elapsed:>10,.0f}")
+    print(f"decisions/s batch:   {num_test / batch_elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark StructuredLogParser against naive per-line datetime.strptime.
+
+Run from the repository root:
+    python -m benchmarks.bench_log_record
+"""
+
+import re
+import time
+from datetime import datetime, timedelta
+
+from src.monitoring.log_record import StructuredLogParser
+
+NAIVE_PATTERN = re.compile(r"^\[(.*?)\] (\w+): (.*)$")
+
+
+def make_lines(num_lines, lines_per_second=1000):
+    """LogGenerator-style lines, lines_per_second lines sharing each second"""
+    start = datetime(2024, 1, 20, 10, 30, 0)
+    levels = ["INFO", "WARNING", "ERROR", "ALERT"]
+    lines = []
+    for i in range(num_lines):
+        stamp = (start + timedelta(seconds=i // lines_per_second)).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        lines.append(f"[{stamp}] {levels[i % 4]}: event number {i}")
+    return lines
+
+
+def naive_parse(lines):
+    records = []
+    for line in lines:
+        match = NAIVE_PATTERN.match(line)
+        timestamp = datetime.strptime(
+            match.group(1), "%Y-%m-%d %H:%M:%S"
+        ).timestamp()
+        records.append((timestamp, match.group(2), match.group(3)))
+    return records
+
+
+def run_benchmark(num_lines=200000):
+    lines = make_lines(num_lines)
+
+    start = time.perf_counter()
+    naive = naive_parse(lines)
+    naive_elapsed = time.perf_counter() - start
+
+    parser = StructuredLogParser()
+    start = time.perf_counter()
+    parsed = [parser.parse(line) for line in lines]
+    parsed_elapsed = time.perf_counter() - start
+
+    assert [tuple(r) for r in parsed] == naive
+
+    start = time.perf_counter()
+    kept = sum(1 for _ in parser.iter_records(lines, skip_levels={"INFO"}))
+    filtered_elapsed = time.perf_counter() - start
+
+    print(f"{'parser':>24} {'lines/s':>12}")
+    print(f"{'naive strptime':>24} {num_lines / naive_elapsed:>12,.0f}")
+    print(f"{'StructuredLogParser':>24} {num_lines / parsed_elapsed:>12,.0f}")
+    print(
+        f"{'  skipping INFO':>24} {num_lines / filtered_elapsed:>12,.0f}"
+        f"  ({kept:,} records kept)"
+    )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark queueing latency of MessageQueue wakeups.
+
+A consumer blocks in wait_for_messages() (thread) or
+wait_for_messages_async() (asyncio) while a producer thread sends one
+message at a time; latency is send-to-receive time. With interval polling
+the expected latency is half the monitoring interval (2.5 s by default).
+Also reports the CPU used by an idle consumer over one second.
+
+Run from the repository root:
+    python -m benchmarks.bench_message_latency
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+
+from src.agents.base_agent import Message, MessagePriority, MessageType
+from src.communication.message_queue import MessageQueue
+
+
+def make_queue():
+    message_queue = MessageQueue()
+    message_queue.register_agent("admin")
+    return message_queue
+
+
+def send(message_queue, count, gap=0.0005):
+    for _ in range(count):
+        time.sleep(gap)
+        message_queue.send_message(
+            Message(
+                "security",
+                "admin",
+                MessageType.ALERT,
+                {"sent": time.perf_counter()},
+                priority=MessagePriority.HIGH,
+            )
+        )
+
+
+def bench_thread(count):
+    message_queue = make_queue()
+    latencies = []
+    producer = threading.Thread(target=send, args=(message_queue, count))
+    producer.start()
+    while len(latencies) < count:
+        message_queue.wait_for_messages("admin", timeout=1)
+        now = time.perf_counter()
+        latencies.extend(
+            now - m.content["sent"] for m in message_queue.get_messages("admin")
+        )
+    producer.join()
+    return latencies
+
+
+def bench_async(count):
+    message_queue = make_queue()
+    latencies = []
+
+    async def consume():
+        while len(latencies) < count:
+            await message_queue.wait_for_messages_async("admin", timeout=1)
+            now = time.perf_counter()
+            latencies.extend(
+                now - m.content["sent"]
+                for m in message_queue.get_messages("admin")
+            )
+
+    producer = threading.Thread(target=send, args=(message_queue, count))
+    producer.start()
+    asyncio.run(consume())
+    producer.join()
+    return latencies
+
+
+def idle_cpu(seconds=1.0):
+    message_queue = make_queue()
+    start = time.process_time()
+    message_queue.wait_for_messages("admin", timeout=seconds)
+    return time.process_time() - start
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:>8} {statistics.median(latencies) * 1e6:>10.0f}"
+        f" {p99 * 1e6:>10.0f}"
+    )
+
+
+def run_benchmark(count=2000):
+    print(f"messages: {count:,}")
+    print(f"{'wait':>8} {'p50 us':>10} {'p99 us':>10}")
+    report("thread", bench_thread(count))
+    report("asyncio", bench_async(count))
+    print(f"idle consumer CPU over 1 s: {idle_cpu() * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
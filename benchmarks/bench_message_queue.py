@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark MessageQueue's per-priority deque engine against the previous
+queue.PriorityQueue heap with 1M messages.
+
+The old engine put (priority, message) tuples on the heap and raised
+TypeError on equal priorities; for a fair comparison the heap here uses
+(priority, sequence, message) tuples, the usual fix.
+
+Run from the repository root:
+    python -m benchmarks.bench_message_queue
+"""
+
+import itertools
+import queue
+import random
+import time
+
+from src.agents.base_agent import Message, MessagePriority, MessageType
+from src.communication.message_queue import PRIORITY_LEVELS
+from src.communication.priority_queue import MultiLevelQueue
+
+
+def make_messages(num_messages):
+    rng = random.Random(42)
+    priorities = [MessagePriority.HIGH, MessagePriority.MEDIUM, MessagePriority.LOW]
+    return [
+        Message(
+            "security",
+            "admin",
+            MessageType.ALERT,
+            {"message": "x"},
+            priority=rng.choice(priorities),
+        )
+        for _ in range(num_messages)
+    ]
+
+
+def bench_heap(messages):
+    q = queue.PriorityQueue()
+    sequence = itertools.count()
+    start = time.perf_counter()
+    for message in messages:
+        q.put((PRIORITY_LEVELS[message.priority], next(sequence), message))
+    put_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    while not q.empty():
+        q.get()
+    return put_elapsed, time.perf_counter() - start
+
+
+def bench_multilevel(messages):
+    q = MultiLevelQueue(len(PRIORITY_LEVELS))
+    start = time.perf_counter()
+    for message in messages:
+        q.put(message, PRIORITY_LEVELS[message.priority])
+    put_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    while q.get() is not None:
+        pass
+    get_elapsed = time.perf_counter() - start
+    for message in messages:
+        q.put(message, PRIORITY_LEVELS[message.priority])
+    start = time.perf_counter()
+    q.drain()
+    drain_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    q.put_many((message, PRIORITY_LEVELS[message.priority]) for message in messages)
+    put_many_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    while q.drain(100):
+        pass
+    bounded_elapsed = time.perf_counter() - start
+    return put_elapsed, get_elapsed, drain_elapsed, put_many_elapsed, bounded_elapsed
+
+
+def run_benchmark(num_messages=1000000):
+    messages = make_messages(num_messages)
+
+    heap_put, heap_get = bench_heap(messages)
+    (
+        deque_put,
+        deque_get,
+        deque_drain,
+        deque_put_many,
+        deque_bounded,
+    ) = bench_multilevel(messages)
+
+    print(f"messages: {num_messages:,}")
+    print(f"{'engine':>28} {'put msg/s':>12} {'get msg/s':>12}")
+    print(
+        f"{'PriorityQueue (heap)':>28} {num_messages / heap_put:>12,.0f}"
+        f" {num_messages / heap_get:>12,.0f}"
+    )
+    print(
+        f"{'MultiLevelQueue':>28} {num_messages / deque_put:>12,.0f}"
+        f" {num_messages / deque_get:>12,.0f}"
+    )
+    print(
+        f"{'MultiLevelQueue drain()':>28} {'':>12}"
+        f" {num_messages / deque_drain:>12,.0f}"
+    )
+    print(
+        f"{'put_many() / drain(100)':>28} {num_messages / deque_put_many:>12,.0f}"
+        f" {num_messages / deque_bounded:>12,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark RateDetector updates against a 100k events/sec target while the
+number of distinct keys far exceeds max_keys.
+
+Run from the repository root:
+    python -m benchmarks.bench_rate_detector
+"""
+
+import random
+import time
+
+from src.monitoring.rate_detector import RateDetector
+
+TARGET_EVENTS_PER_SEC = 100000
+
+
+def run_benchmark(num_events=1000000, distinct_keys=2000000, max_keys=100000):
+    rng = random.Random(42)
+    # Mostly unique sources with a hot set of attackers mixed in
+    hot_keys = [f"10.0.{i // 256}.{i % 256}" for i in range(100)]
+    keys = [
+        rng.choice(hot_keys)
+        if rng.random() < 0.1
+        else f"ip-{rng.randrange(distinct_keys)}"
+        for _ in range(num_events)
+    ]
+    # Simulated event times at the target rate
+    timestamps = [i / TARGET_EVENTS_PER_SEC for i in range(num_events)]
+
+    detector = RateDetector(threshold=3, window_seconds=60, max_keys=max_keys)
+    alerts = 0
+    start = time.perf_counter()
+    for key, timestamp in zip(keys, timestamps):
+        if detector.record(key, timestamp):
+            alerts += 1
+    elapsed = time.perf_counter() - start
+
+    rate = num_events / elapsed
+    print(f"events:      {num_events:,}")
+    print(f"events/sec:  {rate:,.0f} (target {TARGET_EVENTS_PER_SEC:,})")
+    print(f"alerts:      {alerts:,}")
+    print(f"tracked:     {len(detector):,} keys (max {max_keys:,})")
+    print(f"evictions:   {detector.evictions:,}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
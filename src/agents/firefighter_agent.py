@@ -40,6 +40,7 @@ class FirefighterAgent(BaseAgent):
                     "message": "Fire issue has been handled successfully.",
                     "resolution": resolution,
                     "original_request": message.content,
+                    "correlation_id": message.content.get("correlation_id"),
                 },
             )
         else:
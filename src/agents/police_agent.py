@@ -38,6 +38,7 @@ class PoliceAgent(BaseAgent):
                     "message": "Security issue has been handled successfully.",
                     "resolution": resolution,
                     "original_request": message.content,
+                    "correlation_id": message.content.get("correlation_id"),
                 },
             )
         else:
@@ -1,6 +1,8 @@
 import time
 import random
-from typing import Dict, Any, List
+import re
+from collections import deque
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
 
 from src.agents.base_agent import (
     BaseAgent,
@@ -8,6 +10,17 @@ from src.agents.base_agent import (
     MessagePriority,
     Message,
 )
+from src.monitoring.alert_coalescer import AlertCoalescer
+from src.monitoring.anomaly_detector import AnomalyDetector
+from src.monitoring.backfill import DEFAULT_CHUNK_SIZE, scan_log_file
+from src.monitoring.keyword_matcher import KeywordMatcher
+from src.monitoring.log_record import StructuredLogParser
+from src.monitoring.log_tailer import LogTailer
+from src.monitoring.log_watcher import LogWatcher
+from src.monitoring.rate_detector import RateDetector
+
+SOURCE_IP_PATTERN = re.compile(r"\b(\d{1,3}(?:\.\d{1,3}){3})\b")
+USER_PATTERN = re.compile(r"\buser[=: ]+['\"]?([\w.@-]+)", re.IGNORECASE)
 
 
 class SecurityAgent(BaseAgent):
@@ -24,6 +37,8 @@ class SecurityAgent(BaseAgent):
         super().__init__(agent_id, name)
         self.admin_id = admin_id
         self.log_file = None
+        self.log_tailer: Optional[LogTailer] = None
+        self.log_watcher: Optional[LogWatcher] = None
         self.anomaly_patterns = {
             "fire": ["fire", "smoke", "temperature high", "heat detected"],
             "security": [
@@ -33,50 +48,267 @@ class SecurityAgent(BaseAgent):
                 "suspicious activity",
             ],
         }
+        self.anomaly_descriptions = {
+            "fire": "Fire-related issue detected",
+            "security": "Security issue detected",
+        }
+        # Log levels that never raise anomalies, e.g. {"INFO"}
+        self.skip_levels = set()
+        self._detector = None
+        self._detector_key = None
+        # Failed logins are rate-limited per source IP and per user
+        self.login_failure_patterns = [
+            "failed login",
+            "login failed",
+            "authentication failure",
+            "failed password",
+            "invalid password",
+        ]
+        self.rate_detector = RateDetector(threshold=3, window_seconds=60)
+        self.log_parser = StructuredLogParser()
+        self._failure_matcher = None
+        self._failure_matcher_key = None
+        self.alert_coalescer = AlertCoalescer(window_seconds=0)
+        # (cycle time, log positions) read but not yet checkpointed
+        self._read_positions: deque = deque()
 
     def set_log_file(self, log_file_path: str) -> None:
         """Set the log file to monitor."""
         self.log_file = log_file_path
+        if self.log_tailer is not None:
+            self.log_tailer.close()
+            self.log_tailer = None
+            self._read_positions.clear()
+
+    def enable_log_tailing(
+        self,
+        checkpoint_path: Optional[str] = None,
+        max_bytes_per_cycle: int = 1024 * 1024,
+    ) -> None:
+        """
+        Switch from simulated monitoring to tailing the configured log file.
+        Only bytes appended since the previous cycle are read.
+        """
+        if not self.log_file:
+            raise ValueError("No log file set. Call set_log_file() first.")
+        if self.log_tailer is not None:
+            self.log_tailer.close()
+            self._read_positions.clear()
+        self.log_tailer = LogTailer(
+            self.log_file,
+            checkpoint_path=checkpoint_path,
+            max_bytes_per_read=max_bytes_per_cycle,
+        )
+
+    def monitor_log_file(self) -> List[Dict[str, Any]]:
+        """Detect anomalies in the lines appended to the log file."""
+        lines = self.log_tailer.read_lines()
+        if not lines:
+            return []
+        log_content = "\n".join(lines)
+        return self.detect_anomalies(log_content) + self.detect_login_failures(
+            log_content
+        )
+
+    def watch_paths(
+        self,
+        paths: List[str],
+        checkpoint_dir: Optional[str] = None,
+        max_bytes_per_cycle: int = 1024 * 1024,
+        file_pattern: str = "*.log",
+        use_inotify: Optional[bool] = None,
+    ) -> LogWatcher:
+        """
+        Watch many log files and directories at once. Anomalies from watched
+        files are tagged with their source_path.
+        """
+        if self.log_watcher is None:
+            self.log_watcher = LogWatcher(
+                checkpoint_dir=checkpoint_dir,
+                max_bytes_per_read=max_bytes_per_cycle,
+                file_pattern=file_pattern,
+                use_inotify=use_inotify,
+            )
+        self.log_watcher.add_paths(paths)
+        return self.log_watcher
+
+    def monitor_watched_files(self, timeout: float = 0.0) -> List[Dict[str, Any]]:
+        """Detect anomalies in lines appended to any watched file."""
+        anomalies = []
+        for path, lines in self.log_watcher.poll(timeout):
+            log_content = "\n".join(lines)
+            found = self.detect_anomalies(log_content)
+            found.extend(self.detect_login_failures(log_content))
+            for anomaly in found:
+                anomaly["source_path"] = path
+            anomalies.extend(found)
+        return anomalies
+
+    def commit_log_positions(self, now: Optional[float] = None) -> None:
+        """
+        Checkpoint how far the tailed and watched logs have been read. Call
+        after alerting on what was read at time now (the time given to the
+        alert coalescer), so a crash re-reads those lines.
+
+        Anomalies still held in open coalescer groups have not been sent,
+        so positions are only committed up to the last cycle before the
+        oldest open group began.
+        """
+        if self.log_watcher is None and self.log_tailer is None:
+            return
+        if now is None:
+            now = time.time()
+        self._read_positions.append(
+            (
+                now,
+                self.log_watcher.checkpoints() if self.log_watcher else None,
+                self.log_tailer.checkpoint() if self.log_tailer else None,
+            )
+        )
+        oldest = self.alert_coalescer.oldest_pending()
+        safe = None
+        while self._read_positions and (
+            oldest is None or self._read_positions[0][0] < oldest
+        ):
+            safe = self._read_positions.popleft()
+        if safe is None:
+            return
+        _, watcher_positions, tailer_position = safe
+        if self.log_watcher is not None and watcher_positions is not None:
+            self.log_watcher.commit(watcher_positions)
+        if self.log_tailer is not None and tailer_position is not None:
+            self.log_tailer.commit(tailer_position)
+
+    @property
+    def detector(self) -> AnomalyDetector:
+        """Anomaly detector compiled from the pattern table (rebuilt on change)."""
+        key = (
+            tuple(
+                (category, tuple(keywords))
+                for category, keywords in self.anomaly_patterns.items()
+            ),
+            tuple(self.anomaly_descriptions.items()),
+            tuple(sorted(self.skip_levels)),
+        )
+        if key != self._detector_key:
+            self._detector = AnomalyDetector(
+                self.anomaly_patterns,
+                self.anomaly_descriptions,
+                skip_levels=self.skip_levels,
+            )
+            self._detector_key = key
+        return self._detector
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        """Keyword matcher compiled from anomaly_patterns."""
+        return self.detector.matcher
+
+    def iter_anomalies(
+        self, source: Union[str, bytes, Iterable[Union[str, bytes]]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily detect anomalies in log text, an iterable of lines (str or
+        bytes), or an open file object.
+        """
+        return self.detector.iter_detect(source)
 
     def detect_anomalies(self, log_content: str) -> List[Dict[str, Any]]:
         """
         Detect anomalies in log content.
-        In this simple implementation, we just check for keywords.
+        Each line is scanned once against all keywords; one anomaly is
+        reported per matching category.
         """
-        anomalies = []
+        return list(self.iter_anomalies(log_content))
 
-        for line in log_content.split("\n"):
-            if not line.strip():
-                continue
+    def stream_alerts(
+        self,
+        source: Union[str, bytes, Iterable[Union[str, bytes]]],
+        flush_interval: float = 1.0,
+    ) -> int:
+        """
+        Pipe log lines straight into alert sending without materializing
+        them. Anomalies pass through the alert coalescer, which is flushed
+        every flush_interval seconds and at the end of the stream.
+        Returns the number of alerts sent.
+        """
+        sent = 0
+        last_flush = time.monotonic()
+        for anomaly in self.iter_anomalies(source):
+            self.alert_coalescer.add(anomaly)
+            if time.monotonic() - last_flush >= flush_interval:
+                for alert in self.alert_coalescer.flush():
+                    self.send_alert(alert)
+                    sent += 1
+                last_flush = time.monotonic()
 
-            # Check for fire-related anomalies
-            for keyword in self.anomaly_patterns["fire"]:
-                if keyword in line.lower():
-                    anomalies.append(
-                        {
-                            "type": "fire",
-                            "description": f"Fire-related issue detected: {line}",
-                            "severity": "high",
-                            "timestamp": time.time(),
-                        }
-                    )
-                    break
+        for alert in self.alert_coalescer.flush(force=True):
+            self.send_alert(alert)
+            sent += 1
+        return sent
+
+    def detect_login_failures(
+        self, log_content: str, timestamp: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect sources exceeding the failed-login rate (default: more than
+        3 failures per minute). Unlike detect_anomalies this is stateful:
+        failures accumulate in rate_detector across calls.
 
-            # Check for security-related anomalies
-            for keyword in self.anomaly_patterns["security"]:
-                if keyword in line.lower():
+        Failures are counted at the time their log line records; timestamp
+        (default: now) is used only for lines without one.
+        """
+        key = tuple(self.login_failure_patterns)
+        if key != self._failure_matcher_key:
+            self._failure_matcher = KeywordMatcher({"login_failure": key})
+            self._failure_matcher_key = key
+
+        anomalies = []
+        for line, _ in self._failure_matcher.scan(log_content):
+            sources = [
+                f"ip {ip}" for ip in SOURCE_IP_PATTERN.findall(line)
+            ] + [f"user {user}" for user in USER_PATTERN.findall(line)]
+            if not sources:
+                continue
+            record = self.log_parser.parse(line)
+            if record is not None:
+                event_time = record.timestamp
+            elif timestamp is not None:
+                event_time = timestamp
+            else:
+                event_time = time.time()
+            for source in sources:
+                if self.rate_detector.record(source, event_time):
                     anomalies.append(
                         {
                             "type": "security",
-                            "description": f"Security issue detected: {line}",
+                            "description": (
+                                f"Security issue detected: more than "
+                                f"{self.rate_detector.threshold} login failures "
+                                f"within {self.rate_detector.window_seconds:g}s "
+                                f"from {source}"
+                            ),
                             "severity": "high",
-                            "timestamp": time.time(),
+                            "timestamp": event_time,
+                            "source": source,
                         }
                     )
-                    break
-
         return anomalies
 
+    def backfill_log_file(
+        self,
+        path: str,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """
+        Scan a large historical log file in parallel and return its anomalies
+        in file order. Alerts are not sent for backfilled anomalies.
+        """
+        return scan_log_file(
+            path, self.detector, workers=workers, chunk_size=chunk_size
+        )
+
     def simulate_log_monitoring(self) -> List[Dict[str, Any]]:
         """
         Simulate log monitoring for demonstration purposes.
@@ -117,32 +349,48 @@ class SecurityAgent(BaseAgent):
                 f"SecurityAgent: Received message of type {message.message_type} from {message.sender}"
             )
 
+    def send_alert(self, anomaly: Dict[str, Any]) -> Message:
+        """Send a HIGH-priority alert for an anomaly to the Admin Agent."""
+        description = anomaly["description"]
+        count = anomaly.get("count", 1)
+        if count > 1:
+            description = f"{description} (x{count})"
+        print(f"SecurityAgent: Detected anomaly: {description}")
+
+        return self.send_message(
+            receiver=self.admin_id,
+            message_type=MessageType.ALERT,
+            content={
+                "anomaly": anomaly,
+                "message": f"Alert! {description}",
+            },
+            priority=MessagePriority.HIGH,
+        )
+
     def run(self) -> None:
         """Main loop for security agent operation."""
         print("SecurityAgent: Starting security monitoring...")
 
-        # In a real system, this would be a continuous loop
-        # For demonstration, we'll just simulate one check
-        anomalies = self.simulate_log_monitoring()
+        # Read real log files when enabled, otherwise simulate one check
+        if self.log_watcher is not None:
+            anomalies = self.monitor_watched_files()
+        elif self.log_tailer is not None:
+            anomalies = self.monitor_log_file()
+        else:
+            anomalies = self.simulate_log_monitoring()
 
-        if anomalies:
-            for anomaly in anomalies:
-                print(
-                    f"SecurityAgent: Detected anomaly: {anomaly['description']}"
-                )
+        # Fold repeated anomalies so a burst becomes a single alert
+        now = time.time()
+        alerts = self.alert_coalescer.coalesce(anomalies, now)
 
-                # Send alert to Admin Agent
-                self.send_message(
-                    receiver=self.admin_id,
-                    message_type=MessageType.ALERT,
-                    content={
-                        "anomaly": anomaly,
-                        "message": f"Alert! {anomaly['description']}",
-                    },
-                    priority=MessagePriority.HIGH,
-                )
-        else:
+        if alerts:
+            for anomaly in alerts:
+                self.send_alert(anomaly)
+        elif not anomalies:
             print("SecurityAgent: No anomalies detected.")
 
+        # Lines are handled once their alerts are sent, not merely read
+        self.commit_log_positions(now)
+
         # Process any incoming messages
         self.process_messages()
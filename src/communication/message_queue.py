@@ -1,38 +1,208 @@
-import queue
-from typing import Dict, Optional, List
-from src.agents.base_agent import Message
+import asyncio
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.agents.base_agent import Message, MessagePriority
+from src.communication.priority_queue import REJECT, MultiLevelQueue
+
+# Queue level per priority (lower level = delivered first)
+PRIORITY_LEVELS = {
+    MessagePriority.HIGH: 0,
+    MessagePriority.MEDIUM: 1,
+    MessagePriority.LOW: 2,
+}
 
 
 class MessageQueue:
-    """Central message queue for agent communication"""
+    """
+    Central message queue for agent communication.
+
+    Per-agent queues are unbounded unless a capacity is given (0 means
+    unbounded); agent_capacities overrides it per agent. A full queue
+    applies overflow_policy (see MultiLevelQueue): "block" waits up to
+    block_timeout seconds, "reject" refuses the message and "shed" evicts
+    older LOW/MEDIUM messages to make room for more urgent ones. Refused
+    messages make send_message() return False.
+    """
 
-    def __init__(self):
-        self.queues: Dict[str, queue.PriorityQueue] = {}
+    def __init__(
+        self,
+        capacity: int = 0,
+        overflow_policy: str = REJECT,
+        block_timeout: Optional[float] = 1.0,
+        agent_capacities: Optional[Dict[str, int]] = None,
+    ):
+        self.queues: Dict[str, MultiLevelQueue] = {}
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.agent_capacities = dict(agent_capacities or {})
+        # Set on every delivery so a scheduler can wait for any activity
+        self._activity = threading.Event()
+        # agent_id -> (loop, event) pairs of coroutines waiting for messages
+        self._async_waiters: Dict[
+            str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]
+        ] = {}
+        self._waiters_lock = threading.Lock()
 
     def register_agent(self, agent_id: str) -> None:
         """Register a new agent to the message queue system"""
         if agent_id not in self.queues:
-            self.queues[agent_id] = queue.PriorityQueue()
+            self.queues[agent_id] = MultiLevelQueue(
+                len(PRIORITY_LEVELS),
+                maxsize=self.agent_capacities.get(agent_id, self.capacity),
+                policy=self.overflow_policy,
+                block_timeout=self.block_timeout,
+            )
+
+    def _notify(self, agent_id: str) -> None:
+        """Wake the scheduler and any coroutines waiting on agent_id."""
+        self._activity.set()
+        if not self._async_waiters:
+            return
+        with self._waiters_lock:
+            waiters = list(self._async_waiters.get(agent_id, ()))
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiter's loop has closed; it will deregister itself
+                pass
 
     def send_message(self, message: Message) -> bool:
         """Send a message to the recipient's queue"""
         if message.receiver not in self.queues:
             return False
 
-        # Priority is inverse (lower number = higher priority)
-        priority = {"high": 1, "medium": 2, "low": 3}[message.priority.value]
-
-        self.queues[message.receiver].put((priority, message))
+        # Messages of equal priority are delivered in the order sent
+        if not self.queues[message.receiver].put(
+            message, PRIORITY_LEVELS[message.priority]
+        ):
+            return False
+        self._notify(message.receiver)
         return True
 
-    def get_messages(self, agent_id: str) -> List[Message]:
-        """Get all messages for an agent"""
+    def send_many(self, messages: Iterable[Message]) -> int:
+        """
+        Send a batch of messages, taking each recipient queue's lock once.
+        Messages to unregistered agents or refused by a full queue are
+        dropped; returns the number delivered.
+        """
+        by_receiver: Dict[str, List] = {}
+        for message in messages:
+            if message.receiver in self.queues:
+                by_receiver.setdefault(message.receiver, []).append(
+                    (message, PRIORITY_LEVELS[message.priority])
+                )
+
+        delivered = 0
+        for receiver, items in by_receiver.items():
+            accepted = self.queues[receiver].put_many(items)
+            if accepted:
+                self._notify(receiver)
+            delivered += accepted
+        return delivered
+
+    def get_messages(
+        self, agent_id: str, max_n: Optional[int] = None
+    ) -> List[Message]:
+        """Get up to max_n messages for an agent (all if None)"""
         if agent_id not in self.queues:
             return []
 
-        messages = []
-        while not self.queues[agent_id].empty():
-            _, message = self.queues[agent_id].get()
-            messages.append(message)
+        return self.queues[agent_id].drain(max_n)
+
+    def ack(self, agent_id: str, messages: List[Message]) -> None:
+        """Mark messages as processed. Only the durable queue needs this."""
+        pass
+
+    def close(self) -> None:
+        """Release resources. Only the durable queue holds any."""
+        pass
+
+    def wait_for_messages(
+        self, agent_id: str, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Block until the agent has messages waiting, or timeout seconds pass.
+        Returns True if messages are waiting.
+        """
+        if agent_id not in self.queues:
+            return False
+        return self.queues[agent_id].wait(timeout)
+
+    async def wait_for_messages_async(
+        self, agent_id: str, timeout: Optional[float] = None
+    ) -> bool:
+        """Coroutine version of wait_for_messages(); senders may be threads."""
+        queue = self.queues.get(agent_id)
+        if queue is None:
+            return False
+        if not queue.empty():
+            return True
+
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._waiters_lock:
+            self._async_waiters.setdefault(agent_id, set()).add(waiter)
+        try:
+            # Re-check: a message may have landed before we registered
+            if queue.empty():
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            return not queue.empty()
+        finally:
+            with self._waiters_lock:
+                waiters = self._async_waiters.get(agent_id)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._async_waiters[agent_id]
+
+    def wait_for_any(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a message is delivered to any agent since the last call,
+        or timeout seconds pass. Returns True if there was a delivery.
+        """
+        if self._activity.wait(timeout):
+            self._activity.clear()
+            return True
+        return False
+
+    def wake(self) -> None:
+        """Wake wait_for_any() as if a message had been delivered."""
+        self._activity.set()
+
+    def pending_agents(self) -> List[str]:
+        """IDs of agents with messages waiting"""
+        return [agent_id for agent_id, q in self.queues.items() if not q.empty()]
+
+    def queue_depth(self, agent_id: str) -> int:
+        """Get the number of messages waiting for an agent"""
+        if agent_id not in self.queues:
+            return 0
+        return self.queues[agent_id].qsize()
+
+    def drop_counts(self, agent_id: Optional[str] = None) -> Dict[str, int]:
+        """Messages dropped by full queues (one agent's, or all), by reason"""
+        if agent_id is None:
+            queues = list(self.queues.values())
+        else:
+            queues = [self.queues[agent_id]] if agent_id in self.queues else []
+        totals = {"rejected": 0, "shed": 0, "timed_out": 0}
+        for q in queues:
+            for reason, count in q.dropped.items():
+                totals[reason] += count
+        return totals
 
-        return messages
+    def metrics(self) -> Dict[str, Dict]:
+        """Depth, capacity, overflow policy and drop counts per agent"""
+        return {
+            agent_id: {
+                "depth": q.qsize(),
+                "capacity": q.maxsize,
+                "policy": q.policy,
+                **q.dropped,
+            }
+            for agent_id, q in self.queues.items()
+        }
@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+# What put() does when a bounded queue is full
+BLOCK = "block"  # wait up to block_timeout for room
+REJECT = "reject"  # drop the new item
+SHED = "shed"  # evict the oldest item of a lower priority level
+OVERFLOW_POLICIES = (BLOCK, REJECT, SHED)
+
+
+class MultiLevelQueue:
+    """
+    Priority queue with one FIFO deque per priority level.
+
+    Level 0 is served first. put() and get() are O(1) (get scans at most
+    `levels` deques), items within a level come out strictly in arrival
+    order, and items are never compared with each other. A single lock
+    guards all levels; wait() blocks on a condition built on that lock
+    until an item arrives.
+
+    With maxsize > 0 the queue is bounded and `policy` decides what a put
+    into a full queue does: BLOCK waits up to block_timeout seconds (None
+    waits forever), REJECT drops the new item, and SHED evicts the oldest
+    item from the lowest level below the new item's level, dropping the
+    new item only if there is none. Drops are counted in `dropped`, and
+    on_drop, if set, is called with each dropped item (under the lock).
+    """
+
+    def __init__(
+        self,
+        levels: int = 3,
+        maxsize: int = 0,
+        policy: str = REJECT,
+        block_timeout: Optional[float] = None,
+    ):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {policy!r}; "
+                f"expected one of {OVERFLOW_POLICIES}"
+            )
+        self.levels: List[Deque[Any]] = [deque() for _ in range(levels)]
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped: Dict[str, int] = {"rejected": 0, "shed": 0, "timed_out": 0}
+        self.on_drop: Optional[Callable[[Any], None]] = None
+        self._size = 0
+
+    def _deadline(self) -> Optional[float]:
+        if self.policy != BLOCK or self.block_timeout is None:
+            return None
+        return time.monotonic() + self.block_timeout
+
+    def _drop(self, item: Any, reason: str) -> None:
+        self.dropped[reason] += 1
+        if self.on_drop is not None:
+            self.on_drop(item)
+
+    def _make_room(self, item: Any, level: int, deadline: Optional[float]) -> bool:
+        """Ensure there is room for item at level. Hold the lock."""
+        if not self.maxsize or self._size < self.maxsize:
+            return True
+
+        if self.policy == BLOCK:
+            # Wake consumers for anything added so far before sleeping
+            self.not_empty.notify_all()
+            while self._size >= self.maxsize:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._drop(item, "timed_out")
+                    return False
+                self.not_full.wait(remaining)
+            return True
+
+        if self.policy == SHED:
+            for lower in range(len(self.levels) - 1, level, -1):
+                if self.levels[lower]:
+                    self._size -= 1
+                    self._drop(self.levels[lower].popleft(), "shed")
+                    return True
+
+        self._drop(item, "rejected")
+        return False
+
+    def put(self, item: Any, level: int) -> bool:
+        """Add an item; False if it was dropped because the queue is full."""
+        with self.lock:
+            if (
+                self.maxsize
+                and self._size >= self.maxsize
+                and not self._make_room(item, level, self._deadline())
+            ):
+                return False
+            self.levels[level].append(item)
+            self._size += 1
+            self.not_empty.notify_all()
+        return True
+
+    def put_many(self, items: Iterable[Tuple[Any, int]]) -> int:
+        """Add (item, level) pairs under one lock; returns how many."""
+        count = 0
+        deadline = self._deadline()
+        with self.lock:
+            for item, level in items:
+                if not self._make_room(item, level, deadline):
+                    continue
+                self.levels[level].append(item)
+                self._size += 1
+                count += 1
+            if count:
+                self.not_empty.notify_all()
+        return count
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the queue is non-empty; False if timeout expires."""
+        with self.not_empty:
+            return self.not_empty.wait_for(lambda: self._size > 0, timeout)
+
+    def get(self) -> Optional[Any]:
+        """Remove and return the next item, or None if empty."""
+        with self.lock:
+            for level in self.levels:
+                if level:
+                    self._size -= 1
+                    if self.maxsize:
+                        self.not_full.notify()
+                    return level.popleft()
+            return None
+
+    def drain(self, max_items: Optional[int] = None) -> List[Any]:
+        """Remove and return up to max_items items (all if None) in order."""
+        items: List[Any] = []
+        with self.lock:
+            for level in self.levels:
+                if max_items is None:
+                    items.extend(level)
+                    level.clear()
+                else:
+                    while level and len(items) < max_items:
+                        items.append(level.popleft())
+                    if len(items) >= max_items:
+                        break
+            self._size -= len(items)
+            if items and self.maxsize:
+                self.not_full.notify_all()
+        return items
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,24 @@
+from src.monitoring.keyword_matcher import KeywordMatcher
+from src.monitoring.log_record import LogRecord, StructuredLogParser
+from src.monitoring.anomaly_detector import AnomalyDetector
+from src.monitoring.log_tailer import LogTailer
+from src.monitoring.log_watcher import LogWatcher
+from src.monitoring.backfill import iter_log_file, scan_log_file
+from src.monitoring.rate_detector import RateDetector
+from src.monitoring.alert_coalescer import AlertCoalescer
+from src.monitoring.syslog_server import SyslogServer, parse_rfc5424
+
+__all__ = [
+    "KeywordMatcher",
+    "LogRecord",
+    "StructuredLogParser",
+    "AnomalyDetector",
+    "LogTailer",
+    "LogWatcher",
+    "iter_log_file",
+    "scan_log_file",
+    "RateDetector",
+    "AlertCoalescer",
+    "SyslogServer",
+    "parse_rfc5424",
+]
@@ -0,0 +1,117 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Bracketed timestamps such as "[2024-01-20 10:30:00]" and "(x3)" counters
+_TIMESTAMP = re.compile(r"\[[\d\s\-:.,T+Z]*\]")
+_REPEAT_COUNT = re.compile(r"\(x\d+\)")
+_NUMBER = re.compile(r"\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_description(description: str, fold_numbers: bool = False) -> str:
+    """
+    Normalize a description for grouping: bracketed timestamps, "(xN)"
+    repeat counters and extra whitespace are ignored, and case is folded.
+    Other numbers (rooms, IPs, user IDs) are kept so distinct incidents
+    never merge, unless fold_numbers replaces each digit run with "#".
+    """
+    description = _TIMESTAMP.sub(" ", description.lower())
+    description = _REPEAT_COUNT.sub(" ", description)
+    if fold_numbers:
+        description = _NUMBER.sub("#", description)
+    return _WHITESPACE.sub(" ", description).strip()
+
+
+class AlertCoalescer:
+    """
+    Folds anomalies with the same type, origin (source, source_path, and
+    syslog source_host and app_name) and normalized description into a
+    single alert per window.
+
+    A group opens when its first anomaly arrives and is released by flush()
+    once `window_seconds` have passed, carrying `count`, `first_timestamp`
+    and `last_timestamp`. With a window of 0 anomalies are still folded
+    within one batch, so a burst of identical lines becomes one alert.
+    """
+
+    def __init__(self, window_seconds: float = 0.0, max_groups: int = 10000):
+        self.window_seconds = window_seconds
+        self.max_groups = max_groups
+        self.suppressed = 0  # anomalies folded into an existing group
+        # (type, source, source_path, source_host, app_name, description)
+        # -> (opened_at, coalesced anomaly), kept in the order groups were
+        # opened
+        self._groups: OrderedDict = OrderedDict()
+        self._overflow: List[Dict[str, Any]] = []
+
+    def add(self, anomaly: Dict[str, Any], now: Optional[float] = None) -> None:
+        """Add an anomaly to its group, opening a new group if needed."""
+        if now is None:
+            now = time.time()
+        key = (
+            anomaly.get("type", ""),
+            anomaly.get("source"),
+            anomaly.get("source_path"),
+            anomaly.get("source_host"),
+            anomaly.get("app_name"),
+            normalize_description(anomaly.get("description", "")),
+        )
+        timestamp = anomaly.get("timestamp", now)
+
+        group = self._groups.get(key)
+        if group is None:
+            if len(self._groups) >= self.max_groups:
+                # Release the oldest group early rather than grow unbounded
+                self._overflow.append(self._groups.popitem(last=False)[1][1])
+            coalesced = dict(anomaly)
+            coalesced["count"] = 1
+            coalesced["first_timestamp"] = timestamp
+            coalesced["last_timestamp"] = timestamp
+            self._groups[key] = (now, coalesced)
+            return
+
+        coalesced = group[1]
+        coalesced["count"] += 1
+        coalesced["first_timestamp"] = min(
+            coalesced["first_timestamp"], timestamp
+        )
+        coalesced["last_timestamp"] = max(coalesced["last_timestamp"], timestamp)
+        self.suppressed += 1
+
+    def flush(
+        self, now: Optional[float] = None, force: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Release every group whose window has closed (or all if forced)."""
+        if now is None:
+            now = time.time()
+        released = self._overflow
+        self._overflow = []
+        while self._groups:
+            key, (opened_at, coalesced) = next(iter(self._groups.items()))
+            if not force and now - opened_at < self.window_seconds:
+                break
+            del self._groups[key]
+            released.append(coalesced)
+        return released
+
+    def coalesce(
+        self, anomalies: List[Dict[str, Any]], now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Add a batch of anomalies and return the alerts now due."""
+        if now is None:
+            now = time.time()
+        for anomaly in anomalies:
+            self.add(anomaly, now)
+        return self.flush(now)
+
+    def pending(self) -> int:
+        """Return the number of open groups."""
+        return len(self._groups)
+
+    def oldest_pending(self) -> Optional[float]:
+        """Return when the oldest open group opened, or None if none are."""
+        if not self._groups:
+            return None
+        return next(iter(self._groups.values()))[0]
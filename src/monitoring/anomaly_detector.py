@@ -0,0 +1,103 @@
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from src.monitoring.keyword_matcher import KeywordMatcher
+from src.monitoring.log_record import StructuredLogParser
+
+
+class AnomalyDetector:
+    """
+    Keyword-based anomaly detector built from a category -> keywords table.
+
+    Holds only plain data and a compiled matcher, so it can be pickled and
+    shipped to worker processes. Structured lines take their anomaly
+    timestamp from the event time; lines whose level is in skip_levels
+    (e.g. INFO) never raise anomalies.
+    """
+
+    def __init__(
+        self,
+        patterns: Dict[str, Iterable[str]],
+        descriptions: Optional[Dict[str, str]] = None,
+        severity: str = "high",
+        skip_levels: Optional[Set[str]] = None,
+    ):
+        self.patterns = {
+            category: list(keywords) for category, keywords in patterns.items()
+        }
+        self.descriptions = dict(descriptions or {})
+        self.severity = severity
+        self.skip_levels = {level.upper() for level in skip_levels or ()}
+        self.matcher = KeywordMatcher(self.patterns)
+        self.record_parser = StructuredLogParser()
+
+    def describe(self, category: str, line: str) -> str:
+        """Build the human-readable description for a matched line."""
+        prefix = self.descriptions.get(
+            category, f"{category.capitalize()} issue detected"
+        )
+        return f"{prefix}: {line}"
+
+    def make_anomalies(
+        self, line: str, categories: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Build one anomaly per matched category of a line."""
+        if not categories:
+            return []
+        record = self.record_parser.parse(line)
+        if record is None:
+            timestamp = time.time()
+        elif record.level in self.skip_levels:
+            return []
+        else:
+            timestamp = record.timestamp
+        return [
+            {
+                "type": category,
+                "description": self.describe(category, line),
+                "severity": self.severity,
+                "timestamp": timestamp,
+            }
+            for category in categories
+        ]
+
+    def detect_line(self, line: str) -> List[Dict[str, Any]]:
+        """Return one anomaly per category matched in a single line."""
+        return self.make_anomalies(line, self.matcher.match(line))
+
+    def _detect_block(self, text: str) -> Iterator[Dict[str, Any]]:
+        for line, categories in self.matcher.scan(text):
+            yield from self.make_anomalies(line, categories)
+
+    def iter_detect(
+        self,
+        source: Union[str, bytes, Iterable[Union[str, bytes]]],
+        batch_size: int = 1024,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield anomalies from log text, an iterable of lines, or a
+        text/binary file object. Lines are scanned in batches of batch_size,
+        so only one batch is held in memory at a time.
+        """
+        if isinstance(source, bytes):
+            source = source.decode("utf-8", errors="replace")
+        if isinstance(source, str):
+            yield from self._detect_block(source)
+            return
+
+        batch = []
+        for line in source:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            if line.endswith("\n"):
+                line = line[:-1]
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield from self._detect_block("\n".join(batch))
+                batch = []
+        if batch:
+            yield from self._detect_block("\n".join(batch))
+
+    def detect(self, log_content: str) -> List[Dict[str, Any]]:
+        """Return anomalies for every line of a block of log text."""
+        return list(self.iter_detect(log_content))
@@ -0,0 +1,115 @@
+import mmap
+import multiprocessing
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Per-process state installed by _init_worker
+_worker_detector = None
+_worker_mmap = None
+
+
+def chunk_boundaries(
+    mm: mmap.mmap, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> List[Tuple[int, int]]:
+    """
+    Split a memory-mapped file into (start, end) byte ranges of roughly
+    chunk_size bytes, each ending just after a newline (or at EOF).
+    """
+    size = len(mm)
+    boundaries = []
+    start = 0
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            newline = mm.find(b"\n", end - 1)
+            end = size if newline == -1 else newline + 1
+        boundaries.append((start, end))
+        start = end
+    return boundaries
+
+
+def _open_mmap(path: str) -> Optional[mmap.mmap]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _init_worker(path: str, detector) -> None:
+    """Map the file once per worker process"""
+    global _worker_detector, _worker_mmap
+    _worker_detector = detector
+    _worker_mmap = _open_mmap(path)
+
+
+def _detect_range(
+    mm: mmap.mmap, detector, bounds: Tuple[int, int]
+) -> List[Dict[str, Any]]:
+    start, end = bounds
+    return detector.detect(mm[start:end].decode("utf-8", errors="replace"))
+
+
+def _scan_range(bounds: Tuple[int, int]) -> List[Dict[str, Any]]:
+    """Run the pool worker's detector over one newline-aligned byte range"""
+    return _detect_range(_worker_mmap, _worker_detector, bounds)
+
+
+def iter_log_file(
+    path: str,
+    detector,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield anomalies from a large log file in file order.
+
+    The file is memory-mapped and split into newline-aligned chunks that are
+    scanned across a process pool. Only a few chunks are resident at a time,
+    so memory stays flat regardless of file size. With workers=1 the scan
+    runs in the calling process.
+    """
+    mm = _open_mmap(path)
+    if mm is None:
+        return
+    try:
+        boundaries = chunk_boundaries(mm, chunk_size)
+    finally:
+        mm.close()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(boundaries)))
+
+    if workers == 1:
+        # Local state only: concurrent in-process backfills must not share
+        # the pool workers' module globals
+        mm = _open_mmap(path)
+        if mm is None:
+            return
+        try:
+            for bounds in boundaries:
+                yield from _detect_range(mm, detector, bounds)
+        finally:
+            mm.close()
+        return
+
+    with multiprocessing.Pool(
+        workers, initializer=_init_worker, initargs=(path, detector)
+    ) as pool:
+        # imap keeps results in submission order, i.e. file order
+        for anomalies in pool.imap(_scan_range, boundaries):
+            yield from anomalies
+
+
+def scan_log_file(
+    path: str,
+    detector,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """Return all anomalies in a large log file, in file order."""
+    return list(
+        iter_log_file(path, detector, workers=workers, chunk_size=chunk_size)
+    )
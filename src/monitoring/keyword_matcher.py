@@ -0,0 +1,160 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """
+    Multi-keyword matcher compiled once from a category -> keywords table.
+
+    All keywords are folded into a single trie-shaped regular expression, so a
+    line is scanned once regardless of how many keywords are configured.
+    Matching is case-insensitive: each line is lowercased at most once.
+    """
+
+    def __init__(self, patterns: Dict[str, Iterable[str]]):
+        self.categories = list(patterns.keys())
+        self._keyword_categories: Dict[str, Set[str]] = {}
+        for category, keywords in patterns.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    self._keyword_categories.setdefault(keyword, set()).add(
+                        category
+                    )
+
+        # A keyword also implies the categories of every keyword it contains,
+        # since the regex only reports the longest keyword at each position.
+        self._hit_categories: Dict[str, Set[str]] = {}
+        for keyword in self._keyword_categories:
+            hits = set()
+            for other, categories in self._keyword_categories.items():
+                if other in keyword:
+                    hits.update(categories)
+            self._hit_categories[keyword] = hits
+
+        if self._keyword_categories:
+            trie = _trie_regex(self._keyword_categories)
+            self._search = re.compile(trie).search
+            # Zero-width lookahead so overlapping keywords are all reported
+            self._finditer = re.compile("(?=(" + trie + "))").finditer
+        else:
+            self._search = None
+
+    def match_lower(self, line_lower: str) -> List[str]:
+        """Return matched categories for an already-lowercased line."""
+        if self._search is None:
+            return []
+        first = self._search(line_lower)
+        if first is None:
+            return []
+
+        found = set()
+        for m in self._finditer(line_lower, first.start()):
+            found.update(self._hit_categories[m.group(1)])
+            if len(found) == len(self.categories):
+                break
+
+        # Report categories in pattern-table order
+        return [category for category in self.categories if category in found]
+
+    def match(self, line: str) -> List[str]:
+        """Return every category with at least one keyword in the line."""
+        return self.match_lower(line.lower())
+
+    def _scan_spans(self, text: str) -> Iterator[Tuple[int, int, List[str]]]:
+        """Yield (start, end, categories) for each matching line of text."""
+        text_lower = text.lower()
+        pos = 0
+        while True:
+            hit = self._search(text_lower, pos)
+            if hit is None:
+                return
+            start = text_lower.rfind("\n", 0, hit.start()) + 1
+            end = text_lower.find("\n", hit.start())
+            if end == -1:
+                end = len(text)
+            categories = self.match_lower(text_lower[start:end])
+            if categories:
+                yield start, end, categories
+            pos = end + 1
+
+    @staticmethod
+    def _folds_safely(text: str) -> bool:
+        # Some characters change length when lowercased; offsets into the
+        # lowered text would then not line up with the original
+        return len(text.lower()) == len(text)
+
+    def scan(self, text: str) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Yield (line, categories) for each line of text containing a keyword.
+        The whole block is lowercased and searched at once, so lines without
+        any keyword are skipped without per-line work.
+        """
+        if self._search is None:
+            return
+        if not self._folds_safely(text):
+            for line in text.split("\n"):
+                categories = self.match(line)
+                if categories:
+                    yield line, categories
+            return
+        for start, end, categories in self._scan_spans(text):
+            yield text[start:end], categories
+
+    def scan_indexed(self, lines: List[str]) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Yield (index, categories) for each matching entry of a list of
+        single-line strings, searching them as one joined block.
+        """
+        if self._search is None:
+            return
+        text = "\n".join(lines)
+        if not self._folds_safely(text):
+            for index, line in enumerate(lines):
+                categories = self.match(line)
+                if categories:
+                    yield index, categories
+            return
+
+        index, pos = 0, 0
+        for start, _, categories in self._scan_spans(text):
+            index += text.count("\n", pos, start)
+            pos = start
+            yield index, categories
+
+    def first_match(self, line: str):
+        """Return the first matching category in table order, or None."""
+        categories = self.match(line)
+        return categories[0] if categories else None
+
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a trie of the given keywords."""
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+    return _node_regex(trie)
+
+
+def _node_regex(node: Dict) -> str:
+    terminal = "" in node
+    branches = [
+        re.escape(char) + _node_regex(child)
+        for char, child in sorted(node.items())
+        if char != ""
+    ]
+    if not branches:
+        return ""
+
+    if len(branches) == 1:
+        body = branches[0]
+        # Single-character branches need no grouping
+        grouped = body if len(body) == 1 or not terminal else f"(?:{body})"
+    else:
+        grouped = "(?:" + "|".join(branches) + ")"
+
+    # Greedy optional tail keeps the longest keyword at each position
+    return grouped + "?" if terminal else grouped
@@ -0,0 +1,161 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+
+class LogTailer:
+    """
+    Incremental reader for an append-only log file.
+
+    Each call to read_lines() returns only the complete lines appended since
+    the previous call, so the cost of a cycle scales with new data rather than
+    file size. commit() persists the byte offset and inode to a checkpoint
+    file so a restart resumes where it left off; call it once the lines read
+    have been handled, so a crash in between re-reads them instead of losing
+    them. Rotation (inode change) and truncation (file shrank below the
+    offset) are detected and handled.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        checkpoint_path: Optional[str] = None,
+        max_bytes_per_read: int = 1024 * 1024,
+    ):
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.max_bytes_per_read = max_bytes_per_read
+        self.offset = 0
+        self.inode: Optional[int] = None
+        # True when the last read stopped at max_bytes_per_read
+        self.has_backlog = False
+        self._file = None
+        self._load_checkpoint()
+        self._saved_checkpoint = self.checkpoint()
+
+    def _load_checkpoint(self) -> None:
+        """Restore offset and inode from the checkpoint file, if any"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                checkpoint = json.load(f)
+            self.offset = int(checkpoint.get("offset", 0))
+            self.inode = checkpoint.get("inode")
+        except Exception as e:
+            print(f"LogTailer: Error loading checkpoint: {e}. Starting at 0.")
+            self.offset = 0
+            self.inode = None
+
+    def save_checkpoint(self, position: Optional[Dict[str, Any]] = None) -> None:
+        """Atomically persist a position (default: the current one)"""
+        if not self.checkpoint_path:
+            return
+        if position is None:
+            position = self.checkpoint()
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(position, f)
+        os.replace(tmp_path, self.checkpoint_path)
+        self._saved_checkpoint = position
+
+    def commit(self, position: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Persist the position reached by read_lines(), or an earlier one
+        taken from checkpoint(), if it differs from the saved one
+        """
+        if position is None:
+            position = self.checkpoint()
+        if position != self._saved_checkpoint:
+            self.save_checkpoint(position)
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Return the current position as a dictionary"""
+        return {"path": self.path, "inode": self.inode, "offset": self.offset}
+
+    def _open(self) -> bool:
+        """Open the log file, resetting the offset if it is a new file"""
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        inode = os.fstat(self._file.fileno()).st_ino
+        if self.inode is not None and inode != self.inode:
+            # The checkpoint belongs to a rotated-away file
+            self.offset = 0
+        self.inode = inode
+        return True
+
+    def _read_chunk(self, limit: int, final: bool = False) -> bytes:
+        """
+        Read up to limit bytes of complete lines from the open file.
+        With final=True a trailing unterminated line is returned as well,
+        which is used once a rotated file will receive no more writes.
+        """
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.offset:
+            print(f"LogTailer: {self.path} was truncated. Restarting at 0.")
+            self.offset = 0
+        if size == self.offset or limit <= 0:
+            return b""
+
+        self._file.seek(self.offset)
+        if size - self.offset > limit:
+            self.has_backlog = True
+        data = self._file.read(min(limit, size - self.offset))
+        if final:
+            self.offset += len(data)
+            return data if data.endswith(b"\n") else data + b"\n"
+
+        end = data.rfind(b"\n")
+        if end == -1:
+            if len(data) < limit:
+                # Partial line still being written; wait for the newline
+                return b""
+            # A single line longer than the limit is emitted as-is
+            end = len(data) - 1
+        data = data[: end + 1]
+        self.offset += len(data)
+        return data
+
+    def _unread_bytes(self) -> int:
+        return os.fstat(self._file.fileno()).st_size - self.offset
+
+    def _rotated(self) -> bool:
+        """Check whether the path now points to a different file"""
+        try:
+            return os.stat(self.path).st_ino != self.inode
+        except FileNotFoundError:
+            return False
+
+    def read_lines(self) -> List[str]:
+        """Return complete lines appended since the last call"""
+        self.has_backlog = False
+        if self._file is None and not self._open():
+            return []
+
+        data = self._read_chunk(self.max_bytes_per_read)
+
+        budget = self.max_bytes_per_read - len(data)
+        if budget > self._unread_bytes() and self._rotated():
+            # Old file gets no more writes; drain it and switch over
+            data += self._read_chunk(
+                self.max_bytes_per_read - len(data), final=True
+            )
+            self.close()
+            self.offset = 0
+            if self._open():
+                data += self._read_chunk(self.max_bytes_per_read - len(data))
+
+        if not data:
+            return []
+        return data.decode("utf-8", errors="replace").splitlines()
+
+    def close(self) -> None:
+        """Close the underlying file handle"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,440 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import hashlib
+import heapq
+import os
+import selectors
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.monitoring.log_tailer import LogTailer
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+# How long the notifier thread blocks in the backend before rechecking stop
+NOTIFIER_WAIT = 0.1
+
+
+class InotifyBackend:
+    """
+    Change notification through Linux inotify, loaded with ctypes.
+
+    Parent directories are watched rather than individual files, so one
+    watch covers every log in a directory, including files created or
+    rotated in later. A file whose directory does not exist yet is covered
+    by a watch on its nearest existing ancestor until the directory is
+    created. wait() blocks in a selector until the kernel reports a write,
+    so idle files cost nothing.
+    """
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+        # Missing directory -> files in it, waiting for it to be created
+        self._missing: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+
+    def watch_directory(self, directory: str) -> None:
+        with self._lock:
+            self._add_watch(directory)
+
+    def _add_watch(self, directory: str) -> None:
+        """Hold self._lock."""
+        if directory in self._dirs.values():
+            return
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), self.MASK
+        )
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+        self._dirs[wd] = directory
+
+    def _watch_nearest(self, directory: str) -> bool:
+        """
+        Watch directory, or its nearest existing ancestor if it does not
+        exist. Returns True if directory itself is watched. Hold self._lock.
+        """
+        watched = None
+        while True:
+            nearest = directory
+            while not os.path.isdir(nearest):
+                nearest = os.path.dirname(nearest)
+            if nearest == watched:
+                return nearest == directory
+            # Recheck after adding the watch: a level created meanwhile
+            # would raise no event in the old ancestor
+            self._add_watch(nearest)
+            watched = nearest
+
+    def watch_file(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        with self._lock:
+            if not self._watch_nearest(directory):
+                self._missing.setdefault(directory, set()).add(path)
+
+    def _resolve_missing(self) -> Set[str]:
+        """Watch missing directories that now exist; return their files."""
+        found: Set[str] = set()
+        with self._lock:
+            for directory in list(self._missing):
+                if self._watch_nearest(directory):
+                    # Files may have been written before the watch existed
+                    found.update(
+                        path
+                        for path in self._missing.pop(directory)
+                        if os.path.exists(path)
+                    )
+        return found
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Return the paths written to within timeout seconds. None means the
+        kernel queue overflowed and every file should be checked.
+        """
+        if not self._selector.select(timeout):
+            return set()
+        changed = self._read_events()
+        if self._missing:
+            found = self._resolve_missing()
+            if changed is not None:
+                changed |= found
+        return changed
+
+    def _read_events(self) -> Optional[Set[str]]:
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                directory = self._dirs.get(wd)
+                if directory is not None and name:
+                    changed.add(os.path.join(directory, os.fsdecode(name)))
+
+    def close(self) -> None:
+        self._selector.close()
+        os.close(self._fd)
+
+
+class PollingBackend:
+    """
+    Portable stat-polling fallback with per-file exponential backoff.
+
+    Files are kept in a heap ordered by their next check time. A file that
+    changed is checked again after min_interval; an idle file's interval
+    doubles up to max_interval, so hundreds of quiet files are stat'ed
+    only occasionally instead of every cycle. Files can be added while
+    another thread is in wait().
+    """
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 5.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._state: Dict[str, Tuple] = {}
+        self._intervals: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._dirs: Dict[str, float] = {}
+        self._next_dir_scan = 0.0
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def watch_directory(self, directory: str) -> None:
+        with self._lock:
+            self._dirs.setdefault(directory, -1.0)
+
+    def watch_file(self, path: str) -> None:
+        with self._lock:
+            if path in self._intervals:
+                return
+            self._state[path] = self._signature(path)
+            self._intervals[path] = self.min_interval
+            heapq.heappush(self._heap, (time.monotonic(), path))
+
+    def _scan_directories(self, now: float) -> Set[str]:
+        """Report files that appeared in watched directories"""
+        new_files: Set[str] = set()
+        if now < self._next_dir_scan:
+            return new_files
+        self._next_dir_scan = now + self.min_interval
+        for directory, last_mtime in list(self._dirs.items()):
+            try:
+                mtime = os.stat(directory).st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime == last_mtime:
+                continue
+            self._dirs[directory] = mtime
+            for entry in os.scandir(directory):
+                if entry.is_file() and entry.path not in self._intervals:
+                    new_files.add(entry.path)
+        return new_files
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                changed = self._scan_directories(now)
+                while self._heap and self._heap[0][0] <= now:
+                    _, path = heapq.heappop(self._heap)
+                    signature = self._signature(path)
+                    if signature != self._state[path]:
+                        self._state[path] = signature
+                        self._intervals[path] = self.min_interval
+                        changed.add(path)
+                    else:
+                        self._intervals[path] = min(
+                            self._intervals[path] * 2, self.max_interval
+                        )
+                    heapq.heappush(self._heap, (now + self._intervals[path], path))
+                if changed or now >= deadline:
+                    return changed
+                next_check = min(
+                    self._heap[0][0] if self._heap else deadline,
+                    self._next_dir_scan if self._dirs else deadline,
+                    deadline,
+                )
+            time.sleep(max(0.0, next_check - now))
+
+    def close(self) -> None:
+        self._heap.clear()
+
+
+class LogWatcher:
+    """
+    Watches many log files and directories and returns new lines per file.
+
+    Each file is read through its own LogTailer, so rotation, truncation
+    and checkpoints behave as for a single tailed file; commit() saves the
+    checkpoints. Directories pick up new files that match `file_pattern`.
+    The inotify backend is used where available, with PollingBackend as
+    the fallback.
+
+    start_notifier() moves the backend wait to a background thread that
+    calls back on every change, so a scheduler waiting on something else
+    (e.g. the message queue) can wake as soon as a log is written.
+    """
+
+    def __init__(
+        self,
+        checkpoint_dir: Optional[str] = None,
+        max_bytes_per_read: int = 1024 * 1024,
+        file_pattern: str = "*.log",
+        use_inotify: Optional[bool] = None,
+    ):
+        self.checkpoint_dir = checkpoint_dir
+        self.max_bytes_per_read = max_bytes_per_read
+        self.file_pattern = file_pattern
+        self.tailers: Dict[str, LogTailer] = {}
+        self._directories: Set[str] = set()
+        self._pending: Set[str] = set()
+
+        # Notifier thread state: changes it collected (None = check all)
+        self._notifier: Optional[threading.Thread] = None
+        self._on_change: Optional[Callable[[], None]] = None
+        self._stopping = False
+        self._changed_lock = threading.Lock()
+        self._changed: Optional[Set[str]] = set()
+        self._changed_event = threading.Event()
+
+        self.backend = None
+        if use_inotify is not False:
+            try:
+                self.backend = InotifyBackend()
+            except (OSError, AttributeError) as e:
+                if use_inotify:
+                    raise
+                print(f"LogWatcher: inotify unavailable ({e}). Using polling.")
+        if self.backend is None:
+            self.backend = PollingBackend()
+
+    def _checkpoint_path(self, path: str) -> Optional[str]:
+        if not self.checkpoint_dir:
+            return None
+        digest = hashlib.sha1(path.encode()).hexdigest()[:16]
+        return os.path.join(self.checkpoint_dir, f"{digest}.checkpoint")
+
+    def add_file(self, path: str) -> None:
+        """Watch a single log file (it need not exist yet)."""
+        path = os.path.abspath(path)
+        if path in self.tailers:
+            return
+        # Watch first so a failed watch leaves no tailer behind
+        self.backend.watch_file(path)
+        self.tailers[path] = LogTailer(
+            path,
+            checkpoint_path=self._checkpoint_path(path),
+            max_bytes_per_read=self.max_bytes_per_read,
+        )
+        # Read anything already appended since the checkpoint
+        self._pending.add(path)
+
+    def add_directory(self, directory: str) -> None:
+        """Watch a directory, including files created in it later."""
+        directory = os.path.abspath(directory)
+        self._directories.add(directory)
+        self.backend.watch_directory(directory)
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path) and fnmatch.fnmatch(name, self.file_pattern):
+                self.add_file(path)
+
+    def add_path(self, path: str) -> None:
+        """Watch a file or a directory."""
+        if os.path.isdir(path):
+            self.add_directory(path)
+        else:
+            self.add_file(path)
+
+    def add_paths(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            self.add_path(path)
+
+    def _accept_new(self, path: str) -> bool:
+        """Start tailing files that appeared in a watched directory"""
+        if path in self.tailers:
+            return True
+        if os.path.dirname(path) in self._directories and fnmatch.fnmatch(
+            os.path.basename(path), self.file_pattern
+        ):
+            self.add_file(path)
+            return True
+        return False
+
+    def poll(self, timeout: float = 0.0) -> List[Tuple[str, List[str]]]:
+        """
+        Wait up to timeout seconds for data and return (path, new lines)
+        for every file that has new complete lines.
+        """
+        # Files with unread backlog are ready now, so don't block
+        wait = 0.0 if self._pending else timeout
+        if self._notifier is None:
+            changed = self.backend.wait(wait)
+        else:
+            self._changed_event.wait(wait)
+            with self._changed_lock:
+                changed, self._changed = self._changed, set()
+                self._changed_event.clear()
+
+        if changed is None:
+            candidates = set(self.tailers)
+        else:
+            candidates = {path for path in changed if self._accept_new(path)}
+        candidates |= self._pending
+        self._pending = set()
+
+        results = []
+        for path in sorted(candidates):
+            tailer = self.tailers[path]
+            lines = tailer.read_lines()
+            if lines:
+                results.append((path, lines))
+            if tailer.has_backlog:
+                # Read budget exhausted; continue next poll without waiting
+                self._pending.add(path)
+        return results
+
+    def start_notifier(self, on_change: Callable[[], None]) -> None:
+        """
+        Wait for writes in a background thread and call on_change() from
+        it whenever watched files change. poll() then takes the changes the
+        thread collected instead of waiting on the backend itself.
+        """
+        if self._notifier is not None:
+            return
+        self._on_change = on_change
+        self._stopping = False
+        self._notifier = threading.Thread(target=self._notify_loop, daemon=True)
+        self._notifier.start()
+
+    def stop_notifier(self) -> None:
+        """Stop the notifier thread; poll() waits on the backend again."""
+        if self._notifier is None:
+            return
+        self._stopping = True
+        self._notifier.join()
+        self._notifier = None
+        # Changes collected but not yet polled are read on the next poll
+        with self._changed_lock:
+            if self._changed is None:
+                self._pending |= set(self.tailers)
+            else:
+                self._pending |= {p for p in self._changed if self._accept_new(p)}
+            self._changed = set()
+            self._changed_event.clear()
+
+    def _notify_loop(self) -> None:
+        while not self._stopping:
+            changed = self.backend.wait(NOTIFIER_WAIT)
+            if changed == set():
+                continue
+            with self._changed_lock:
+                if changed is None or self._changed is None:
+                    self._changed = None
+                else:
+                    self._changed |= changed
+                self._changed_event.set()
+            try:
+                self._on_change()
+            except Exception as e:
+                print(f"LogWatcher: Error in change callback: {e}")
+
+    def checkpoints(self) -> Dict[str, Dict]:
+        """Current position of every file, for a later commit()."""
+        return {path: tailer.checkpoint() for path, tailer in self.tailers.items()}
+
+    def commit(self, positions: Optional[Dict[str, Dict]] = None) -> None:
+        """
+        Persist every file's position once polled lines are handled, or
+        the positions from an earlier checkpoints() call.
+        """
+        if positions is None:
+            positions = self.checkpoints()
+        for path, position in positions.items():
+            tailer = self.tailers.get(path)
+            if tailer is not None:
+                tailer.commit(position)
+
+    def close(self) -> None:
+        self.stop_notifier()
+        for tailer in self.tailers.values():
+            tailer.close()
+        self.backend.close()
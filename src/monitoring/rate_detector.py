@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+
+class RateDetector:
+    """
+    Per-key sliding-window event rate detector.
+
+    record() returns True when a key sees more than `threshold` events within
+    `window_seconds`. Each key keeps at most threshold + 1 timestamps, so an
+    update is O(1) amortized. Keys are held in LRU order and the least
+    recently seen key is evicted once `max_keys` is reached, which bounds
+    total memory no matter how many distinct sources appear.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 3,
+        window_seconds: float = 60.0,
+        max_keys: int = 100000,
+    ):
+        if threshold < 1:
+            raise ValueError("threshold must be at least 1")
+        if max_keys < 1:
+            raise ValueError("max_keys must be at least 1")
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._windows: "OrderedDict[str, deque]" = OrderedDict()
+
+    def record(self, key: str, timestamp: Optional[float] = None) -> bool:
+        """Record an event for key; return True if the rate is exceeded."""
+        if timestamp is None:
+            timestamp = time.time()
+
+        window = self._windows.get(key)
+        if window is None:
+            if len(self._windows) >= self.max_keys:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+            window = deque(maxlen=self.threshold + 1)
+            self._windows[key] = window
+        else:
+            self._windows.move_to_end(key)
+
+        window.append(timestamp)
+        cutoff = timestamp - self.window_seconds
+        while window and window[0] <= cutoff:
+            window.popleft()
+
+        if len(window) > self.threshold:
+            # Reset so a sustained burst alerts once per threshold crossing
+            window.clear()
+            return True
+        return False
+
+    def count(self, key: str, now: Optional[float] = None) -> int:
+        """Return the number of events for key still inside the window."""
+        window = self._windows.get(key)
+        if not window:
+            return 0
+        if now is None:
+            now = time.time()
+        cutoff = now - self.window_seconds
+        return sum(1 for timestamp in window if timestamp > cutoff)
+
+    def __len__(self) -> int:
+        return len(self._windows)
@@ -0,0 +1,397 @@
+import asyncio
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from src.monitoring.alert_coalescer import AlertCoalescer
+
+# <PRI>VERSION TIMESTAMP HOSTNAME APP-NAME PROCID MSGID
+_HEADER = re.compile(
+    rb"<(\d{1,3})>(\d{1,2}) (\S+) (\S+) (\S+) (\S+) (\S+) "
+)
+_TIMESTAMP = re.compile(
+    r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d{1,6}))?(Z|[+-]\d{2}:\d{2})$"
+)
+_BOM = b"\xef\xbb\xbf"
+
+
+class SyslogRecord(NamedTuple):
+    """An RFC5424 syslog message."""
+
+    facility: int
+    severity: int
+    timestamp: Optional[float]
+    hostname: Optional[str]
+    app_name: Optional[str]
+    procid: Optional[str]
+    msgid: Optional[str]
+    structured_data: Optional[str]
+    message: str
+
+
+def _nil(value: bytes) -> Optional[str]:
+    return None if value == b"-" else value.decode("utf-8", errors="replace")
+
+
+_second_cache: Dict[str, float] = {}
+
+
+def parse_rfc3339(text: str) -> Optional[float]:
+    """Convert an RFC5424 timestamp to a Unix timestamp (None for '-')."""
+    match = _TIMESTAMP.match(text)
+    if match is None:
+        return None
+    base, fraction, offset = match.groups()
+    key = base + offset
+    seconds = _second_cache.get(key)
+    if seconds is None:
+        if offset == "Z":
+            tz = timezone.utc
+        else:
+            sign = 1 if offset[0] == "+" else -1
+            tz = timezone(
+                sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6]))
+            )
+        seconds = (
+            datetime.strptime(base, "%Y-%m-%dT%H:%M:%S")
+            .replace(tzinfo=tz)
+            .timestamp()
+        )
+        if len(_second_cache) >= 4096:
+            _second_cache.clear()
+        _second_cache[key] = seconds
+    if fraction:
+        seconds += int(fraction) / 10 ** len(fraction)
+    return seconds
+
+
+def _structured_data_end(data: bytes, pos: int) -> int:
+    """Return the index just past the STRUCTURED-DATA field starting at pos"""
+    if data[pos : pos + 1] == b"-":
+        return pos + 1
+    in_quotes = False
+    while pos < len(data):
+        char = data[pos : pos + 1]
+        if in_quotes:
+            if char == b"\\":
+                pos += 1
+            elif char == b'"':
+                in_quotes = False
+        elif char == b'"':
+            in_quotes = True
+        elif char == b"]":
+            if data[pos + 1 : pos + 2] != b"[":
+                return pos + 1
+        pos += 1
+    raise ValueError("Unterminated structured data")
+
+
+def parse_rfc5424(data: Union[bytes, str]) -> Optional[SyslogRecord]:
+    """Parse one RFC5424 frame, returning None if it is malformed."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    data = data.rstrip(b"\r\n")
+    header = _HEADER.match(data)
+    if header is None:
+        return None
+    pri = int(header.group(1))
+    if pri > 191:
+        return None
+
+    try:
+        sd_end = _structured_data_end(data, header.end())
+    except ValueError:
+        return None
+    structured_data = _nil(data[header.end() : sd_end])
+
+    message = data[sd_end + 1 :] if data[sd_end : sd_end + 1] == b" " else b""
+    if message.startswith(_BOM):
+        message = message[len(_BOM) :]
+
+    return SyslogRecord(
+        facility=pri >> 3,
+        severity=pri & 7,
+        timestamp=parse_rfc3339(header.group(3).decode("ascii", "replace")),
+        hostname=_nil(header.group(4)),
+        app_name=_nil(header.group(5)),
+        procid=_nil(header.group(6)),
+        msgid=_nil(header.group(7)),
+        structured_data=structured_data,
+        message=message.decode("utf-8", errors="replace"),
+    )
+
+
+class SyslogFramer:
+    """
+    Splits a TCP byte stream into syslog frames (RFC6587). Octet-counted
+    frames (`LEN SP MSG`) are used when a frame starts with a digit;
+    otherwise frames are newline-delimited.
+    """
+
+    def __init__(self, max_frame_size: int = 64 * 1024):
+        self.max_frame_size = max_frame_size
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes and return every complete frame."""
+        buffer = self._buffer + data
+        frames = []
+        pos = 0
+        size = len(buffer)
+        while pos < size:
+            if buffer[pos : pos + 1].isdigit():
+                space = buffer.find(b" ", pos, pos + 8)
+                if space == -1:
+                    if size - pos >= 8:
+                        raise ValueError("Invalid octet count")
+                    break
+                length = int(buffer[pos:space])
+                if length > self.max_frame_size:
+                    raise ValueError(f"Frame of {length} bytes is too large")
+                end = space + 1 + length
+                if end > size:
+                    break
+                frames.append(buffer[space + 1 : end])
+                pos = end
+            else:
+                newline = buffer.find(b"\n", pos)
+                if newline == -1:
+                    if size - pos > self.max_frame_size:
+                        raise ValueError("Frame too large")
+                    break
+                if newline > pos:
+                    frames.append(buffer[pos:newline])
+                pos = newline + 1
+        self._buffer = buffer[pos:]
+        return frames
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: "SyslogServer"):
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.server.submit_nowait([data])
+
+
+class SyslogServer:
+    """
+    Asyncio RFC5424 syslog listener (UDP and TCP) feeding a SecurityAgent.
+
+    Frames are parsed as they arrive, batched, and run through the agent's
+    anomaly detector in one pass per batch; alerts go through the server's
+    own AlertCoalescer. The server runs its event loop in a background
+    thread, so the agent loop is never blocked.
+
+    Backpressure: when the admin agent's queue holds max_admin_queue_depth
+    messages or more, the batch consumer pauses. The bounded ingest queue
+    then fills, TCP connections stop being read (so senders are throttled
+    by TCP flow control) and excess UDP datagrams are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        security_agent,
+        host: str = "127.0.0.1",
+        udp_port: Optional[int] = 5514,
+        tcp_port: Optional[int] = 5514,
+        batch_size: int = 1000,
+        batch_interval: float = 0.05,
+        max_pending: int = 1000,
+        max_admin_queue_depth: int = 10000,
+        coalesce_window: float = 1.0,
+    ):
+        self.security_agent = security_agent
+        self.host = host
+        self.udp_port = udp_port
+        self.tcp_port = tcp_port
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_pending = max_pending
+        self.max_admin_queue_depth = max_admin_queue_depth
+        self.alert_coalescer = AlertCoalescer(window_seconds=coalesce_window)
+        self.stats = {
+            "received": 0,
+            "parse_errors": 0,
+            "dropped": 0,
+            "batches": 0,
+            "anomalies": 0,
+            "alerts_sent": 0,
+            "backpressure_waits": 0,
+        }
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stopping: Optional[asyncio.Event] = None
+        self._startup_error: Optional[BaseException] = None
+
+    # Ingestion
+
+    def submit_nowait(self, frames: List[bytes]) -> None:
+        """Queue frames without waiting; drop them if the queue is full."""
+        try:
+            self._queue.put_nowait(frames)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += len(frames)
+
+    async def _handle_tcp(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        framer = SyslogFramer()
+        try:
+            while True:
+                data = await reader.read(64 * 1024)
+                if not data:
+                    break
+                frames = framer.feed(data)
+                if frames:
+                    # Blocks while the queue is full, pausing this reader
+                    await self._queue.put(frames)
+        except ValueError as e:
+            print(f"SyslogServer: Closing TCP connection: {e}")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Processing
+
+    def _admin_saturated(self) -> bool:
+        message_queue = self.security_agent.message_queue
+        if message_queue is None:
+            return False
+        depth = message_queue.queue_depth(self.security_agent.admin_id)
+        return depth >= self.max_admin_queue_depth
+
+    async def _next_batch(self) -> List[bytes]:
+        # Wake up periodically even when idle so coalesced alerts are flushed
+        try:
+            frames = await asyncio.wait_for(
+                self._queue.get(), self.alert_coalescer.window_seconds or 1.0
+            )
+        except asyncio.TimeoutError:
+            return []
+        deadline = time.monotonic() + self.batch_interval
+        while len(frames) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                frames.extend(
+                    await asyncio.wait_for(self._queue.get(), remaining)
+                )
+            except asyncio.TimeoutError:
+                break
+        return frames
+
+    def process_frames(self, frames: List[bytes]) -> List[Dict[str, Any]]:
+        """Parse a batch of frames and return the alerts now due."""
+        records = []
+        for frame in frames:
+            record = parse_rfc5424(frame)
+            if record is None:
+                self.stats["parse_errors"] += 1
+            else:
+                records.append(record)
+        self.stats["received"] += len(frames)
+
+        detector = self.security_agent.detector
+        messages = [record.message.replace("\n", " ") for record in records]
+        for index, categories in detector.matcher.scan_indexed(messages):
+            record = records[index]
+            for anomaly in detector.make_anomalies(messages[index], categories):
+                if record.timestamp is not None:
+                    anomaly["timestamp"] = record.timestamp
+                anomaly["source_host"] = record.hostname
+                anomaly["app_name"] = record.app_name
+                self.stats["anomalies"] += 1
+                self.alert_coalescer.add(anomaly)
+        return self.alert_coalescer.flush()
+
+    def _send_alerts(self, alerts: List[Dict[str, Any]]) -> None:
+        for alert in alerts:
+            self.security_agent.send_alert(alert)
+            self.stats["alerts_sent"] += 1
+
+    async def _consume(self) -> None:
+        while True:
+            while self._admin_saturated():
+                self.stats["backpressure_waits"] += 1
+                await asyncio.sleep(self.batch_interval)
+            frames = await self._next_batch()
+            if frames:
+                self.stats["batches"] += 1
+            try:
+                self._send_alerts(self.process_frames(frames))
+            except Exception as e:
+                # Keep ingesting; one bad batch must not stop the listener
+                print(f"SyslogServer: Error processing batch: {e}")
+
+    # Lifecycle
+
+    async def serve(self) -> None:
+        """Run the listeners until stop() is called."""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._stopping = asyncio.Event()
+
+        transport = None
+        tcp_server = None
+        try:
+            if self.udp_port is not None:
+                transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _UdpProtocol(self),
+                    local_addr=(self.host, self.udp_port),
+                )
+                self.udp_port = transport.get_extra_info("sockname")[1]
+            if self.tcp_port is not None:
+                tcp_server = await asyncio.start_server(
+                    self._handle_tcp, self.host, self.tcp_port
+                )
+                self.tcp_port = tcp_server.sockets[0].getsockname()[1]
+        except BaseException as e:
+            self._startup_error = e
+            self._ready.set()
+            raise
+
+        consumer = asyncio.ensure_future(self._consume())
+        self._ready.set()
+        print(
+            f"SyslogServer: Listening on {self.host} "
+            f"(udp={self.udp_port}, tcp={self.tcp_port})"
+        )
+        try:
+            await self._stopping.wait()
+        finally:
+            consumer.cancel()
+            if transport is not None:
+                transport.close()
+            if tcp_server is not None:
+                tcp_server.close()
+                await tcp_server.wait_closed()
+            self._send_alerts(self.alert_coalescer.flush(force=True))
+
+    def start(self) -> None:
+        """Start the server in a background thread."""
+        self._ready.clear()
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self.serve()),
+            name="syslog-server",
+            daemon=True,
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    def stop(self) -> None:
+        """Stop the server and flush pending alerts."""
+        if self._loop is None or self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,39 @@
+from src.routing.circuit_breaker import (
+    DEFAULT_SEVERITY_DEADLINES,
+    CircuitBreaker,
+    deadline_for,
+)
+from src.routing.decision_cache import DecisionCache, incident_key
+from src.routing.llm_client import (
+    LLMRoutingClient,
+    build_batch_messages,
+    build_messages,
+    parse_batch_decisions,
+)
+from src.routing.local_classifier import LocalClassifier, training_data
+from src.routing.rate_limiter import (
+    RateLimiter,
+    estimate_tokens,
+    parse_retry_after,
+    priority_of,
+)
+from src.routing.single_flight import SingleFlight
+
+__all__ = [
+    "CircuitBreaker",
+    "DEFAULT_SEVERITY_DEADLINES",
+    "deadline_for",
+    "DecisionCache",
+    "incident_key",
+    "LLMRoutingClient",
+    "build_messages",
+    "build_batch_messages",
+    "parse_batch_decisions",
+    "LocalClassifier",
+    "training_data",
+    "RateLimiter",
+    "estimate_tokens",
+    "parse_retry_after",
+    "priority_of",
+    "SingleFlight",
+]
@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Per-decision deadline (seconds) for the AI call, by incident severity
+DEFAULT_SEVERITY_DEADLINES = {
+    "critical": 1.0,
+    "high": 2.0,
+    "medium": 5.0,
+    "low": 10.0,
+}
+
+
+def deadline_for(
+    severity: Optional[str],
+    deadlines: Optional[Dict[str, float]] = None,
+    default: float = 10.0,
+) -> float:
+    """Return the AI routing deadline for an incident severity."""
+    deadlines = DEFAULT_SEVERITY_DEADLINES if deadlines is None else deadlines
+    return deadlines.get(str(severity).lower(), default)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to the AI routing endpoint.
+
+    The breaker opens after `failure_threshold` consecutive failures, where
+    a call slower than `latency_threshold` seconds also counts as a failure.
+    While open, allow_request() returns False so callers go straight to
+    rule-based routing. After `reset_timeout` seconds a single probe is let
+    through (half-open): success closes the breaker, failure re-opens it.
+    Calls still in flight when the breaker opens cannot close it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        latency_threshold: float = 5.0,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+
+        # Metrics
+        self.successes = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _update_state(self) -> None:
+        if (
+            self._state == OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._update_state()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be made now."""
+        with self._lock:
+            self._update_state()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self.times_opened += 1
+
+    def record_success(self, latency: float = 0.0) -> None:
+        """Record a completed call; slow calls count as failures."""
+        if latency > self.latency_threshold:
+            with self._lock:
+                self.slow_calls += 1
+            self.record_failure()
+            return
+        with self._lock:
+            self.successes += 1
+            if self._state == OPEN:
+                # A call made before the breaker opened; only the
+                # half-open probe may close it
+                return
+            self.consecutive_failures = 0
+            self._state = CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED
+                and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the breaker state and counters."""
+        with self._lock:
+            self._update_state()
+            return {
+                "state": self._state,
+                "consecutive_failures": self.consecutive_failures,
+                "successes": self.successes,
+                "failures": self.failures,
+                "slow_calls": self.slow_calls,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+            }
@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.monitoring.alert_coalescer import normalize_description
+
+
+def incident_key(anomaly: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    Normalized (type, description, severity) key for an incident. Numbers
+    are folded: the responder does not depend on which room or IP it is.
+    """
+    return (
+        str(anomaly.get("type", "unknown")).lower(),
+        normalize_description(
+            str(anomaly.get("description", "")), fold_numbers=True
+        ),
+        str(anomaly.get("severity", "unknown")).lower(),
+    )
+
+
+class DecisionCache:
+    """
+    LRU cache of routing decisions with a time-to-live.
+
+    Keys are normalized incident keys (see incident_key), so incidents that
+    differ only by timestamps or counters share an entry. Entries expire
+    after `ttl` seconds and the least recently used entry is evicted once
+    `max_size` is reached. With a `persist_path` the cache can be saved to
+    and reloaded from a JSON file across restarts.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 300.0,
+        persist_path: Optional[str] = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self.hits = 0
+        self.misses = 0
+        # key -> (decision, expires_at), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        if persist_path:
+            self.load()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[str]:
+        """Return the cached decision for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple[str, str, str], decision: str) -> None:
+        """Store a decision for key."""
+        with self._lock:
+            self._entries[key] = (decision, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def save(self) -> None:
+        """Write unexpired entries to persist_path if anything changed."""
+        if not self.persist_path or not self._dirty:
+            return
+        now = time.time()
+        with self._lock:
+            entries = [
+                [list(key), decision, expires_at]
+                for key, (decision, expires_at) in self._entries.items()
+                if expires_at > now
+            ]
+            self._dirty = False
+        directory = os.path.dirname(self.persist_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.persist_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.persist_path)
+
+    def load(self) -> None:
+        """Load unexpired entries from persist_path, if it exists."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "r") as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"DecisionCache: Error loading {self.persist_path}: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            for key, decision, expires_at in entries[-self.max_size :]:
+                if expires_at > now:
+                    self._entries[tuple(key)] = (decision, expires_at)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,351 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.routing.circuit_breaker import CircuitBreaker, deadline_for
+from src.routing.rate_limiter import (
+    RateLimiter,
+    estimate_tokens,
+    parse_retry_after,
+    priority_of,
+)
+
+SYSTEM_PROMPT = (
+    "You are an emergency response coordinator AI. Your job is to determine "
+    "whether a 'firefighter' or 'police' should respond to an incident based "
+    "on the details provided."
+)
+
+BATCH_SYSTEM_PROMPT = (
+    SYSTEM_PROMPT
+    + " You will be given several numbered incidents. Reply with only a JSON "
+    "array containing one string per incident, in the same order, each "
+    "either \"firefighter\" or \"police\"."
+)
+
+VALID_DECISIONS = ("firefighter", "police")
+
+
+def build_messages(anomaly: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Chat messages asking the model to route a single incident."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": f"Incident details: Type: {anomaly.get('type', 'unknown')}, Description: {anomaly.get('description', 'No description')}, Severity: {anomaly.get('severity', 'unknown')}. Should 'firefighter' or 'police' respond? Answer with only one word: either 'firefighter' or 'police'.",
+        },
+    ]
+
+
+def _describe(anomaly: Dict[str, Any]) -> str:
+    return f"Type: {anomaly.get('type', 'unknown')}, Description: {anomaly.get('description', 'No description')}, Severity: {anomaly.get('severity', 'unknown')}"
+
+
+def build_batch_messages(anomalies: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Chat messages asking the model to route several incidents at once."""
+    incidents = "\n".join(
+        f"{number}. {_describe(anomaly)}"
+        for number, anomaly in enumerate(anomalies, 1)
+    )
+    return [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": f"Incidents:\n{incidents}\nAnswer with a JSON array of {len(anomalies)} strings.",
+        },
+    ]
+
+
+def parse_batch_decisions(content: str, count: int) -> List[Optional[str]]:
+    """
+    Parse a JSON array answer into one decision per incident. Items that
+    are not 'firefighter' or 'police' become None; if the array is missing
+    or has the wrong length every item is None, since positions can't be
+    trusted.
+    """
+    start = content.find("[")
+    end = content.rfind("]")
+    if start < 0 or end < start:
+        return [None] * count
+    try:
+        items = json.loads(content[start : end + 1])
+    except ValueError:
+        return [None] * count
+    if not isinstance(items, list) or len(items) != count:
+        return [None] * count
+
+    decisions: List[Optional[str]] = []
+    for item in items:
+        decision = item.strip().lower() if isinstance(item, str) else None
+        decisions.append(decision if decision in VALID_DECISIONS else None)
+    return decisions
+
+
+class LLMRoutingClient:
+    """
+    Client for an OpenAI-compatible chat completions endpoint.
+
+    A single requests.Session keeps a pool of keep-alive connections, so
+    calls after the first skip the TCP/TLS handshake. classify_many runs
+    up to `max_concurrency` classifications at once on a thread pool.
+    With `batch_size` > 1, classify_many packs up to that many incidents
+    into each request so the system prompt is sent once per batch.
+
+    An optional CircuitBreaker short-circuits calls while the endpoint is
+    failing or slow, and `severity_deadlines` caps each request's timeout
+    by the most urgent incident it carries.
+
+    With a RateLimiter, each request first waits for requests/min and
+    tokens/min quota, most urgent incidents first. A 429 response pauses
+    the limiter for the Retry-After period and the request is retried (up
+    to `max_retries` times) as long as its deadline allows.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        url: str,
+        model: str,
+        timeout: float = 10,
+        max_concurrency: int = 8,
+        batch_size: int = 1,
+        breaker: Optional[CircuitBreaker] = None,
+        severity_deadlines: Optional[Dict[str, float]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 2,
+    ):
+        self.api_key = api_key
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.batch_size = max(1, batch_size)
+        self.breaker = breaker
+        self.severity_deadlines = severity_deadlines
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_concurrency, pool_block=True
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+            }
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def complete(
+        self, messages: List[Dict[str, str]], timeout: Optional[float] = None
+    ) -> requests.Response:
+        """POST a chat completion request over the pooled session."""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.1,  # Low temperature for more deterministic responses
+        }
+        return self.session.post(
+            self.url,
+            data=json.dumps(payload),
+            timeout=self.timeout if timeout is None else timeout,
+        )
+
+    def deadline(self, anomalies: List[Dict[str, Any]]) -> float:
+        """Request timeout for a set of incidents: the tightest deadline."""
+        if self.severity_deadlines is None:
+            return self.timeout
+        return min(
+            min(
+                deadline_for(
+                    anomaly.get("severity"), self.severity_deadlines, self.timeout
+                ),
+                self.timeout,
+            )
+            for anomaly in anomalies
+        )
+
+    def _answer(
+        self,
+        messages: List[Dict[str, str]],
+        timeout: Optional[float] = None,
+        priority: int = 1,
+        completion_tokens: int = 8,
+    ) -> Optional[str]:
+        """Return the model's reply text, or None if the call failed."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        tokens = estimate_tokens(messages, completion_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(
+                tokens, priority, timeout=deadline - time.monotonic()
+            ):
+                print("LLMRoutingClient: Rate limit wait exceeded the deadline.")
+                return None
+            # Every attempt, including retries, must finish by the deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print("LLMRoutingClient: Deadline passed before the API call.")
+                return None
+            if self.breaker is not None and not self.breaker.allow_request():
+                print("LLMRoutingClient: Circuit open, skipping API call.")
+                return None
+            start = time.monotonic()
+            try:
+                response = self.complete(messages, remaining)
+                if response.status_code == 429:
+                    # Quota exceeded: the endpoint is healthy, so wait it out
+                    if self.breaker is not None:
+                        self.breaker.record_success(time.monotonic() - start)
+                    retry_after = parse_retry_after(
+                        response.headers.get("Retry-After")
+                    )
+                    retry_after = 1.0 if retry_after is None else retry_after
+                    print(
+                        f"LLMRoutingClient: Rate limited (429), retrying after {retry_after:.1f}s"
+                    )
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.defer(retry_after)
+                    elif time.monotonic() + retry_after < deadline:
+                        time.sleep(retry_after)
+                    else:
+                        return None
+                    continue
+                if response.status_code != 200:
+                    print(f"LLMRoutingClient: API error {response.status_code}")
+                    if self.breaker is not None:
+                        self.breaker.record_failure()
+                    return None
+                result = response.json()
+                answer = result["choices"][0]["message"]["content"]
+            except Exception as e:
+                print(f"LLMRoutingClient: Error calling API: {e}")
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                return None
+            if self.breaker is not None:
+                self.breaker.record_success(time.monotonic() - start)
+            return answer
+
+        print("LLMRoutingClient: Still rate limited after retries.")
+        return None
+
+    def classify(
+        self, anomaly: Dict[str, Any], priority: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Return 'firefighter' or 'police' for an incident, or None if the
+        call failed or the answer was not one of the two.
+        """
+        answer = self._answer(
+            build_messages(anomaly),
+            self.deadline([anomaly]),
+            priority_of(anomaly) if priority is None else priority,
+        )
+        if answer is None:
+            return None
+
+        decision = answer.strip().lower()
+        if decision not in VALID_DECISIONS:
+            print(f"LLMRoutingClient: Got unexpected response '{decision}'.")
+            return None
+        return decision
+
+    def classify_batch(
+        self, anomalies: List[Dict[str, Any]], priority: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """Classify several incidents in a single request."""
+        if len(anomalies) == 1:
+            return [self.classify(anomalies[0], priority)]
+        if priority is None:
+            priority = min(priority_of(anomaly) for anomaly in anomalies)
+        answer = self._answer(
+            build_batch_messages(anomalies),
+            self.deadline(anomalies),
+            priority,
+            completion_tokens=8 * len(anomalies),
+        )
+        if answer is None:
+            return [None] * len(anomalies)
+
+        decisions = parse_batch_decisions(answer, len(anomalies))
+        invalid = decisions.count(None)
+        if invalid:
+            print(
+                f"LLMRoutingClient: {invalid} of {len(anomalies)} batch answers were invalid."
+            )
+        return decisions
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="llm-routing",
+                )
+            return self._executor
+
+    def classify_many(
+        self,
+        anomalies: List[Dict[str, Any]],
+        priorities: Optional[List[int]] = None,
+    ) -> List[Optional[str]]:
+        """
+        Classify incidents concurrently, batch_size per request. Lower
+        priority ranks are sent first (by default ranked from severity).
+        Results keep the input order.
+        """
+        if not anomalies:
+            return []
+        if priorities is None:
+            priorities = [priority_of(anomaly) for anomaly in anomalies]
+        # Most urgent first, and batch incidents with similar deadlines
+        # together so one urgent incident doesn't shorten the timeout for
+        # a batch of low ones
+        order = sorted(
+            range(len(anomalies)),
+            key=lambda index: (
+                priorities[index],
+                self.deadline([anomalies[index]]),
+            ),
+        )
+        batches = [
+            order[start : start + self.batch_size]
+            for start in range(0, len(order), self.batch_size)
+        ]
+
+        def run_batch(batch: List[int]) -> List[Optional[str]]:
+            return self.classify_batch(
+                [anomalies[index] for index in batch],
+                min(priorities[index] for index in batch),
+            )
+
+        if len(batches) == 1:
+            results = run_batch(batches[0])
+        else:
+            results = []
+            for batch_decisions in self.executor.map(run_batch, batches):
+                results.extend(batch_decisions)
+
+        decisions: List[Optional[str]] = [None] * len(anomalies)
+        for index, decision in zip(order, results):
+            decisions[index] = decision
+        return decisions
+
+    def close(self) -> None:
+        """Shut down the worker threads and pooled connections."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self.session.close()
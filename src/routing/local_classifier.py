@@ -0,0 +1,327 @@
+import argparse
+import os
+import re
+import sys
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Service agent -> routing decision used as the training label
+DEFAULT_LABELS = {"firefighter": "firefighter", "police": "police"}
+
+
+def incident_tokens(anomaly: Dict[str, Any]) -> List[str]:
+    """Feature tokens for an incident: type, severity, words and bigrams."""
+    words = _TOKEN_PATTERN.findall(str(anomaly.get("description", "")).lower())
+    tokens = [
+        f"type={str(anomaly.get('type', 'unknown')).lower()}",
+        f"severity={str(anomaly.get('severity', 'unknown')).lower()}",
+    ]
+    tokens.extend(words)
+    tokens.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return tokens
+
+
+def training_data(
+    incidents: Sequence[Dict[str, Any]],
+    labels: Optional[Dict[str, str]] = None,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Turn logged incidents into (anomalies, labels), labelling each by the
+    service it was dispatched to (or the agent it was assigned to, for
+    incidents logged without a service). Other services are skipped.
+    """
+    labels = DEFAULT_LABELS if labels is None else labels
+    anomalies, targets = [], []
+    for incident in incidents:
+        label = labels.get(incident.get("service", incident.get("assigned_to")))
+        if label is not None and incident.get("anomaly"):
+            anomalies.append(incident["anomaly"])
+            targets.append(label)
+    return anomalies, targets
+
+
+class LocalClassifier:
+    """
+    Hashed-feature softmax classifier for routing incidents, consulted
+    before the LLM.
+
+    Tokens are hashed (CRC32, stable across processes) into `n_features`
+    buckets with a sign bit to reduce collision bias, and each incident's
+    feature vector is L2-normalized. classify() returns a label only when
+    the top class probability reaches `threshold`; otherwise None, and the
+    caller should ask the LLM.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2**14,
+        threshold: float = 0.9,
+        epochs: int = 30,
+        learning_rate: float = 1.0,
+        l2: float = 1e-4,
+        batch_size: int = 32,
+        seed: int = 0,
+    ):
+        self.n_features = n_features
+        self.threshold = threshold
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.batch_size = batch_size
+        self.seed = seed
+        self.classes: List[str] = []
+        self.weights: Optional[np.ndarray] = None  # (n_features, n_classes)
+        self.bias: Optional[np.ndarray] = None  # (n_classes,)
+        self._token_cache: Dict[str, Tuple[int, float]] = {}
+
+    @property
+    def trained(self) -> bool:
+        return self.weights is not None
+
+    def _hash(self, token: str) -> Tuple[int, float]:
+        cached = self._token_cache.get(token)
+        if cached is None:
+            h = zlib.crc32(token.encode())
+            cached = (h % self.n_features, 1.0 if h & 0x80000000 else -1.0)
+            if len(self._token_cache) < 100000:
+                self._token_cache[token] = cached
+        return cached
+
+    def features(self, anomaly: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse (indices, values) feature vector for one incident."""
+        buckets: Dict[int, float] = {}
+        for token in incident_tokens(anomaly):
+            index, sign = self._hash(token)
+            buckets[index] = buckets.get(index, 0.0) + sign
+        indices = np.fromiter(buckets.keys(), dtype=np.int64, count=len(buckets))
+        values = np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets))
+        norm = np.linalg.norm(values)
+        if norm:
+            values /= norm
+        return indices, values
+
+    @staticmethod
+    def _flatten(
+        feature_rows: Sequence[Tuple[np.ndarray, np.ndarray]],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Stack sparse rows into (row, feature index, value) arrays."""
+        rows = np.repeat(
+            np.arange(len(feature_rows)),
+            [len(indices) for indices, _ in feature_rows],
+        )
+        indices = np.concatenate([indices for indices, _ in feature_rows])
+        values = np.concatenate([values for _, values in feature_rows])
+        return rows, indices, values
+
+    def _scores(
+        self, rows: np.ndarray, indices: np.ndarray, values: np.ndarray, count: int
+    ) -> np.ndarray:
+        """Linear class scores for flattened sparse rows."""
+        scores = np.zeros((count, len(self.classes)), np.float32)
+        np.add.at(scores, rows, values[:, None] * self.weights[indices])
+        return scores + self.bias
+
+    @staticmethod
+    def _softmax(scores: np.ndarray) -> np.ndarray:
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def fit(
+        self, anomalies: Sequence[Dict[str, Any]], labels: Sequence[str]
+    ) -> "LocalClassifier":
+        """Train with mini-batch gradient descent on cross-entropy loss."""
+        if len(anomalies) != len(labels):
+            raise ValueError("anomalies and labels must have the same length")
+        if len(set(labels)) < 2:
+            raise ValueError("need at least two distinct labels to train")
+        self.classes = sorted(set(labels))
+        class_index = {label: i for i, label in enumerate(self.classes)}
+        y = np.array([class_index[label] for label in labels])
+
+        rng = np.random.default_rng(self.seed)
+        self.weights = np.zeros((self.n_features, len(self.classes)), np.float32)
+        self.bias = np.zeros(len(self.classes), np.float32)
+        feature_rows = [self.features(anomaly) for anomaly in anomalies]
+
+        for _ in range(self.epochs):
+            order = rng.permutation(len(anomalies))
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start : start + self.batch_size]
+                rows, indices, values = self._flatten(
+                    [feature_rows[sample] for sample in batch]
+                )
+                probs = self._softmax(self._scores(rows, indices, values, len(batch)))
+                probs[np.arange(len(batch)), y[batch]] -= 1.0
+                probs /= len(batch)
+
+                self.weights *= 1.0 - self.learning_rate * self.l2
+                np.add.at(
+                    self.weights,
+                    indices,
+                    -self.learning_rate * values[:, None] * probs[rows],
+                )
+                self.bias -= self.learning_rate * probs.sum(axis=0)
+        return self
+
+    def predict_proba(self, anomalies: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Class probabilities, shape (len(anomalies), len(classes))."""
+        if not self.trained:
+            raise RuntimeError("LocalClassifier has not been trained")
+        if len(anomalies) == 1:
+            indices, values = self.features(anomalies[0])
+            scores = (values @ self.weights[indices] + self.bias)[None, :]
+        else:
+            rows, indices, values = self._flatten(
+                [self.features(anomaly) for anomaly in anomalies]
+            )
+            scores = self._scores(rows, indices, values, len(anomalies))
+        return self._softmax(scores)
+
+    def predict(self, anomaly: Dict[str, Any]) -> Tuple[str, float]:
+        """Return (label, confidence) for one incident."""
+        probs = self.predict_proba([anomaly])[0]
+        best = int(probs.argmax())
+        return self.classes[best], float(probs[best])
+
+    def classify(self, anomaly: Dict[str, Any]) -> Optional[str]:
+        """Return a label if confidence reaches threshold, else None."""
+        if not self.trained:
+            return None
+        label, confidence = self.predict(anomaly)
+        return label if confidence >= self.threshold else None
+
+    def evaluate(
+        self, anomalies: Sequence[Dict[str, Any]], labels: Sequence[str]
+    ) -> Dict[str, float]:
+        """
+        Accuracy over all incidents, the share answered locally at the
+        current threshold (coverage), and the accuracy of those answers.
+        """
+        if not anomalies:
+            return {
+                "samples": 0,
+                "accuracy": 0.0,
+                "coverage": 0.0,
+                "confident_accuracy": 0.0,
+            }
+        probs = self.predict_proba(anomalies)
+        predicted = np.array(self.classes)[probs.argmax(axis=1)]
+        correct = predicted == np.array(labels)
+        confident = probs.max(axis=1) >= self.threshold
+        return {
+            "samples": len(anomalies),
+            "accuracy": float(correct.mean()),
+            "coverage": float(confident.mean()),
+            "confident_accuracy": float(correct[confident].mean())
+            if confident.any()
+            else 0.0,
+        }
+
+    def save(self, path: str) -> None:
+        if not self.trained:
+            raise RuntimeError("LocalClassifier has not been trained")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                weights=self.weights,
+                bias=self.bias,
+                classes=np.array(self.classes),
+                n_features=self.n_features,
+                threshold=self.threshold,
+            )
+
+    @classmethod
+    def load(cls, path: str, threshold: Optional[float] = None) -> "LocalClassifier":
+        with np.load(path) as data:
+            model = cls(
+                n_features=int(data["n_features"]),
+                threshold=float(data["threshold"]) if threshold is None else threshold,
+            )
+            model.weights = data["weights"]
+            model.bias = data["bias"]
+            model.classes = [str(label) for label in data["classes"]]
+        return model
+
+
+def _load_incidents(db_path: str) -> List[Dict[str, Any]]:
+    from src.storage.incident_store import IncidentStore
+
+    store = IncidentStore(db_path)
+    try:
+        return store.query()
+    finally:
+        store.close()
+
+
+def _split(anomalies, labels, test_fraction: float, seed: int):
+    order = np.random.default_rng(seed).permutation(len(anomalies))
+    cut = int(len(order) * (1 - test_fraction))
+    train, test = order[:cut], order[cut:]
+    return (
+        [anomalies[i] for i in train],
+        [labels[i] for i in train],
+        [anomalies[i] for i in test],
+        [labels[i] for i in test],
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Train or evaluate the local incident classifier"
+    )
+    parser.add_argument("command", choices=("train", "evaluate"))
+    parser.add_argument("--db", required=True, help="IncidentStore SQLite file")
+    parser.add_argument("--model", required=True, help="Model file (.npz)")
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument(
+        "--test-fraction",
+        type=float,
+        default=0.2,
+        help="Share of incidents held out for evaluation when training",
+    )
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Train or evaluate against the incident history, e.g.:
+        python -m src.routing.local_classifier train --db logs/incidents.db \\
+            --model logs/incident_classifier.npz
+    """
+    args = parse_args(argv)
+    anomalies, labels = training_data(_load_incidents(args.db))
+    if not anomalies:
+        print(f"No labelled incidents found in {args.db}", file=sys.stderr)
+        return 1
+
+    if args.command == "train":
+        train_x, train_y, test_x, test_y = _split(
+            anomalies, labels, args.test_fraction, args.seed
+        )
+        model = LocalClassifier(
+            threshold=args.threshold, epochs=args.epochs, seed=args.seed
+        )
+        model.fit(train_x, train_y)
+        model.save(args.model)
+        print(f"Trained on {len(train_x)} incidents, saved to {args.model}")
+        if test_x:
+            report = model.evaluate(test_x, test_y)
+            print(f"Held-out evaluation: {report}")
+    else:
+        model = LocalClassifier.load(args.model, threshold=args.threshold)
+        print(f"Evaluation: {model.evaluate(anomalies, labels)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
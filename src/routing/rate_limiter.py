@@ -0,0 +1,163 @@
+import email.utils
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Lower rank is served first
+PRIORITY_RANK = {"critical": 0, "high": 0, "medium": 1, "low": 2}
+DEFAULT_PRIORITY = 1
+
+
+def priority_of(anomaly: Dict[str, Any]) -> int:
+    """Queue rank for an incident, from its severity."""
+    return PRIORITY_RANK.get(
+        str(anomaly.get("severity", "")).lower(), DEFAULT_PRIORITY
+    )
+
+
+def estimate_tokens(
+    messages: List[Dict[str, str]], completion_tokens: int = 8
+) -> int:
+    """
+    Rough token count for a chat request: about four characters per token
+    plus a few tokens of framing per message, and the expected answer.
+    """
+    prompt = sum(len(message["content"]) // 4 + 4 for message in messages)
+    return prompt + completion_tokens
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _Bucket:
+    def __init__(self, per_minute: float, now: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(
+            self.capacity, self.level + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        # Requests bigger than the bucket go through once it is full
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for requests/min and tokens/min API quotas.
+
+    Each quota is a token bucket that holds one minute's allowance and
+    refills continuously. Callers wait in a priority queue, so when capacity
+    frees up the most urgent waiter (lowest rank) goes first, FIFO within a
+    rank. defer() pauses everyone after a 429 with Retry-After. Either
+    quota may be None to leave it unlimited.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        now = clock()
+        self._requests = (
+            _Bucket(requests_per_minute, now) if requests_per_minute else None
+        )
+        self._tokens = _Bucket(tokens_per_minute, now) if tokens_per_minute else None
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+        self._waiters: List = []
+        self._seq = itertools.count()
+
+        # Metrics
+        self.acquired = 0
+        self.timeouts = 0
+        self.deferrals = 0
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        wait = self._blocked_until - now
+        for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+            if bucket is not None:
+                bucket.refill(now)
+                wait = max(wait, bucket.wait_time(amount))
+        return wait
+
+    def acquire(
+        self,
+        tokens: int = 0,
+        priority: int = DEFAULT_PRIORITY,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Wait for room for one request of `tokens` tokens. Returns False if
+        it could not be granted within timeout seconds.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        entry = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = self._clock()
+                    wait: Optional[float] = None
+                    if self._waiters[0] == entry:
+                        wait = self._wait_time(tokens, now)
+                        if wait <= 0:
+                            for bucket, amount in (
+                                (self._requests, 1),
+                                (self._tokens, tokens),
+                            ):
+                                if bucket is not None:
+                                    bucket.level -= amount
+                            self.acquired += 1
+                            return True
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self.timeouts += 1
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def defer(self, seconds: float) -> None:
+        """Hold all requests for `seconds` (e.g. from Retry-After)."""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+            self.deferrals += 1
+            self._cond.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            now = self._clock()
+            return {
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "deferrals": self.deferrals,
+                "waiting": len(self._waiters),
+                "blocked_for": max(0.0, self._blocked_until - now),
+            }
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Collapses concurrent requests for the same key into one call.
+
+    The first caller for a key becomes the leader and does the work; any
+    caller that claims the key before the leader resolves it gets the same
+    Future and shares the result. Keys are forgotten once resolved, so this
+    only deduplicates work that is actually in flight (the decision cache
+    covers repeats after that).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    def claim(self, key: Hashable) -> Tuple[Future, bool]:
+        """Return (future, is_leader) for key. Leaders must resolve() it."""
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.collapsed += 1
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            self.executions += 1
+            return future, True
+
+    def resolve(self, key: Hashable, result: Any) -> None:
+        """Publish the leader's result to every caller waiting on key."""
+        with self._lock:
+            future = self._in_flight.pop(key, None)
+        if future is not None:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn once for all concurrent callers with the same key."""
+        future, leader = self.claim(key)
+        if leader:
+            result = None
+            try:
+                result = fn()
+            finally:
+                self.resolve(key, result)
+            return result
+        return future.result()
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._in_flight),
+            }
@@ -0,0 +1,4 @@
+from src.storage.incident_store import IncidentStore
+from src.storage.segmented_log import SegmentedLog
+
+__all__ = ["IncidentStore", "SegmentedLog"]
@@ -0,0 +1,229 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL")
+# Default row cap for an in-memory database, which would otherwise grow
+# for as long as the process runs
+MEMORY_MAX_ROWS = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    id TEXT PRIMARY KEY,
+    logged_at REAL NOT NULL,
+    type TEXT,
+    severity TEXT,
+    assigned_to TEXT,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_logged_at ON incidents (logged_at);
+CREATE INDEX IF NOT EXISTS idx_incidents_type ON incidents (type, logged_at);
+CREATE INDEX IF NOT EXISTS idx_incidents_assigned_to ON incidents (assigned_to, logged_at);
+CREATE INDEX IF NOT EXISTS idx_incidents_status ON incidents (status, logged_at);
+"""
+
+
+class IncidentStore:
+    """
+    Incident history with a bounded in-memory hot window backed by SQLite.
+
+    The newest `hot_window` incidents stay in memory for O(1) lookups by
+    ID; older ones are only on disk. Changes are queued and written in one
+    transaction once `batch_size` are pending or `flush_interval` seconds
+    have passed. `synchronous` is SQLite's fsync level: "OFF" never
+    fsyncs, "NORMAL" fsyncs at WAL checkpoints and "FULL" on every commit.
+    With path None the database lives in memory, nothing survives a
+    restart, and only the newest `max_rows` incidents (MEMORY_MAX_ROWS by
+    default) are kept. `max_rows` caps an on-disk database the same way;
+    by default a file keeps the full history.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        hot_window: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        synchronous: str = "NORMAL",
+        max_rows: Optional[int] = None,
+    ):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {SYNCHRONOUS_MODES}")
+        self.path = path
+        self.hot_window = hot_window
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        if max_rows is None and not path:
+            max_rows = MEMORY_MAX_ROWS
+        self.max_rows = max(max_rows, hot_window) if max_rows else None
+        self._written_since_prune = 0
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(_SCHEMA)
+
+        self._lock = threading.RLock()
+        # id -> incident, oldest first
+        self._hot: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # id -> incident waiting to be written
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._last_flush = time.monotonic()
+
+    def add(self, incident: Dict[str, Any]) -> None:
+        """Store a new incident. It must have an "id"."""
+        incident.setdefault("logged_at", time.time())
+        with self._lock:
+            self._hot[incident["id"]] = incident
+            while len(self._hot) > self.hot_window:
+                self._hot.popitem(last=False)
+            self._queue(incident)
+
+    def update(self, incident: Dict[str, Any]) -> None:
+        """Queue a write for an incident that was changed in place."""
+        with self._lock:
+            self._queue(incident)
+
+    def _queue(self, incident: Dict[str, Any]) -> None:
+        self._pending[incident["id"]] = incident
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def get(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        """Look up an incident by ID, from memory or disk."""
+        with self._lock:
+            incident = self._hot.get(incident_id) or self._pending.get(incident_id)
+            if incident is not None:
+                return incident
+            row = self._conn.execute(
+                "SELECT data FROM incidents WHERE id = ?", (incident_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Incidents in the hot window, oldest first."""
+        with self._lock:
+            return list(self._hot.values())
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        incident_type: Optional[str] = None,
+        assigned_to: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return incidents logged in [start, end) matching the given type,
+        assignee and status, oldest first. Pending writes are flushed first.
+        """
+        clauses = []
+        params: List[Any] = []
+        if start is not None:
+            clauses.append("logged_at >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("logged_at < ?")
+            params.append(end)
+        if incident_type is not None:
+            clauses.append("type = ?")
+            params.append(incident_type.lower())
+        if assigned_to is not None:
+            clauses.append("assigned_to = ?")
+            params.append(assigned_to)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        sql = "SELECT id, data FROM incidents"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY logged_at, rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(sql, params).fetchall()
+            # Hand back the live objects for incidents still in memory
+            return [
+                self._hot.get(incident_id) or json.loads(data)
+                for incident_id, data in rows
+            ]
+
+    def count(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._conn.execute("SELECT COUNT(*) FROM incidents").fetchone()[0]
+
+    def flush(self) -> None:
+        """Write all pending changes in a single transaction."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+            rows = []
+            for incident in self._pending.values():
+                anomaly = incident.get("anomaly", {})
+                rows.append(
+                    (
+                        incident["id"],
+                        incident["logged_at"],
+                        str(anomaly.get("type", "unknown")).lower(),
+                        anomaly.get("severity"),
+                        incident.get("assigned_to"),
+                        incident.get("status"),
+                        json.dumps(incident, default=str),
+                    )
+                )
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO incidents "
+                    "(id, logged_at, type, severity, assigned_to, status, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self._pending.clear()
+            self._written_since_prune += len(rows)
+            # Prune in steps of a tenth of the cap to amortize the scan
+            if (
+                self.max_rows
+                and self._written_since_prune >= max(1, self.max_rows // 10)
+            ):
+                self._prune()
+
+    def _prune(self) -> None:
+        """Delete all but the newest max_rows incidents."""
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM incidents WHERE rowid IN ("
+                "SELECT rowid FROM incidents ORDER BY logged_at DESC, rowid DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
+        self._written_since_prune = 0
+
+    def maybe_flush(self) -> None:
+        """Flush if flush_interval seconds have passed since the last flush."""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return self.count()
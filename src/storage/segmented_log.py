@@ -0,0 +1,220 @@
+import os
+import struct
+import threading
+import zlib
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
+
+# Record header: payload length and CRC32 of the payload
+_HEADER = struct.Struct("<II")
+_SEGMENT_SUFFIX = ".log"
+
+
+class SegmentedLog:
+    """
+    Append-only log of byte records split across numbered segment files.
+
+    Records are buffered in memory and written with group commit: a
+    background thread writes and fsyncs everything appended in the last
+    `commit_interval` seconds at once, and commit() or wait_committed()
+    force it sooner. A segment is sealed once it reaches `segment_bytes`;
+    sealed segments can be read back and deleted. Every open starts a new
+    segment, and reads stop at the first torn or corrupt record, so a crash
+    mid-write loses at most the uncommitted tail.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 16 * 1024 * 1024,
+        commit_interval: float = 0.005,
+        fsync: bool = True,
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()  # guards the append buffer
+        self._write_lock = threading.Lock()  # serializes commits
+        self._committed_cond = threading.Condition()
+        existing = self.segment_ids()
+        self._active_id = existing[-1] + 1 if existing else 0
+        self._active_size = 0
+        # [segment id, bytes] chunks appended but not yet written
+        self._pending: List[list] = [[self._active_id, bytearray()]]
+        self._appended = 0
+        self._committed = 0
+        self._file: Optional[BinaryIO] = None
+        self._file_id: Optional[int] = None
+
+        self._closed = False
+        self._wakeup = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    @property
+    def active_segment(self) -> int:
+        return self._active_id
+
+    def _path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, f"{segment_id:016d}{_SEGMENT_SUFFIX}")
+
+    def segment_ids(self) -> List[int]:
+        """IDs of the segments on disk, oldest first."""
+        return sorted(
+            int(name[: -len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(_SEGMENT_SUFFIX)
+            and name[: -len(_SEGMENT_SUFFIX)].isdigit()
+        )
+
+    def _add(self, payload: bytes) -> int:
+        """Buffer one record. Hold self._lock."""
+        record = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        if self._active_size and self._active_size + len(record) > self.segment_bytes:
+            self._active_id += 1
+            self._active_size = 0
+            self._pending.append([self._active_id, bytearray()])
+        self._pending[-1][1] += record
+        self._active_size += len(record)
+        self._appended += 1
+        return self._active_id
+
+    def roll(self) -> int:
+        """Seal the active segment if it has records; returns the active id."""
+        with self._lock:
+            if self._active_size:
+                self._active_id += 1
+                self._active_size = 0
+                self._pending.append([self._active_id, bytearray()])
+            return self._active_id
+
+    def append(self, payload: bytes) -> Tuple[int, int]:
+        """
+        Buffer a record. Returns (segment id, ticket); the record is durable
+        once wait_committed(ticket) returns.
+        """
+        with self._lock:
+            segment_id = self._add(payload)
+            return segment_id, self._appended
+
+    def append_many(self, payloads: Sequence[bytes]) -> Tuple[List[int], int]:
+        """Buffer several records under one lock; returns (segment ids, ticket)."""
+        with self._lock:
+            segment_ids = [self._add(payload) for payload in payloads]
+            return segment_ids, self._appended
+
+    def _open(self, segment_id: int) -> BinaryIO:
+        if self._file_id == segment_id:
+            return self._file
+        self._close_file()
+        self._file = open(self._path(segment_id), "ab")
+        self._file_id = segment_id
+        if self.fsync:
+            self.sync_directory()
+        return self._file
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            self._file_id = None
+
+    def sync_directory(self) -> None:
+        """Make created, renamed or removed file names in the directory durable."""
+        # Not every platform can fsync a directory
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def commit(self) -> int:
+        """Write and fsync everything appended so far; returns its ticket."""
+        with self._write_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = [[self._active_id, bytearray()]]
+                ticket = self._appended
+            if ticket == self._committed:
+                return ticket
+            for segment_id, data in pending:
+                if data:
+                    self._open(segment_id).write(data)
+            if self._file is not None:
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            with self._committed_cond:
+                self._committed = ticket
+                self._committed_cond.notify_all()
+            return ticket
+
+    def wait_committed(self, ticket: int, timeout: Optional[float] = None) -> bool:
+        """Block until the record with this ticket is on disk."""
+        with self._committed_cond:
+            if self._committed >= ticket:
+                return True
+        self._wakeup.set()
+        with self._committed_cond:
+            return self._committed_cond.wait_for(
+                lambda: self._committed >= ticket, timeout
+            )
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.commit_interval)
+            self._wakeup.clear()
+            try:
+                self.commit()
+            except OSError as e:
+                print(f"SegmentedLog: Error committing to {self.directory}: {e}")
+
+    def read(self, segment_id: int) -> Iterator[bytes]:
+        """Yield the payloads in a segment, stopping at a torn or corrupt record."""
+        try:
+            f = open(self._path(segment_id), "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                length, crc = _HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return
+                yield payload
+
+    def delete(self, segment_id: int) -> None:
+        """Remove a sealed segment."""
+        if segment_id >= self._active_id:
+            raise ValueError(f"segment {segment_id} is still active")
+        with self._write_lock:
+            if self._file_id == segment_id:
+                self._close_file()
+            try:
+                os.remove(self._path(segment_id))
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        """Commit anything buffered and stop the background flusher."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._flusher.join()
+        self.commit()
+        with self._write_lock:
+            self._close_file()
@@ -8,7 +8,51 @@ class SystemConfig:
 
     DEFAULT_CONFIG = {
         "log_file_path": "logs/system.log",
+        "log_checkpoint_path": "logs/system.log.checkpoint",
+        "max_log_bytes_per_cycle": 1048576,
+        "watch_paths": [],  # extra log files/directories to watch
+        "watch_checkpoint_dir": "logs/checkpoints",
         "monitoring_interval": 5,  # seconds
+        "wake_on_message": True,  # deliver between cycles instead of polling
+        "max_batch_size": 100,  # messages drained per batch
+        "max_messages_per_cycle": 1000,  # per agent per run()
+        "login_failure_threshold": 3,  # failures per window before alerting
+        "login_failure_window": 60,  # seconds
+        "rate_detector_max_keys": 100000,
+        "alert_coalesce_window": 0,  # seconds; 0 folds within one cycle
+        "skip_log_levels": [],  # e.g. ["INFO"] to ignore INFO lines
+        "syslog_server": {
+            "enabled": False,
+            "host": "127.0.0.1",
+            "udp_port": 5514,
+            "tcp_port": 5514,
+            "max_admin_queue_depth": 10000,
+        },
+        "message_queue": {
+            "capacity": 10000,  # per agent; 0 for unbounded
+            # When full: "block" the sender (up to block_timeout seconds),
+            # "reject" the message, or "shed" older LOW/MEDIUM messages
+            "overflow_policy": "shed",
+            "block_timeout": 1.0,
+            "agent_capacities": {},  # per-agent overrides
+            # Write-ahead log so queued messages survive a crash
+            "durable": False,
+            "wal_dir": "logs/message_wal",
+            "segment_bytes": 16777216,
+            "commit_interval": 0.005,  # seconds between group commits
+            "sync_on_send": False,  # wait for fsync before send returns
+            "compact_interval": 30.0,  # seconds
+        },
+        "incident_store": {
+            "path": "logs/incidents.db",  # used outside simulation mode
+            "hot_window": 1000,  # incidents kept in memory
+            "batch_size": 100,
+            "flush_interval": 1.0,  # seconds
+            "synchronous": "NORMAL",  # SQLite fsync level: OFF/NORMAL/FULL
+            "max_rows": None,  # cap on stored incidents; None keeps all
+        },
+        # Responders per service; extra members get IDs like "firefighter-2"
+        "responder_pool_sizes": {"firefighter": 1, "police": 1},
         "agent_ids": {
             "security": "security",
             "admin": "admin",
@@ -2,6 +2,7 @@ import time
 import signal
 import sys
 import os
+import threading
 from typing import Dict, List, Optional
 
 from src.agents import (
@@ -11,7 +12,12 @@ from src.agents import (
     PoliceAgent,
     BaseAgent,
 )
+from src.communication.durable_queue import DurableMessageQueue
 from src.communication.message_queue import MessageQueue
+from src.monitoring.alert_coalescer import AlertCoalescer
+from src.monitoring.rate_detector import RateDetector
+from src.monitoring.syslog_server import SyslogServer
+from src.storage.incident_store import IncidentStore
 from src.system.config import SystemConfig
 
 
@@ -23,7 +29,24 @@ class SystemController:
         self.config = SystemConfig(config_file)
 
         # Create message queue
-        self.message_queue = MessageQueue()
+        queue_config = self.config.get("message_queue", {})
+        queue_options = dict(
+            capacity=queue_config.get("capacity", 0),
+            overflow_policy=queue_config.get("overflow_policy", "reject"),
+            block_timeout=queue_config.get("block_timeout", 1.0),
+            agent_capacities=queue_config.get("agent_capacities"),
+        )
+        if queue_config.get("durable"):
+            self.message_queue = DurableMessageQueue(
+                queue_config.get("wal_dir", "logs/message_wal"),
+                segment_bytes=queue_config.get("segment_bytes", 16777216),
+                commit_interval=queue_config.get("commit_interval", 0.005),
+                sync_on_send=queue_config.get("sync_on_send", False),
+                compact_interval=queue_config.get("compact_interval", 30.0),
+                **queue_options,
+            )
+        else:
+            self.message_queue = MessageQueue(**queue_options)
 
         # Initialize agents
         self.agents: Dict[str, BaseAgent] = {}
@@ -31,6 +54,9 @@ class SystemController:
 
         # System state
         self.running = False
+        self.syslog_server: Optional[SyslogServer] = None
+        # Set by the log watcher's notifier thread when a watched log changes
+        self._log_activity = threading.Event()
         self.setup_signal_handlers()
 
         print("System controller initialized")
@@ -46,12 +72,39 @@ class SystemController:
         self.agents[security_id] = SecurityAgent(
             agent_id=security_id, admin_id=admin_id
         )
-        self.agents[admin_id] = AdminAgent(agent_id=admin_id)
-        self.agents[firefighter_id] = FirefighterAgent(agent_id=firefighter_id)
-        self.agents[police_id] = PoliceAgent(agent_id=police_id)
+        self.agents[security_id].rate_detector = RateDetector(
+            threshold=self.config.get("login_failure_threshold", 3),
+            window_seconds=self.config.get("login_failure_window", 60),
+            max_keys=self.config.get("rate_detector_max_keys", 100000),
+        )
+        self.agents[security_id].alert_coalescer = AlertCoalescer(
+            window_seconds=self.config.get("alert_coalesce_window", 0)
+        )
+        self.agents[security_id].skip_levels = set(
+            self.config.get("skip_log_levels", [])
+        )
+        admin_agent = AdminAgent(agent_id=admin_id)
+        admin_agent.firefighter_id = firefighter_id
+        admin_agent.police_id = police_id
+        self.agents[admin_id] = admin_agent
+
+        # Pools of responders; AdminAgent dispatches to the least loaded
+        pool_sizes = self.config.get("responder_pool_sizes", {})
+        for agent_type, service_id, agent_class in (
+            ("firefighter", firefighter_id, FirefighterAgent),
+            ("police", police_id, PoliceAgent),
+        ):
+            for member in range(1, max(1, pool_sizes.get(agent_type, 1)) + 1):
+                agent_id = service_id if member == 1 else f"{service_id}-{member}"
+                self.agents[agent_id] = agent_class(agent_id=agent_id)
+                admin_agent.register_responder(service_id, agent_id)
 
         # Connect agents to message queue
         for agent in self.agents.values():
+            agent.max_batch_size = self.config.get("max_batch_size", 100)
+            agent.max_messages_per_cycle = self.config.get(
+                "max_messages_per_cycle", 1000
+            )
             agent.connect_to_queue(self.message_queue)
 
     def setup_signal_handlers(self) -> None:
@@ -79,13 +132,57 @@ class SystemController:
         if log_file_path:
             os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
 
-        # If in simulation mode, set a sample log file for the security agent
-        if self.config.get("simulation_mode"):
-            security_agent = self.agents.get(
-                self.config.get_agent_id("security")
+        security_agent = self.agents.get(self.config.get_agent_id("security"))
+        if security_agent:
+            security_agent.set_log_file(log_file_path)
+            # Outside simulation mode, tail the real log file incrementally
+            if not self.config.get("simulation_mode") and log_file_path:
+                max_bytes = self.config.get("max_log_bytes_per_cycle", 1048576)
+                watch_paths = self.config.get("watch_paths", [])
+                if watch_paths:
+                    # Multi-source mode: the main log is one of many watched
+                    watcher = security_agent.watch_paths(
+                        [log_file_path] + list(watch_paths),
+                        checkpoint_dir=self.config.get("watch_checkpoint_dir"),
+                        max_bytes_per_cycle=max_bytes,
+                    )
+                    if self.config.get("wake_on_message", True):
+                        # Let log writes end wait_and_dispatch() early too
+                        watcher.start_notifier(self._on_log_write)
+                else:
+                    security_agent.enable_log_tailing(
+                        checkpoint_path=self.config.get("log_checkpoint_path"),
+                        max_bytes_per_cycle=max_bytes,
+                    )
+
+        # Keep incident history on disk outside simulation mode; the default
+        # in-memory store keeps only the newest incidents
+        admin_agent = self.agents.get(self.config.get_agent_id("admin"))
+        store_config = self.config.get("incident_store", {})
+        if admin_agent and not self.config.get("simulation_mode"):
+            admin_agent.incident_store.close()
+            admin_agent.incident_store = IncidentStore(
+                path=store_config.get("path"),
+                hot_window=store_config.get("hot_window", 1000),
+                batch_size=store_config.get("batch_size", 100),
+                flush_interval=store_config.get("flush_interval", 1.0),
+                synchronous=store_config.get("synchronous", "NORMAL"),
+                max_rows=store_config.get("max_rows"),
             )
-            if security_agent:
-                security_agent.set_log_file(log_file_path)
+
+        # Accept RFC5424 syslog over the network if configured
+        syslog_config = self.config.get("syslog_server", {})
+        if security_agent and syslog_config.get("enabled"):
+            self.syslog_server = SyslogServer(
+                security_agent,
+                host=syslog_config.get("host", "127.0.0.1"),
+                udp_port=syslog_config.get("udp_port", 5514),
+                tcp_port=syslog_config.get("tcp_port", 5514),
+                max_admin_queue_depth=syslog_config.get(
+                    "max_admin_queue_depth", 10000
+                ),
+            )
+            self.syslog_server.start()
 
     def stop(self) -> None:
         """Stop the multi-agent system"""
@@ -96,6 +193,19 @@ class SystemController:
         print("Stopping multi-agent system...")
         self.running = False
 
+        if self.syslog_server is not None:
+            self.syslog_server.stop()
+            self.syslog_server = None
+
+        security_agent = self.agents.get(self.config.get_agent_id("security"))
+        if security_agent and security_agent.log_watcher is not None:
+            security_agent.log_watcher.stop_notifier()
+
+        admin_agent = self.agents.get(self.config.get_agent_id("admin"))
+        if admin_agent:
+            admin_agent.incident_store.flush()
+        self.message_queue.close()
+
     def run_once(self) -> None:
         """Run a single cycle of the system (for demonstration purposes)"""
         if not self.running:
@@ -111,6 +221,47 @@ class SystemController:
 
         print("\n--- System cycle completed ---")
 
+    def process_pending(self) -> int:
+        """Run process_messages() on each agent with mail; returns how many"""
+        pending = self.message_queue.pending_agents()
+        for agent_id in pending:
+            agent = self.agents.get(agent_id)
+            if agent is not None:
+                agent.process_messages()
+        return len(pending)
+
+    def _on_log_write(self) -> None:
+        """Log watcher callback (on its thread): wake wait_and_dispatch()"""
+        self._log_activity.set()
+        self.message_queue.wake()
+
+    def wait_and_dispatch(self, interval: float) -> None:
+        """
+        Wait out the interval until the next monitoring cycle, but hand each
+        message to its agent as soon as it lands instead of at the next cycle.
+        Writes to watched log files run security monitoring straight away.
+        """
+        deadline = time.monotonic() + interval
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self.message_queue.wait_for_any(remaining):
+                if self._log_activity.is_set():
+                    self._log_activity.clear()
+                    security_agent = self.agents.get(
+                        self.config.get_agent_id("security")
+                    )
+                    if security_agent:
+                        security_agent.run()
+                # Agents drain in bounded batches, so take turns until idle
+                while (
+                    self.running
+                    and time.monotonic() < deadline
+                    and self.process_pending()
+                ):
+                    pass
+
     def run_continuous(
         self, cycles: int = -1, interval: Optional[float] = None
     ) -> None:
@@ -133,7 +284,10 @@ class SystemController:
 
                 if cycles == -1 or cycle_count < cycles:
                     print(f"\nWaiting {interval} seconds until next cycle...")
-                    time.sleep(interval)
+                    if self.config.get("wake_on_message", True):
+                        self.wait_and_dispatch(interval)
+                    else:
+                        time.sleep(interval)
 
         except KeyboardInterrupt:
             print("\nSystem execution interrupted by user")
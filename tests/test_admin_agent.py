@@ -62,7 +62,7 @@ class TestAdminAgent:
         response_agent = self.admin_agent.determine_response_agent(anomaly)
         assert response_agent == "police"  # Default should be police
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_determine_response_agent_with_ai_fire(self, mock_post):
         """Test that admin correctly uses AI to route fire incidents"""
         # Mock the OpenAI API response
@@ -89,7 +89,7 @@ class TestAdminAgent:
         assert response_agent == "firefighter"
         mock_post.assert_called_once()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_determine_response_agent_with_ai_security(self, mock_post):
         """Test that admin correctly uses AI to route security incidents"""
         # Mock the OpenAI API response
@@ -116,7 +116,7 @@ class TestAdminAgent:
         assert response_agent == "police"
         mock_post.assert_called_once()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_determine_response_agent_with_ai_fallback(self, mock_post):
         """Test that admin falls back to rule-based when AI fails"""
         # Mock the OpenAI API to raise an exception
@@ -226,3 +226,144 @@ class TestAdminAgent:
             "Fire was extinguished"
             in self.admin_agent.incident_log[0]["resolution"]
         )
+
+    def test_correlation_id_resolves_duplicate_incidents(self):
+        """Test that responses resolve the incident they refer to by ID"""
+        anomaly = {
+            "type": "fire",
+            "description": "Fire detected in server room",
+            "severity": "high",
+            "timestamp": time.time(),
+        }
+        first = self.admin_agent.log_incident(anomaly, "firefighter")
+        second = self.admin_agent.log_incident(dict(anomaly), "firefighter")
+        assert first["id"] != second["id"]
+
+        response_message = Message(
+            sender="firefighter",
+            receiver="admin_test",
+            message_type=MessageType.RESPONSE,
+            content={
+                "message": "Fire issue has been handled successfully.",
+                "resolution": "Fire was extinguished.",
+                "correlation_id": second["id"],
+                "original_request": {"original_alert": {"anomaly": anomaly}},
+            },
+        )
+        self.admin_agent.process_message(response_message)
+
+        assert self.admin_agent.get_incident(second["id"])["status"] == "resolved"
+        assert self.admin_agent.get_incident(first["id"])["status"] == "dispatched"
+        assert self.admin_agent.open_incidents() == [first]
+        assert self.admin_agent.get_incidents_by_status("resolved") == [second]
+
+    def test_correlation_id_round_trip(self):
+        """Test that the correlation ID travels through REQUEST and RESPONSE"""
+        from src.agents.firefighter_agent import FirefighterAgent
+
+        firefighter = FirefighterAgent()
+        firefighter.connect_to_queue(self.message_queue)
+        anomaly = {
+            "type": "fire",
+            "description": "Fire detected in server room",
+            "severity": "high",
+            "timestamp": time.time(),
+        }
+        alert_message = Message(
+            sender="security_test",
+            receiver="admin_test",
+            message_type=MessageType.ALERT,
+            content={"anomaly": anomaly, "message": "Alert! Fire detected"},
+            priority=MessagePriority.HIGH,
+        )
+        with patch.object(
+            AdminAgent,
+            "determine_response_agent_with_ai",
+            return_value="firefighter",
+        ):
+            self.admin_agent.process_message(alert_message)
+
+        incident = self.admin_agent.incident_log[0]
+        request = self.message_queue.get_messages("firefighter")[0]
+        assert request.content["correlation_id"] == incident["id"]
+
+        firefighter.process_message(request)
+        response = self.message_queue.get_messages("admin_test")[0]
+        assert response.content["correlation_id"] == incident["id"]
+
+        self.admin_agent.process_message(response)
+        assert incident["status"] == "resolved"
+        assert self.admin_agent.open_incidents() == []
+
+    def _fire_alert(self, index):
+        anomaly = {
+            "type": "fire",
+            "description": f"Fire detected in room {index}",
+            "severity": "high",
+            "timestamp": time.time(),
+        }
+        return Message(
+            sender="security_test",
+            receiver="admin_test",
+            message_type=MessageType.ALERT,
+            content={"anomaly": anomaly, "message": f"Alert! Fire in room {index}"},
+            priority=MessagePriority.HIGH,
+        )
+
+    def test_pool_spreads_incidents_evenly(self):
+        """Test that a pool of responders shares incidents evenly"""
+        self.admin_agent.message_queue = MagicMock()
+        self.admin_agent.message_queue.queue_depth.return_value = 0
+        for agent_id in ("firefighter", "firefighter-2", "firefighter-3"):
+            self.admin_agent.register_responder("firefighter", agent_id)
+
+        for index in range(9):
+            self.admin_agent.process_message(self._fire_alert(index))
+
+        incidents = self.admin_agent.incident_log
+        assigned = [incident["assigned_to"] for incident in incidents]
+        assert sorted(assigned) == sorted(
+            ["firefighter", "firefighter-2", "firefighter-3"] * 3
+        )
+        assert all(incident["service"] == "firefighter" for incident in incidents)
+        assert self.admin_agent.in_flight == {
+            "firefighter": 3,
+            "firefighter-2": 3,
+            "firefighter-3": 3,
+        }
+
+    def test_pool_prefers_shortest_queue(self):
+        """Test that dispatch avoids responders with a message backlog"""
+        depths = {"firefighter": 5, "firefighter-2": 0}
+        self.admin_agent.message_queue = MagicMock()
+        self.admin_agent.message_queue.queue_depth.side_effect = depths.get
+        self.admin_agent.register_responder("firefighter", "firefighter")
+        self.admin_agent.register_responder("firefighter", "firefighter-2")
+
+        self.admin_agent.process_message(self._fire_alert(0))
+        assert self.admin_agent.incident_log[0]["assigned_to"] == "firefighter-2"
+        assert self.admin_agent.responder_loads() == {
+            "firefighter": {"firefighter": 5, "firefighter-2": 1}
+        }
+
+    def test_response_releases_in_flight(self):
+        """Test that resolving an incident frees its responder"""
+        self.admin_agent.register_responder("firefighter", "firefighter")
+        self.admin_agent.register_responder("firefighter", "firefighter-2")
+        self.admin_agent.process_message(self._fire_alert(0))
+        incident = self.admin_agent.incident_log[0]
+        assigned_to = incident["assigned_to"]
+        assert self.admin_agent.in_flight[assigned_to] == 1
+
+        self.admin_agent.process_message(
+            Message(
+                sender=assigned_to,
+                receiver="admin_test",
+                message_type=MessageType.RESPONSE,
+                content={
+                    "message": "Fire issue has been handled successfully.",
+                    "correlation_id": incident["id"],
+                },
+            )
+        )
+        assert self.admin_agent.in_flight[assigned_to] == 0
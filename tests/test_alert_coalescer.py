@@ -0,0 +1,135 @@
+import pytest
+
+from src.agents import SecurityAgent
+from src.communication.message_queue import MessageQueue
+from src.monitoring.alert_coalescer import AlertCoalescer, normalize_description
+
+
+def make_anomaly(description, timestamp, anomaly_type="fire"):
+    return {
+        "type": anomaly_type,
+        "description": description,
+        "severity": "high",
+        "timestamp": timestamp,
+    }
+
+
+class TestAlertCoalescer:
+    def test_normalize_description(self):
+        """Test that timestamps, repeat counters and case are ignored"""
+        assert normalize_description(
+            "Fire: [2024-01-20 10:30:00] Smoke in room 12 (x3)"
+        ) == normalize_description("fire: [2024-01-21 11:00:59] smoke in ROOM 12")
+        assert normalize_description("smoke in room 12") != normalize_description(
+            "smoke in room 7"
+        )
+
+    def test_distinct_incidents_stay_separate(self):
+        """Test that different sectors and attacker IPs are never merged"""
+        coalescer = AlertCoalescer(window_seconds=0)
+        alerts = coalescer.coalesce(
+            [
+                make_anomaly("[2024-01-20 10:30:00] smoke in sector 1", 1),
+                make_anomaly("[2024-01-20 10:30:01] smoke in sector 7", 2),
+                make_anomaly("Failed login from ip 10.0.0.1", 3, "security"),
+                make_anomaly("Failed login from ip 10.0.0.2", 4, "security"),
+                make_anomaly("Failed login from ip 10.0.0.2", 5, "security"),
+            ],
+            now=10.0,
+        )
+        assert [(a["description"], a["count"]) for a in alerts] == [
+            ("[2024-01-20 10:30:00] smoke in sector 1", 1),
+            ("[2024-01-20 10:30:01] smoke in sector 7", 1),
+            ("Failed login from ip 10.0.0.1", 1),
+            ("Failed login from ip 10.0.0.2", 2),
+        ]
+
+    def test_sources_stay_separate(self):
+        """Test that identical lines from different sources are not merged"""
+        coalescer = AlertCoalescer(window_seconds=0)
+        first = make_anomaly("smoke", 1)
+        second = dict(make_anomaly("smoke", 2), source_path="/var/log/b.log")
+        assert len(coalescer.coalesce([first, second], now=10.0)) == 2
+
+    def test_burst_folds_into_one_alert(self):
+        """Test that identical anomalies in one batch become one alert"""
+        coalescer = AlertCoalescer(window_seconds=0)
+        anomalies = [
+            make_anomaly(f"Fire-related issue detected: [{i}] smoke", i)
+            for i in range(10000)
+        ]
+        alerts = coalescer.coalesce(anomalies, now=100.0)
+        assert len(alerts) == 1
+        assert alerts[0]["count"] == 10000
+        assert alerts[0]["first_timestamp"] == 0
+        assert alerts[0]["last_timestamp"] == 9999
+        assert coalescer.suppressed == 9999
+
+    def test_different_types_stay_separate(self):
+        """Test that anomalies of different types are not merged"""
+        coalescer = AlertCoalescer(window_seconds=0)
+        alerts = coalescer.coalesce(
+            [
+                make_anomaly("issue", 1, "fire"),
+                make_anomaly("issue", 2, "security"),
+            ],
+            now=10.0,
+        )
+        assert [a["type"] for a in alerts] == ["fire", "security"]
+
+    def test_window_holds_group_until_closed(self):
+        """Test that a group is released only after its window elapses"""
+        coalescer = AlertCoalescer(window_seconds=30)
+        assert coalescer.coalesce([make_anomaly("smoke", 1)], now=0.0) == []
+        assert coalescer.coalesce([make_anomaly("smoke", 2)], now=10.0) == []
+        alerts = coalescer.flush(now=30.0)
+        assert len(alerts) == 1
+        assert alerts[0]["count"] == 2
+        assert coalescer.pending() == 0
+        assert coalescer.oldest_pending() is None
+
+    def test_oldest_pending(self):
+        """Test that oldest_pending reports when the oldest open group opened"""
+        coalescer = AlertCoalescer(window_seconds=30)
+        coalescer.coalesce([make_anomaly("smoke", 1)], now=5.0)
+        coalescer.coalesce([make_anomaly("intrusion", 1)], now=8.0)
+        assert coalescer.oldest_pending() == 5.0
+
+    def test_force_flush(self):
+        """Test that a forced flush releases open groups"""
+        coalescer = AlertCoalescer(window_seconds=30)
+        coalescer.add(make_anomaly("smoke", 1), now=0.0)
+        assert len(coalescer.flush(now=1.0, force=True)) == 1
+
+    def test_max_groups_releases_oldest(self):
+        """Test that exceeding max_groups releases the oldest group early"""
+        coalescer = AlertCoalescer(window_seconds=30, max_groups=1)
+        coalescer.add(make_anomaly("smoke", 1, "fire"), now=0.0)
+        coalescer.add(make_anomaly("breach", 2, "security"), now=1.0)
+        alerts = coalescer.flush(now=2.0)
+        assert [a["type"] for a in alerts] == ["fire"]
+        assert coalescer.pending() == 1
+
+
+class TestSecurityAgentCoalescing:
+    def test_run_sends_one_alert_per_burst(self):
+        """Test that a burst of matching lines yields one ALERT message"""
+        agent = SecurityAgent(admin_id="admin")
+        message_queue = MessageQueue()
+        agent.connect_to_queue(message_queue)
+        message_queue.register_agent("admin")
+
+        burst = [
+            make_anomaly(
+                f"Fire-related issue detected: [2024-01-20 10:30:{i % 60:02d}] smoke",
+                i,
+            )
+            for i in range(500)
+        ]
+        agent.simulate_log_monitoring = lambda: burst
+        agent.run()
+
+        messages = message_queue.get_messages("admin")
+        assert len(messages) == 1
+        assert messages[0].content["anomaly"]["count"] == 500
+        assert "(x500)" in messages[0].content["message"]
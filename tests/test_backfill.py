@@ -0,0 +1,89 @@
+import mmap
+import os
+import tempfile
+
+import pytest
+
+from src.agents import SecurityAgent
+from src.monitoring.anomaly_detector import AnomalyDetector
+from src.monitoring.backfill import chunk_boundaries, iter_log_file, scan_log_file
+
+
+class TestBackfill:
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "history.log")
+        self.detector = AnomalyDetector(
+            {"fire": ["smoke"], "security": ["unauthorized"]}
+        )
+        with open(self.log_path, "w") as f:
+            for i in range(2000):
+                if i % 100 == 0:
+                    f.write(f"[{i}] ALERT: Smoke detected\n")
+                elif i % 150 == 0:
+                    f.write(f"[{i}] ERROR: Unauthorized access attempt\n")
+                else:
+                    f.write(f"[{i}] INFO: Normal system operation\n")
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def test_chunk_boundaries_are_newline_aligned(self):
+        """Test that chunks cover the file and end on line boundaries"""
+        with open(self.log_path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            boundaries = chunk_boundaries(mm, chunk_size=1000)
+            assert boundaries[0][0] == 0
+            assert boundaries[-1][1] == len(mm)
+            for (_, end), (next_start, _) in zip(boundaries, boundaries[1:]):
+                assert end == next_start
+                assert mm[end - 1 : end] == b"\n"
+            mm.close()
+
+    def test_parallel_scan_matches_sequential(self):
+        """Test that a pooled scan returns the same anomalies in file order"""
+        sequential = self.detector.detect(open(self.log_path).read())
+        parallel = scan_log_file(
+            self.log_path, self.detector, workers=2, chunk_size=4096
+        )
+        assert [a["description"] for a in parallel] == [
+            a["description"] for a in sequential
+        ]
+
+    def test_single_worker_scan(self):
+        """Test that workers=1 scans in-process"""
+        anomalies = scan_log_file(
+            self.log_path, self.detector, workers=1, chunk_size=4096
+        )
+        assert len(anomalies) == 27
+
+    def test_interleaved_in_process_scans(self):
+        """Test that two in-process backfills do not share state"""
+        other_path = os.path.join(self.temp_dir.name, "other.log")
+        with open(other_path, "w") as f:
+            for i in range(30):
+                f.write(f"[{i}] ERROR: Unauthorized access attempt\n")
+
+        pairs = list(
+            zip(
+                iter_log_file(self.log_path, self.detector, workers=1),
+                iter_log_file(other_path, self.detector, workers=1),
+            )
+        )
+        assert len(pairs) == 27
+        assert [a["type"] for a, _ in pairs] == [
+            a["type"] for a in scan_log_file(self.log_path, self.detector, workers=1)
+        ]
+        assert {b["type"] for _, b in pairs} == {"security"}
+
+    def test_empty_file(self):
+        """Test that an empty file yields no anomalies"""
+        empty_path = os.path.join(self.temp_dir.name, "empty.log")
+        open(empty_path, "w").close()
+        assert scan_log_file(empty_path, self.detector) == []
+
+    def test_security_agent_backfill(self):
+        """Test the SecurityAgent backfill entry point"""
+        agent = SecurityAgent()
+        anomalies = agent.backfill_log_file(self.log_path, workers=1)
+        assert {a["type"] for a in anomalies} == {"fire", "security"}
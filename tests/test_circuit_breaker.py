@@ -0,0 +1,157 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from src.agents.admin_agent import AdminAgent
+from src.routing.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    deadline_for,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    def setup_method(self):
+        self.clock = _FakeClock()
+        self.breaker = CircuitBreaker(
+            failure_threshold=3,
+            latency_threshold=1.0,
+            reset_timeout=10.0,
+            clock=self.clock,
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the breaker opens once the failure threshold is hit"""
+        for _ in range(2):
+            assert self.breaker.allow_request()
+            self.breaker.record_failure()
+        assert self.breaker.state == CLOSED
+        self.breaker.record_failure()
+        assert self.breaker.state == OPEN
+        assert not self.breaker.allow_request()
+        assert self.breaker.metrics()["rejected"] == 1
+
+    def test_success_resets_failure_count(self):
+        """Test that only consecutive failures open the breaker"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure()
+        assert self.breaker.state == CLOSED
+
+    def test_slow_calls_count_as_failures(self):
+        """Test that latency spikes open the breaker"""
+        for _ in range(3):
+            self.breaker.record_success(2.0)
+        assert self.breaker.state == OPEN
+        assert self.breaker.metrics()["slow_calls"] == 3
+
+    def test_half_open_probe(self):
+        """Test that one probe is allowed after the reset timeout"""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10.0
+        assert self.breaker.state == HALF_OPEN
+        assert self.breaker.allow_request()
+        # Only a single probe at a time
+        assert not self.breaker.allow_request()
+        self.breaker.record_success(0.1)
+        assert self.breaker.state == CLOSED
+        assert self.breaker.allow_request()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe re-opens the breaker for another timeout"""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10.0
+        assert self.breaker.allow_request()
+        self.breaker.record_failure()
+        assert self.breaker.state == OPEN
+        self.clock.now = 15.0
+        assert not self.breaker.allow_request()
+        assert self.breaker.metrics()["times_opened"] == 2
+
+    def test_late_success_does_not_close(self):
+        """Test that a call started before the breaker opened cannot close it"""
+        started = threading.Event()
+        opened = threading.Event()
+
+        def slow_call():
+            assert self.breaker.allow_request()
+            started.set()
+            opened.wait(5)
+            self.breaker.record_success(0.1)
+
+        call = threading.Thread(target=slow_call)
+        call.start()
+        started.wait(5)
+        for _ in range(3):
+            self.breaker.record_failure()
+        opened.set()
+        call.join()
+
+        assert self.breaker.state == OPEN
+        assert not self.breaker.allow_request()
+        self.clock.now = 10.0
+        assert self.breaker.allow_request()
+        self.breaker.record_success(0.1)
+        assert self.breaker.state == CLOSED
+
+    def test_deadline_for_severity(self):
+        """Test per-severity deadlines with a default for unknown levels"""
+        assert deadline_for("HIGH") < deadline_for("medium") < deadline_for("low")
+        assert deadline_for("unknown", default=7.0) == 7.0
+        assert deadline_for("high", {"high": 0.5}) == 0.5
+
+
+class TestAdminAgentCircuitBreaker:
+    def setup_method(self):
+        self.admin_agent = AdminAgent()
+        self.admin_agent.openai_api_key = "test_key"
+        self.admin_agent.decision_cache.persist_path = None
+        self.admin_agent.decision_cache.clear()
+        self.anomaly = {
+            "type": "fire",
+            "description": "Fire detected in server room",
+            "severity": "high",
+            "timestamp": time.time(),
+        }
+
+    @patch("requests.Session.post")
+    def test_outage_skips_the_api(self, mock_post):
+        """Test that an open breaker routes by rules without calling the API"""
+        mock_post.side_effect = Exception("Connection refused")
+        for _ in range(5):
+            assert (
+                self.admin_agent.determine_response_agent_with_ai(self.anomaly)
+                == "firefighter"
+            )
+        assert mock_post.call_count == 3
+        metrics = self.admin_agent.routing_metrics()["circuit_breaker"]
+        assert metrics["state"] == OPEN
+        assert metrics["rejected"] == 2
+
+    @patch("requests.Session.post")
+    def test_deadline_follows_severity(self, mock_post):
+        """Test that the request timeout comes from the incident severity"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": "firefighter"}}]
+        }
+        mock_post.return_value = mock_response
+        self.admin_agent.ai_config = {"severity_deadlines": {"high": 1.5}}
+
+        self.admin_agent.determine_response_agent_with_ai(self.anomaly)
+        # What is left of the 1.5s deadline when the request goes out
+        assert 1.4 < mock_post.call_args.kwargs["timeout"] <= 1.5
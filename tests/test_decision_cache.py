@@ -0,0 +1,106 @@
+import os
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agents import AdminAgent
+from src.routing.decision_cache import DecisionCache, incident_key
+
+
+class TestDecisionCache:
+    def test_incident_key_ignores_timestamps(self):
+        """Test that incidents differing only by timestamp share a key"""
+        first = {
+            "type": "Fire",
+            "description": "Fire-related issue detected: [2024-01-20 10:30:00] smoke in building sector A",
+            "severity": "high",
+            "timestamp": 1,
+        }
+        second = dict(
+            first,
+            description="Fire-related issue detected: [2024-01-21 08:00:59] Smoke in building sector A",
+            timestamp=2,
+        )
+        assert incident_key(first) == incident_key(second)
+        assert incident_key(first) != incident_key(dict(first, severity="low"))
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted"""
+        cache = DecisionCache()
+        key = ("fire", "smoke", "high")
+        assert cache.get(key) is None
+        cache.put(key, "firefighter")
+        assert cache.get(key) == "firefighter"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = DecisionCache(max_size=2)
+        cache.put(("a",), "police")
+        cache.put(("b",), "police")
+        cache.get(("a",))
+        cache.put(("c",), "firefighter")
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == "police"
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are misses"""
+        cache = DecisionCache(ttl=0.01)
+        cache.put(("a",), "police")
+        time.sleep(0.02)
+        assert cache.get(("a",)) is None
+
+    def test_persistence(self):
+        """Test that saved entries are reloaded on restart"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.json")
+            cache = DecisionCache(persist_path=path)
+            cache.put(("fire", "smoke", "high"), "firefighter")
+            cache.save()
+
+            restored = DecisionCache(persist_path=path)
+            assert restored.get(("fire", "smoke", "high")) == "firefighter"
+
+
+class TestAdminAgentDecisionCache:
+    @patch("requests.Session.post")
+    def test_cache_hit_skips_network(self, mock_post):
+        """Test that a repeated incident does not call the LLM again"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": "firefighter"}}]
+        }
+        mock_post.return_value = mock_response
+
+        admin_agent = AdminAgent(agent_id="admin_test")
+        admin_agent.openai_api_key = "test_key"
+        anomaly = {
+            "type": "fire",
+            "description": "Fire-related issue detected: smoke in building sector A",
+            "severity": "high",
+            "timestamp": time.time(),
+        }
+
+        assert admin_agent.determine_response_agent_with_ai(anomaly) == "firefighter"
+        repeat = dict(anomaly, timestamp=time.time() + 5)
+        assert admin_agent.determine_response_agent_with_ai(repeat) == "firefighter"
+        mock_post.assert_called_once()
+        assert admin_agent.decision_cache.stats()["hits"] == 1
+
+    @patch("requests.Session.post")
+    def test_failed_call_is_not_cached(self, mock_post):
+        """Test that rule-based fallbacks are not cached"""
+        mock_post.side_effect = Exception("API error")
+        admin_agent = AdminAgent(agent_id="admin_test")
+        admin_agent.openai_api_key = "test_key"
+        anomaly = {"type": "fire", "description": "smoke", "severity": "high"}
+
+        admin_agent.determine_response_agent_with_ai(anomaly)
+        admin_agent.determine_response_agent_with_ai(anomaly)
+        assert mock_post.call_count == 2
+        assert len(admin_agent.decision_cache) == 0
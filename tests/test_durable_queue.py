@@ -0,0 +1,194 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.agents import FirefighterAgent
+from src.agents.base_agent import Message, MessagePriority, MessageType
+from src.communication.durable_queue import DurableMessageQueue
+
+
+def _message(text, priority=MessagePriority.HIGH, receiver="admin"):
+    return Message(
+        sender="security",
+        receiver=receiver,
+        message_type=MessageType.ALERT,
+        content={"message": text},
+        priority=priority,
+    )
+
+
+def _texts(messages):
+    return [message.content["message"] for message in messages]
+
+
+class TestDurableMessageQueue:
+    def setup_method(self):
+        self.queues = []
+
+    def teardown_method(self):
+        for queue in self.queues:
+            queue.log.close()
+
+    def _open(self, directory, **kwargs):
+        kwargs.setdefault("commit_interval", 60)
+        queue = DurableMessageQueue(str(directory), **kwargs)
+        self.queues.append(queue)
+        return queue
+
+    def _crash(self, queue):
+        """Commit what a crash would have left on disk, without closing."""
+        queue.log.commit()
+
+    def test_unacked_messages_are_replayed(self, tmp_path):
+        """Test that only unacknowledged messages come back after a crash"""
+        queue = self._open(tmp_path)
+        queue.register_agent("admin")
+        queue.send_many(
+            [
+                _message("low", MessagePriority.LOW),
+                _message("high 1"),
+                _message("high 2"),
+                _message("medium", MessagePriority.MEDIUM),
+            ]
+        )
+        processed = queue.get_messages("admin", 2)
+        assert _texts(processed) == ["high 1", "high 2"]
+        queue.ack("admin", processed)
+        # Received but not acknowledged before the crash
+        queue.get_messages("admin", 1)
+        self._crash(queue)
+
+        with patch("builtins.print"):
+            restarted = self._open(tmp_path)
+        restarted.register_agent("admin")
+        replayed = restarted.get_messages("admin")
+        assert _texts(replayed) == ["medium", "low"]
+        assert replayed[0].priority == MessagePriority.MEDIUM
+        assert replayed[0].message_type == MessageType.ALERT
+        assert restarted.wal_metrics()["replayed"] == 2
+
+    def test_replay_waits_for_registration(self, tmp_path):
+        """Test that replayed messages are queued once their agent registers"""
+        queue = self._open(tmp_path)
+        queue.register_agent("police")
+        queue.send_message(_message("for police", receiver="police"))
+        self._crash(queue)
+
+        with patch("builtins.print"):
+            restarted = self._open(tmp_path)
+        assert restarted.queue_depth("police") == 0
+        restarted.register_agent("police")
+        assert _texts(restarted.get_messages("police")) == ["for police"]
+
+    def test_sync_on_send_is_durable(self, tmp_path):
+        """Test that sync_on_send returns only after the fsync"""
+        queue = self._open(tmp_path, sync_on_send=True)
+        queue.register_agent("admin")
+        assert queue.send_message(_message("synced")) is True
+
+        # No explicit commit: the send itself must have reached disk
+        with patch("builtins.print"):
+            restarted = self._open(tmp_path)
+        restarted.register_agent("admin")
+        assert _texts(restarted.get_messages("admin")) == ["synced"]
+
+    def test_dropped_messages_are_not_replayed(self, tmp_path):
+        """Test that messages refused or shed by a full queue stay dropped"""
+        queue = self._open(tmp_path, capacity=2, overflow_policy="shed")
+        queue.register_agent("admin")
+        queue.send_message(_message("low", MessagePriority.LOW))
+        queue.send_message(_message("high 1"))
+        queue.send_message(_message("high 2"))
+        assert queue.send_message(_message("high 3")) is False
+        self._crash(queue)
+
+        with patch("builtins.print"):
+            restarted = self._open(tmp_path)
+        restarted.register_agent("admin")
+        assert _texts(restarted.get_messages("admin")) == ["high 1", "high 2"]
+
+    def test_compaction_deletes_acked_segments(self, tmp_path):
+        """Test that fully acknowledged segments are deleted on compaction"""
+        queue = self._open(tmp_path, segment_bytes=1024)
+        queue.register_agent("admin")
+        queue.send_many(_message(f"alert {i}") for i in range(100))
+        queue.ack("admin", queue.get_messages("admin", 90))
+        queue.log.commit()
+        before = len(queue.log.segment_ids())
+
+        queue.compact()
+        metrics = queue.wal_metrics()
+        assert metrics["segments_deleted"] > 0
+        assert metrics["segments"] < before
+        assert metrics["unacked"] == 10
+        self._crash(queue)
+
+        with patch("builtins.print"):
+            restarted = self._open(tmp_path)
+        restarted.register_agent("admin")
+        assert _texts(restarted.get_messages("admin")) == [
+            f"alert {i}" for i in range(90, 100)
+        ]
+
+    def test_compaction_rewrites_sparse_segments(self, tmp_path):
+        """Test that live messages are copied out of mostly-acked segments"""
+        queue = self._open(tmp_path, compact_ratio=0.5)
+        queue.register_agent("admin")
+        queue.send_many(_message(f"alert {i}") for i in range(10))
+        messages = queue.get_messages("admin")
+        queue.ack("admin", messages[1:])
+        queue.log.commit()
+
+        queue.compact()
+        assert queue.wal_metrics()["rewritten"] == 1
+        assert 0 not in queue.log.segment_ids()
+        self._crash(queue)
+
+        with patch("builtins.print"):
+            restarted = self._open(tmp_path)
+        restarted.register_agent("admin")
+        assert _texts(restarted.get_messages("admin")) == ["alert 0"]
+
+    def test_agents_acknowledge_processed_messages(self, tmp_path):
+        """Test that BaseAgent acks each batch once it has processed it"""
+        queue = self._open(tmp_path)
+        firefighter = FirefighterAgent(agent_id="firefighter")
+        firefighter.connect_to_queue(queue)
+        queue.register_agent("admin")
+        queue.send_message(
+            Message(
+                sender="admin",
+                receiver="firefighter",
+                message_type=MessageType.REQUEST,
+                content={"message": "Fire in server room", "severity": "high"},
+                priority=MessagePriority.HIGH,
+            )
+        )
+
+        with patch("builtins.print"):
+            firefighter.process_messages()
+        # Only the firefighter's response to admin is still outstanding
+        assert queue.wal_metrics()["unacked"] == 1
+        self._crash(queue)
+
+        with patch("builtins.print"):
+            restarted = self._open(tmp_path)
+        restarted.register_agent("firefighter")
+        restarted.register_agent("admin")
+        assert restarted.queue_depth("firefighter") == 0
+        assert restarted.get_messages("admin")[0].sender == "firefighter"
+
+    def test_close_checkpoints(self, tmp_path):
+        """Test that a clean shutdown leaves only what is unacknowledged"""
+        queue = self._open(tmp_path)
+        queue.register_agent("admin")
+        queue.send_many(_message(f"alert {i}") for i in range(5))
+        queue.ack("admin", queue.get_messages("admin", 5))
+        queue.send_message(_message("pending"))
+        queue.close()
+
+        restarted = DurableMessageQueue(str(tmp_path))
+        self.queues.append(restarted)
+        restarted.register_agent("admin")
+        assert _texts(restarted.get_messages("admin")) == ["pending"]
+        assert restarted.wal_metrics()["segments"] == 1
@@ -0,0 +1,159 @@
+import sqlite3
+
+import pytest
+
+from src.agents.admin_agent import AdminAgent
+from src.agents.base_agent import Message, MessageType
+from src.storage.incident_store import MEMORY_MAX_ROWS, IncidentStore
+
+
+def _incident(index, anomaly_type="fire", assigned_to="firefighter", logged_at=None):
+    return {
+        "id": f"incident-{index}",
+        "anomaly": {
+            "type": anomaly_type,
+            "description": f"{anomaly_type} incident {index}",
+            "severity": "high",
+        },
+        "assigned_to": assigned_to,
+        "status": "dispatched",
+        "logged_at": 1000.0 + index if logged_at is None else logged_at,
+    }
+
+
+class TestIncidentStore:
+    def setup_method(self):
+        self.store = IncidentStore(hot_window=5, batch_size=3)
+
+    def test_hot_window_is_bounded(self):
+        """Test that only the newest incidents stay in memory"""
+        for index in range(20):
+            self.store.add(_incident(index))
+        recent = self.store.recent()
+        assert [incident["id"] for incident in recent] == [
+            f"incident-{index}" for index in range(15, 20)
+        ]
+        assert self.store.count() == 20
+
+    def test_get_evicted_incident_from_disk(self):
+        """Test that incidents outside the hot window are read from disk"""
+        for index in range(10):
+            self.store.add(_incident(index))
+        incident = self.store.get("incident-0")
+        assert incident["anomaly"]["description"] == "fire incident 0"
+        assert self.store.get("missing") is None
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test that writes wait for batch_size or an explicit flush"""
+        path = str(tmp_path / "incidents.db")
+        store = IncidentStore(path, batch_size=3, flush_interval=60)
+
+        def rows_on_disk():
+            with sqlite3.connect(path) as conn:
+                return conn.execute("SELECT COUNT(*) FROM incidents").fetchone()[0]
+
+        store.add(_incident(0))
+        store.add(_incident(1))
+        assert rows_on_disk() == 0
+        store.add(_incident(2))
+        assert rows_on_disk() == 3
+        store.add(_incident(3))
+        store.maybe_flush()
+        assert rows_on_disk() == 3
+        store.close()
+        assert rows_on_disk() == 4
+
+    def test_history_survives_restart(self, tmp_path):
+        """Test that a reopened store sees earlier incidents and updates"""
+        path = str(tmp_path / "incidents.db")
+        store = IncidentStore(path, synchronous="FULL")
+        incident = _incident(0)
+        store.add(incident)
+        incident["status"] = "resolved"
+        store.update(incident)
+        store.close()
+
+        reopened = IncidentStore(path)
+        assert reopened.recent() == []
+        assert reopened.get("incident-0")["status"] == "resolved"
+        assert len(reopened.query(status="resolved")) == 1
+        reopened.close()
+
+    def test_query_by_time_type_and_assignee(self):
+        """Test indexed queries by time range, type, assignee and status"""
+        for index in range(6):
+            anomaly_type, assignee = (
+                ("fire", "firefighter") if index % 2 else ("security", "police")
+            )
+            self.store.add(_incident(index, anomaly_type, assignee))
+
+        def ids(incidents):
+            return [incident["id"] for incident in incidents]
+
+        assert ids(self.store.query(start=1002, end=1005)) == [
+            "incident-2",
+            "incident-3",
+            "incident-4",
+        ]
+        assert ids(self.store.query(incident_type="FIRE")) == [
+            "incident-1",
+            "incident-3",
+            "incident-5",
+        ]
+        assert ids(self.store.query(assigned_to="police", start=1001)) == [
+            "incident-2",
+            "incident-4",
+        ]
+        assert ids(self.store.query(status="dispatched", limit=2)) == [
+            "incident-0",
+            "incident-1",
+        ]
+
+    def test_in_memory_store_is_capped(self):
+        """Test that an in-memory store keeps only the newest max_rows"""
+        store = IncidentStore(hot_window=5, batch_size=10, max_rows=50)
+        for index in range(200):
+            store.add(_incident(index))
+        store.flush()
+        assert store.count() <= 55
+        assert store.get("incident-199") is not None
+        assert store.get("incident-0") is None
+        assert IncidentStore().max_rows == MEMORY_MAX_ROWS
+
+    def test_rejects_unknown_sync_mode(self):
+        """Test that an invalid synchronous level is rejected"""
+        with pytest.raises(ValueError):
+            IncidentStore(synchronous="SOMETIMES")
+
+
+class TestAdminAgentIncidentStore:
+    def setup_method(self):
+        self.admin_agent = AdminAgent()
+        self.admin_agent.incident_store = IncidentStore(hot_window=2)
+
+    def test_resolve_incident_outside_hot_window(self):
+        """Test that responses resolve incidents already spilled to disk"""
+        anomaly = {"type": "fire", "description": "Fire in lab", "severity": "high"}
+        first = self.admin_agent.log_incident(anomaly, "firefighter")
+        for index in range(3):
+            self.admin_agent.log_incident(
+                dict(anomaly, description=f"Fire {index}"), "firefighter"
+            )
+        assert len(self.admin_agent.incident_log) == 2
+
+        self.admin_agent.process_message(
+            Message(
+                sender="firefighter",
+                receiver=self.admin_agent.agent_id,
+                message_type=MessageType.RESPONSE,
+                content={
+                    "message": "Fire issue has been handled successfully.",
+                    "resolution": "Extinguished",
+                    "correlation_id": first["id"],
+                },
+            )
+        )
+        resolved = self.admin_agent.get_incidents_by_status("resolved")
+        assert [incident["id"] for incident in resolved] == [first["id"]]
+        assert resolved[0]["resolution"] == "Extinguished"
+        assert len(self.admin_agent.open_incidents()) == 3
@@ -0,0 +1,67 @@
+import pytest
+
+from log_monitoring.log_parser import LogParser
+from src.monitoring.keyword_matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    def setup_method(self):
+        self.matcher = KeywordMatcher(
+            {
+                "fire": ["fire", "smoke", "temperature high"],
+                "security": ["unauthorized", "breach"],
+                "hvac": ["fire alarm", "high"],
+            }
+        )
+
+    def test_single_category(self):
+        """Test that a line with one keyword reports its category"""
+        assert self.matcher.match("WARNING: smoke in server room") == ["fire"]
+
+    def test_case_insensitive(self):
+        """Test that matching ignores case"""
+        assert self.matcher.match("ALERT: UNAUTHORIZED login") == ["security"]
+
+    def test_no_match(self):
+        """Test that normal lines match nothing"""
+        assert self.matcher.match("INFO: backup completed") == []
+        assert self.matcher.first_match("INFO: backup completed") is None
+
+    def test_all_categories_in_one_pass(self):
+        """Test that every matching category is returned in table order"""
+        line = "Breach triggered the FIRE ALARM"
+        assert self.matcher.match(line) == ["fire", "security", "hvac"]
+
+    def test_overlapping_keywords(self):
+        """Test that keywords nested inside longer keywords are reported"""
+        assert self.matcher.match("temperature high") == ["fire", "hvac"]
+
+    def test_scan_block(self):
+        """Test that scanning a block yields only matching lines, in order"""
+        text = "INFO: ok\nsmoke seen\nINFO: ok\nBreach and fire alarm"
+        assert list(self.matcher.scan(text)) == [
+            ("smoke seen", ["fire"]),
+            ("Breach and fire alarm", ["fire", "security", "hvac"]),
+        ]
+
+    def test_empty_table(self):
+        """Test that an empty pattern table never matches"""
+        assert KeywordMatcher({}).match("fire") == []
+
+
+class TestLogParser:
+    def setup_method(self):
+        self.parser = LogParser()
+
+    def test_parse_log(self):
+        """Test that the parser reports the first matching category"""
+        assert self.parser.parse_log("ALERT: Smoke detected") == "fire"
+        assert self.parser.parse_log("ERROR: Unauthorized access") == "security"
+        assert self.parser.parse_log("INFO: Normal operation") is None
+
+    def test_parse_categories(self):
+        """Test that the parser can report every matching category"""
+        assert self.parser.parse_categories("attack caused fire") == [
+            "fire",
+            "security",
+        ]
@@ -0,0 +1,300 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+from src.agents.admin_agent import AdminAgent
+from src.agents.base_agent import Message, MessagePriority, MessageType
+from src.routing.llm_client import LLMRoutingClient, parse_batch_decisions
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat completions stub with a fixed latency"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(
+                self.server.max_in_flight, self.server.in_flight
+            )
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+
+        prompt = body["messages"][-1]["content"].lower()
+        if "json array" in body["messages"][0]["content"].lower():
+            with self.server.lock:
+                self.server.batch_requests += 1
+            # One answer per numbered incident; fail_on yields an invalid item
+            answers = [
+                "unknown"
+                if self.server.fail_on and self.server.fail_on in line
+                else "firefighter"
+                if "type: fire" in line
+                else "police"
+                for line in prompt.splitlines()
+                if line[:1].isdigit()
+            ]
+            if self.server.truncate_batch:
+                answers = answers[:-1]
+            answer = "```json\n" + json.dumps(answers) + "\n```"
+        elif self.server.fail_on and self.server.fail_on in prompt:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        else:
+            answer = "firefighter" if "type: fire" in prompt else "police"
+        payload = json.dumps(
+            {"choices": [{"message": {"content": answer}}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _anomaly(index, anomaly_type="fire"):
+    return {
+        "type": anomaly_type,
+        "description": f"{anomaly_type} incident in zone {chr(65 + index)}",
+        "severity": "high",
+    }
+
+
+def _start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.delay = 0.2
+    server.connections = 0
+    server.requests = 0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.fail_on = None
+    server.truncate_batch = False
+    server.batch_requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    return server, url
+
+
+def _stop_stub_server(server):
+    server.shutdown()
+    server.server_close()
+
+
+class TestLLMRoutingClient:
+    def setup_method(self):
+        self.server, self.url = _start_stub_server()
+
+    def teardown_method(self):
+        _stop_stub_server(self.server)
+
+    def test_classify(self):
+        """Test that a single incident is classified through the stub"""
+        client = LLMRoutingClient("key", self.url, "stub-model")
+        assert client.classify(_anomaly(0, "fire")) == "firefighter"
+        assert client.classify(_anomaly(1, "security")) == "police"
+        client.close()
+
+    def test_connections_are_reused(self):
+        """Test that sequential calls reuse one keep-alive connection"""
+        self.server.delay = 0
+        client = LLMRoutingClient("key", self.url, "stub-model")
+        for index in range(5):
+            client.classify(_anomaly(index))
+        client.close()
+        assert self.server.requests == 5
+        assert self.server.connections == 1
+
+    def test_classify_many_is_concurrent_and_ordered(self):
+        """Test that a batch finishes in about one round trip, in order"""
+        client = LLMRoutingClient("key", self.url, "stub-model", max_concurrency=8)
+        anomalies = [
+            _anomaly(index, "fire" if index % 2 else "security")
+            for index in range(8)
+        ]
+        start = time.monotonic()
+        decisions = client.classify_many(anomalies)
+        elapsed = time.monotonic() - start
+        client.close()
+
+        assert decisions == [
+            "firefighter" if index % 2 else "police" for index in range(8)
+        ]
+        # Sequential calls would take 8 * 0.2s
+        assert elapsed < 0.8
+        assert self.server.max_in_flight > 1
+
+    def test_concurrency_limit(self):
+        """Test that no more than max_concurrency requests are in flight"""
+        self.server.delay = 0.05
+        client = LLMRoutingClient("key", self.url, "stub-model", max_concurrency=2)
+        client.classify_many([_anomaly(index) for index in range(6)])
+        client.close()
+        assert self.server.max_in_flight <= 2
+        assert self.server.connections <= 2
+
+    def test_failed_call_returns_none(self):
+        """Test that an API error yields None for that incident only"""
+        self.server.delay = 0
+        self.server.fail_on = "zone b"
+        client = LLMRoutingClient("key", self.url, "stub-model")
+        decisions = client.classify_many([_anomaly(0), _anomaly(1), _anomaly(2)])
+        client.close()
+        assert decisions == ["firefighter", None, "firefighter"]
+
+    def test_classify_many_packs_batches(self):
+        """Test that batch_size incidents share a single request"""
+        self.server.delay = 0
+        client = LLMRoutingClient("key", self.url, "stub-model", batch_size=4)
+        anomalies = [
+            _anomaly(index, "fire" if index % 2 else "security")
+            for index in range(10)
+        ]
+        decisions = client.classify_many(anomalies)
+        client.close()
+
+        assert decisions == [
+            "firefighter" if index % 2 else "police" for index in range(10)
+        ]
+        assert self.server.requests == 3
+        assert self.server.batch_requests == 3
+
+    def test_batch_invalid_item_is_none(self):
+        """Test that an invalid batch item only affects that incident"""
+        self.server.delay = 0
+        self.server.fail_on = "zone b"
+        client = LLMRoutingClient("key", self.url, "stub-model", batch_size=10)
+        decisions = client.classify_many([_anomaly(0), _anomaly(1), _anomaly(2)])
+        client.close()
+        assert decisions == ["firefighter", None, "firefighter"]
+
+    def test_batch_wrong_length_is_all_none(self):
+        """Test that a short batch answer is not matched up positionally"""
+        self.server.delay = 0
+        self.server.truncate_batch = True
+        client = LLMRoutingClient("key", self.url, "stub-model", batch_size=10)
+        decisions = client.classify_many([_anomaly(0), _anomaly(1), _anomaly(2)])
+        client.close()
+        assert decisions == [None, None, None]
+
+
+class TestParseBatchDecisions:
+    def test_parse_plain_array(self):
+        """Test parsing a bare JSON array with mixed case and whitespace"""
+        assert parse_batch_decisions('[" Police", "FIREFIGHTER"]', 2) == [
+            "police",
+            "firefighter",
+        ]
+
+    def test_parse_invalid_answers(self):
+        """Test that non-JSON and non-string items are rejected"""
+        assert parse_batch_decisions("police, police", 2) == [None, None]
+        assert parse_batch_decisions('["police", 3]', 2) == ["police", None]
+        assert parse_batch_decisions('{"a": 1}', 1) == [None]
+
+
+class TestAdminAgentConcurrentRouting:
+    def setup_method(self):
+        self.server, self.url = _start_stub_server()
+        self.admin_agent = AdminAgent()
+        self.admin_agent.message_queue = MagicMock()
+        self.admin_agent.openai_api_key = "test_key"
+        self.admin_agent.openai_url = self.url
+        self.admin_agent.decision_cache.persist_path = None
+        self.admin_agent.decision_cache.clear()
+        self.admin_agent.ai_config = {"batch_size": 1}
+
+    def teardown_method(self):
+        self.admin_agent.llm_client.close()
+        _stop_stub_server(self.server)
+
+    def _inbox(self, count):
+        messages = []
+        for index in range(count):
+            anomaly = _anomaly(index, "fire" if index % 2 else "security")
+            messages.append(
+                Message(
+                    sender="security",
+                    receiver=self.admin_agent.agent_id,
+                    message_type=MessageType.ALERT,
+                    content={"message": anomaly["description"], "anomaly": anomaly},
+                    priority=MessagePriority.HIGH,
+                )
+            )
+        return messages
+
+    def test_inbox_dispatched_in_one_round_trip(self):
+        """Test that a whole inbox of alerts is routed concurrently"""
+        self.admin_agent.message_queue.get_messages.return_value = self._inbox(6)
+        start = time.monotonic()
+        self.admin_agent.process_messages()
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.6
+        assert self.server.requests == 6
+        assigned = [
+            incident["assigned_to"] for incident in self.admin_agent.incident_log
+        ]
+        assert sorted(assigned) == ["firefighter"] * 3 + ["police"] * 3
+        for incident in self.admin_agent.incident_log:
+            expected = (
+                "firefighter"
+                if incident["anomaly"]["type"] == "fire"
+                else "police"
+            )
+            assert incident["assigned_to"] == expected
+
+    def test_concurrent_calls_fall_back_per_incident(self):
+        """Test that one failed classification falls back to the rules"""
+        self.server.delay = 0
+        self.server.fail_on = "zone a"
+        anomalies = [_anomaly(0, "fire"), _anomaly(1, "security")]
+        assert self.admin_agent.determine_response_agents_with_ai(anomalies) == [
+            "firefighter",
+            "police",
+        ]
+        assert self.admin_agent.decision_cache.stats()["size"] == 1
+
+    def test_alert_storm_uses_one_request(self):
+        """Test that a drained inbox is classified in one batched request"""
+        self.admin_agent.ai_config = {"batch_size": 10}
+        self.server.delay = 0
+        self.server.fail_on = "zone c"
+        self.admin_agent.message_queue.get_messages.return_value = self._inbox(8)
+        self.admin_agent.process_messages()
+
+        assert self.server.requests == 1
+        for incident in self.admin_agent.incident_log:
+            expected = (
+                "firefighter"
+                if incident["anomaly"]["type"] == "fire"
+                else "police"
+            )
+            assert incident["assigned_to"] == expected
+        # The invalid item fell back to the rules and was not cached
+        assert self.admin_agent.decision_cache.stats()["size"] == 7
+
+    def test_cached_incidents_skip_the_network(self):
+        """Test that cached decisions are not sent to the API again"""
+        self.server.delay = 0
+        anomalies = [_anomaly(0), _anomaly(1)]
+        self.admin_agent.determine_response_agents_with_ai(anomalies)
+        self.admin_agent.determine_response_agents_with_ai(anomalies)
+        assert self.server.requests == 2
@@ -0,0 +1,133 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from src.agents.admin_agent import AdminAgent
+from src.routing.local_classifier import LocalClassifier, main, training_data
+from src.storage.incident_store import IncidentStore
+
+
+def _incidents(count, seed=0):
+    rng = random.Random(seed)
+    fire = ["smoke in server room", "temperature high in rack", "heat near ups"]
+    security = ["unauthorized access attempt", "intrusion on host", "breach of db"]
+    incidents = []
+    for index in range(count):
+        is_fire = index % 2 == 0
+        incidents.append(
+            {
+                "id": f"incident-{index}",
+                "anomaly": {
+                    "type": "fire" if is_fire else "security",
+                    "description": f"{rng.choice(fire if is_fire else security)} {index}",
+                    "severity": "high",
+                },
+                "assigned_to": "firefighter" if is_fire else "police",
+                "status": "resolved",
+            }
+        )
+    return incidents
+
+
+class TestLocalClassifier:
+    def setup_method(self):
+        self.anomalies, self.labels = training_data(_incidents(200))
+        self.model = LocalClassifier(threshold=0.8).fit(self.anomalies, self.labels)
+
+    def test_training_data_labels_by_assignee(self):
+        """Test that incidents are labelled by who they were assigned to"""
+        incidents = _incidents(4) + [{"anomaly": {"type": "x"}, "assigned_to": "medic"}]
+        anomalies, labels = training_data(incidents)
+        assert labels == ["firefighter", "police", "firefighter", "police"]
+        assert len(anomalies) == 4
+
+    def test_confident_predictions(self):
+        """Test that clear incidents are classified with high confidence"""
+        assert (
+            self.model.classify(
+                {"type": "fire", "description": "smoke in lab", "severity": "high"}
+            )
+            == "firefighter"
+        )
+        assert (
+            self.model.classify(
+                {"type": "security", "description": "intrusion", "severity": "low"}
+            )
+            == "police"
+        )
+        report = self.model.evaluate(self.anomalies, self.labels)
+        assert report["accuracy"] == 1.0
+
+    def test_low_confidence_returns_none(self):
+        """Test that predictions below the threshold defer to the caller"""
+        label, confidence = self.model.predict({"description": "something odd"})
+        assert confidence < 0.8
+        assert self.model.classify({"description": "something odd"}) is None
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved model predicts the same after loading"""
+        path = str(tmp_path / "model.npz")
+        self.model.save(path)
+        loaded = LocalClassifier.load(path)
+        assert loaded.classes == self.model.classes
+        assert loaded.threshold == 0.8
+        anomaly = self.anomalies[3]
+        assert loaded.predict(anomaly) == pytest.approx(self.model.predict(anomaly))
+
+    def test_needs_two_labels(self):
+        """Test that training with a single label is rejected"""
+        with pytest.raises(ValueError):
+            LocalClassifier().fit(self.anomalies[:1], self.labels[:1])
+
+    def test_train_and_evaluate_command(self, tmp_path, capsys):
+        """Test the offline train/evaluate command against an incident store"""
+        db_path = str(tmp_path / "incidents.db")
+        model_path = str(tmp_path / "model.npz")
+        store = IncidentStore(db_path)
+        for incident in _incidents(100):
+            store.add(incident)
+        store.close()
+
+        assert main(["train", "--db", db_path, "--model", model_path]) == 0
+        assert "Trained on 80 incidents" in capsys.readouterr().out
+        assert main(["evaluate", "--db", db_path, "--model", model_path]) == 0
+        assert "'accuracy': 1.0" in capsys.readouterr().out
+
+
+class TestAdminAgentLocalClassifier:
+    def setup_method(self):
+        self.admin_agent = AdminAgent()
+        self.admin_agent.openai_api_key = "test_key"
+        self.admin_agent.decision_cache.persist_path = None
+        self.admin_agent.decision_cache.clear()
+        self.admin_agent.incident_store = IncidentStore()
+        for incident in _incidents(100):
+            self.admin_agent.incident_store.add(incident)
+
+    def test_train_from_incident_history(self):
+        """Test that the local model is trained from logged incidents"""
+        assert self.admin_agent.train_local_classifier(min_samples=50)
+        assert self.admin_agent.local_classifier.trained
+        assert not self.admin_agent.train_local_classifier(min_samples=500)
+
+    @patch("requests.Session.post")
+    def test_confident_incidents_skip_the_llm(self, mock_post):
+        """Test that confident local predictions never call the API"""
+        self.admin_agent.train_local_classifier()
+        anomaly = {"type": "fire", "description": "smoke in hall", "severity": "high"}
+        assert self.admin_agent.determine_response_agent_with_ai(anomaly) == "firefighter"
+        mock_post.assert_not_called()
+        assert self.admin_agent.routing_metrics()["local_decisions"] == 1
+
+    @patch("requests.Session.post")
+    def test_uncertain_incidents_go_to_the_llm(self, mock_post):
+        """Test that low-confidence incidents are sent to the LLM"""
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {
+            "choices": [{"message": {"content": "police"}}]
+        }
+        self.admin_agent.train_local_classifier()
+        anomaly = {"type": "other", "description": "strange noise", "severity": "low"}
+        assert self.admin_agent.determine_response_agent_with_ai(anomaly) == "police"
+        mock_post.assert_called_once()
@@ -0,0 +1,103 @@
+import io
+import os
+import tempfile
+
+import pytest
+
+from log_monitoring.log_generator import LoadGenerator, LogGenerator
+from src.monitoring.log_record import StructuredLogParser
+
+
+class TestLoadGenerator:
+    def test_seeded_output_is_deterministic(self):
+        """Test that the same seed and start time give identical output"""
+        first = LoadGenerator(rate=500, seed=7, start_time=1700000000)
+        second = LoadGenerator(rate=500, seed=7, start_time=1700000000)
+        assert list(first.iter_seconds(3)) == list(second.iter_seconds(3))
+
+    def test_constant_rate(self):
+        """Test that the constant profile emits exactly rate lines/second"""
+        generator = LoadGenerator(rate=250, seed=1, start_time=1700000000)
+        for _, block in generator.iter_seconds(4):
+            assert block.count("\n") == 250
+
+    def test_lines_are_structured(self):
+        """Test that every generated line parses with one timestamp/second"""
+        generator = LoadGenerator(rate=100, seed=1, start_time=1700000000)
+        parser = StructuredLogParser()
+        (_, first), (_, second) = generator.iter_seconds(2)
+        first_records = [parser.parse(l) for l in first.splitlines()]
+        second_records = [parser.parse(l) for l in second.splitlines()]
+        assert {r.timestamp for r in first_records} == {1700000000}
+        assert {r.timestamp for r in second_records} == {1700000001}
+
+    def test_anomaly_ratio(self):
+        """Test that the anomaly share tracks anomaly_ratio"""
+        generator = LoadGenerator(
+            rate=20000, anomaly_ratio=0.25, seed=3, start_time=1700000000
+        )
+        _, block = next(generator.iter_seconds(1))
+        lines = block.splitlines()
+        anomalous = sum(
+            1 for line in lines if any(a in line for a in generator.anomaly_types)
+        )
+        assert 0.23 < anomalous / len(lines) < 0.27
+
+    def test_zero_anomaly_ratio(self):
+        """Test that anomaly_ratio=0 never emits anomalous lines"""
+        generator = LoadGenerator(rate=1000, anomaly_ratio=0, seed=3)
+        _, block = next(generator.iter_seconds(1))
+        assert not any(a in block for a in generator.anomaly_types)
+
+    def test_poisson_and_bursty_profiles(self):
+        """Test that the variable profiles vary around the configured rate"""
+        poisson = LoadGenerator(rate=1000, profile="poisson", seed=5)
+        counts = [poisson.lines_for_second() for _ in range(200)]
+        assert 950 < sum(counts) / len(counts) < 1050
+        assert len(set(counts)) > 1
+
+        bursty = LoadGenerator(
+            rate=100, profile="bursty", burst_probability=0.5, seed=5
+        )
+        counts = {bursty.lines_for_second() for _ in range(50)}
+        assert counts == {100, 1000}
+
+    def test_invalid_profile(self):
+        """Test that an unknown profile is rejected"""
+        with pytest.raises(ValueError):
+            LoadGenerator(profile="sawtooth")
+
+    def test_write_to_file_and_stream(self):
+        """Test buffered writes to a path and to a file object"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "load.log")
+            generator = LoadGenerator(rate=100, seed=1)
+            assert generator.write(path, 3, realtime=False) == 300
+            with open(path) as f:
+                assert len(f.readlines()) == 300
+
+        stream = io.BytesIO()
+        LoadGenerator(rate=10, seed=1).write(stream, 2, realtime=False)
+        assert stream.getvalue().count(b"\n") == 20
+
+    def test_write_leaves_fd_open(self):
+        """Test that writing to a caller's file descriptor does not close it"""
+        read_fd, write_fd = os.pipe()
+        try:
+            assert LoadGenerator(rate=5, seed=1).write(write_fd, 1, realtime=False) == 5
+            os.write(write_fd, b"still open\n")
+            os.close(write_fd)
+            with os.fdopen(read_fd, "rb") as reader:
+                read_fd = None
+                lines = reader.read().splitlines()
+        finally:
+            if read_fd is not None:
+                os.close(read_fd)
+        assert len(lines) == 6
+        assert lines[-1] == b"still open"
+
+    def test_seeded_log_generator(self):
+        """Test that the basic LogGenerator accepts a seed"""
+        first = [line[22:] for line in LogGenerator(seed=9).generate_logs(5)]
+        second = [line[22:] for line in LogGenerator(seed=9).generate_logs(5)]
+        assert first == second
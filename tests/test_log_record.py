@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+from log_monitoring.log_generator import LogGenerator
+from log_monitoring.log_parser import LogParser
+from src.monitoring.anomaly_detector import AnomalyDetector
+from src.monitoring.log_record import LogRecord, StructuredLogParser
+
+
+class TestStructuredLogParser:
+    def setup_method(self):
+        self.parser = StructuredLogParser()
+
+    def test_parse_line(self):
+        """Test that timestamp, level and message are extracted"""
+        record = self.parser.parse(
+            "[2024-01-20 10:30:00] ALERT: Smoke detected in server room"
+        )
+        expected = datetime(2024, 1, 20, 10, 30, 0).timestamp()
+        assert record == LogRecord(
+            expected, "ALERT", "Smoke detected in server room"
+        )
+
+    def test_parse_loose_layout(self):
+        """Test that extra whitespace falls back to the regex path"""
+        record = self.parser.parse("  [2024-01-20 10:30:00]   warning:  disk")
+        assert record.level == "WARNING"
+        assert record.message == "disk"
+
+    def test_unstructured_line(self):
+        """Test that unstructured or invalid lines return None"""
+        assert self.parser.parse("fire detected in server room 3B") is None
+        assert self.parser.parse("[2024-13-45 99:99:99] INFO: bad") is None
+
+    def test_level_must_be_one_word(self):
+        """Test that the fast path and the regex agree on what a level is"""
+        line = "[2024-01-20 10:30:00] Smoke detected: room 5"
+        assert self.parser.parse(line) is None
+        assert self.parser.level_of(line) is None
+        assert self.parser.parse("[2024-01-20 10:30:00] ERROR_2: disk") is None
+
+    def test_timestamp_cache(self):
+        """Test that lines in the same second share one cache entry"""
+        for i in range(100):
+            self.parser.parse(f"[2024-01-20 10:30:00] INFO: line {i}")
+        assert len(self.parser._timestamps) == 1
+
+    def test_iter_records_skips_levels(self):
+        """Test that skipped levels are dropped before parsing"""
+        lines = [
+            "[2024-01-20 10:30:00] INFO: ok",
+            "[2024-01-20 10:30:01] ERROR: Unauthorized access attempt",
+            "not structured",
+        ]
+        records = list(self.parser.iter_records(lines, skip_levels={"info"}))
+        assert [r.level for r in records] == ["ERROR"]
+
+    def test_generator_output_round_trips(self):
+        """Test that every LogGenerator line parses"""
+        for line in LogGenerator().generate_logs(50):
+            assert self.parser.parse(line) is not None
+
+
+class TestEventTimeAnomalies:
+    def test_anomaly_uses_event_time(self):
+        """Test that structured lines carry their event timestamp"""
+        detector = AnomalyDetector({"fire": ["smoke"]})
+        anomalies = detector.detect("[2024-01-20 10:30:00] ALERT: Smoke seen")
+        assert anomalies[0]["timestamp"] == datetime(
+            2024, 1, 20, 10, 30, 0
+        ).timestamp()
+
+    def test_skip_levels(self):
+        """Test that anomalies on skipped levels are suppressed"""
+        detector = AnomalyDetector({"fire": ["smoke"]}, skip_levels={"INFO"})
+        text = (
+            "[2024-01-20 10:30:00] INFO: smoke test passed\n"
+            "[2024-01-20 10:30:01] ALERT: Smoke detected"
+        )
+        anomalies = detector.detect(text)
+        assert len(anomalies) == 1
+        assert "ALERT" in anomalies[0]["description"]
+
+    def test_log_parser_record(self):
+        """Test that LogParser exposes structured records"""
+        record = LogParser().parse_record("[2024-01-20 10:30:00] INFO: ok")
+        assert record.level == "INFO"
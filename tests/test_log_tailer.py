@@ -0,0 +1,179 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from src.agents import MessageType, SecurityAgent
+from src.communication.message_queue import MessageQueue
+from src.monitoring.alert_coalescer import AlertCoalescer
+from src.monitoring.log_tailer import LogTailer
+
+
+class TestLogTailer:
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "security.log")
+        self.checkpoint_path = os.path.join(self.temp_dir.name, "checkpoint")
+        open(self.log_path, "w").close()
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def append(self, text, path=None):
+        with open(path or self.log_path, "a") as f:
+            f.write(text)
+
+    def test_reads_only_new_lines(self):
+        """Test that each call returns only lines appended since the last"""
+        tailer = LogTailer(self.log_path)
+        self.append("line 1\nline 2\n")
+        assert tailer.read_lines() == ["line 1", "line 2"]
+        assert tailer.read_lines() == []
+        self.append("line 3\n")
+        assert tailer.read_lines() == ["line 3"]
+
+    def test_partial_line_is_held_back(self):
+        """Test that an unterminated line waits for its newline"""
+        tailer = LogTailer(self.log_path)
+        self.append("complete\npart")
+        assert tailer.read_lines() == ["complete"]
+        self.append("ial\n")
+        assert tailer.read_lines() == ["partial"]
+
+    def test_checkpoint_survives_restart(self):
+        """Test that a new tailer resumes from the persisted offset"""
+        tailer = LogTailer(self.log_path, checkpoint_path=self.checkpoint_path)
+        self.append("old\n")
+        assert tailer.read_lines() == ["old"]
+        tailer.commit()
+        tailer.close()
+
+        self.append("new\n")
+        restarted = LogTailer(
+            self.log_path, checkpoint_path=self.checkpoint_path
+        )
+        assert restarted.read_lines() == ["new"]
+
+    def test_uncommitted_lines_are_reread(self):
+        """Test that lines read but not committed come back after a restart"""
+        tailer = LogTailer(self.log_path, checkpoint_path=self.checkpoint_path)
+        self.append("handled\n")
+        assert tailer.read_lines() == ["handled"]
+        tailer.commit()
+        self.append("in flight\n")
+        assert tailer.read_lines() == ["in flight"]
+        tailer.close()
+
+        restarted = LogTailer(
+            self.log_path, checkpoint_path=self.checkpoint_path
+        )
+        assert restarted.read_lines() == ["in flight"]
+
+    def test_truncation_restarts_from_beginning(self):
+        """Test that a truncated file is re-read from offset 0"""
+        tailer = LogTailer(self.log_path)
+        self.append("a much longer first line\n")
+        tailer.read_lines()
+
+        with open(self.log_path, "w") as f:
+            f.write("short\n")
+        assert tailer.read_lines() == ["short"]
+
+    def test_rotation_drains_old_file(self):
+        """Test that rotation finishes the old file then follows the new one"""
+        tailer = LogTailer(self.log_path)
+        self.append("before\n")
+        assert tailer.read_lines() == ["before"]
+
+        self.append("tail of old\n")
+        os.rename(self.log_path, self.log_path + ".1")
+        self.append("first of new\n")
+
+        assert tailer.read_lines() == ["tail of old", "first of new"]
+
+    def test_read_is_bounded(self):
+        """Test that at most max_bytes_per_read bytes are consumed per call"""
+        tailer = LogTailer(self.log_path, max_bytes_per_read=12)
+        self.append("aaaa\nbbbb\ncccc\n")
+        assert tailer.read_lines() == ["aaaa", "bbbb"]
+        assert tailer.read_lines() == ["cccc"]
+
+
+class TestSecurityAgentTailing:
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "security.log")
+        open(self.log_path, "w").close()
+
+        self.security_agent = SecurityAgent(admin_id="admin")
+        self.message_queue = MessageQueue()
+        self.security_agent.connect_to_queue(self.message_queue)
+        self.message_queue.register_agent("admin")
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def test_enable_requires_log_file(self):
+        """Test that tailing cannot be enabled without a log file"""
+        with pytest.raises(ValueError):
+            self.security_agent.enable_log_tailing()
+
+    def test_run_alerts_on_appended_lines(self):
+        """Test that run() alerts only on newly appended anomalous lines"""
+        self.security_agent.set_log_file(self.log_path)
+        self.security_agent.enable_log_tailing()
+
+        with open(self.log_path, "a") as f:
+            f.write("[2024-01-20 10:30:00] ALERT: Smoke detected\n")
+        self.security_agent.run()
+        messages = self.message_queue.get_messages("admin")
+        assert len(messages) == 1
+        assert messages[0].message_type == MessageType.ALERT
+        assert messages[0].content["anomaly"]["type"] == "fire"
+
+        self.security_agent.run()
+        assert self.message_queue.get_messages("admin") == []
+
+    def test_run_commits_after_alerting(self):
+        """Test that run() checkpoints the offset only once alerts are sent"""
+        checkpoint_path = os.path.join(self.temp_dir.name, "checkpoint")
+        self.security_agent.set_log_file(self.log_path)
+        self.security_agent.enable_log_tailing(checkpoint_path=checkpoint_path)
+        with open(self.log_path, "a") as f:
+            f.write("[2024-01-20 10:30:00] ALERT: Smoke detected\n")
+
+        def send_alert(anomaly):
+            # Nothing is checkpointed before the alert goes out
+            assert not os.path.exists(checkpoint_path)
+            sent.append(anomaly)
+
+        sent = []
+        self.security_agent.send_alert = send_alert
+        self.security_agent.run()
+        assert len(sent) == 1
+        assert LogTailer(self.log_path, checkpoint_path).offset == os.path.getsize(
+            self.log_path
+        )
+
+    def test_commit_waits_for_coalesced_alerts(self):
+        """Test that lines held in an open coalescer window are not committed"""
+        checkpoint_path = os.path.join(self.temp_dir.name, "checkpoint")
+        self.security_agent.alert_coalescer = AlertCoalescer(window_seconds=60)
+        self.security_agent.set_log_file(self.log_path)
+        self.security_agent.enable_log_tailing(checkpoint_path=checkpoint_path)
+        with open(self.log_path, "a") as f:
+            f.write("[2024-01-20 10:30:00] ALERT: Smoke detected\n")
+
+        for now in (1000.0, 1030.0):
+            with patch("time.time", return_value=now):
+                self.security_agent.run()
+            assert self.message_queue.queue_depth("admin") == 0
+            assert not os.path.exists(checkpoint_path)
+
+        with patch("time.time", return_value=1061.0):
+            self.security_agent.run()
+        assert self.message_queue.queue_depth("admin") == 1
+        assert LogTailer(self.log_path, checkpoint_path).offset == os.path.getsize(
+            self.log_path
+        )
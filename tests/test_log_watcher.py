@@ -0,0 +1,162 @@
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.agents import SecurityAgent
+from src.monitoring.log_watcher import InotifyBackend, LogWatcher, PollingBackend
+
+try:
+    InotifyBackend().close()
+    HAS_INOTIFY = True
+except OSError:
+    HAS_INOTIFY = False
+
+BACKENDS = [
+    pytest.param(
+        True,
+        id="inotify",
+        marks=pytest.mark.skipif(not HAS_INOTIFY, reason="inotify unavailable"),
+    ),
+    pytest.param(False, id="polling"),
+]
+
+
+def append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def poll_until(watcher, predicate, timeout=3.0):
+    """Poll until the accumulated results satisfy predicate"""
+    results = {}
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for path, lines in watcher.poll(timeout=0.1):
+            results.setdefault(path, []).extend(lines)
+        if predicate(results):
+            break
+    return results
+
+
+@pytest.mark.parametrize("use_inotify", BACKENDS)
+class TestLogWatcher:
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = self.temp_dir.name
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def test_many_files(self, use_inotify):
+        """Test that writes to several files are reported per source"""
+        paths = [os.path.join(self.dir, f"sensor{i}.log") for i in range(20)]
+        for path in paths:
+            open(path, "w").close()
+        watcher = LogWatcher(use_inotify=use_inotify)
+        watcher.add_paths(paths)
+        watcher.poll()
+
+        append(paths[3], "three\n")
+        append(paths[17], "seventeen\n")
+        results = poll_until(watcher, lambda r: len(r) == 2)
+        assert results == {paths[3]: ["three"], paths[17]: ["seventeen"]}
+        watcher.close()
+
+    def test_directory_picks_up_new_files(self, use_inotify):
+        """Test that new matching files in a watched directory are tailed"""
+        watcher = LogWatcher(use_inotify=use_inotify)
+        watcher.add_directory(self.dir)
+        assert watcher.poll() == []
+
+        new_path = os.path.join(self.dir, "hvac.log")
+        append(new_path, "compressor started\n")
+        append(os.path.join(self.dir, "ignored.txt"), "not a log\n")
+        results = poll_until(watcher, lambda r: new_path in r)
+        assert results == {new_path: ["compressor started"]}
+        watcher.close()
+
+    def test_idle_poll_returns_nothing(self, use_inotify):
+        """Test that polling without writes returns no data"""
+        path = os.path.join(self.dir, "quiet.log")
+        open(path, "w").close()
+        watcher = LogWatcher(use_inotify=use_inotify)
+        watcher.add_file(path)
+        assert watcher.poll(timeout=0.05) == []
+        watcher.close()
+
+    def test_notifier_signals_writes(self, use_inotify):
+        """Test that the notifier thread calls back when a file is written"""
+        path = os.path.join(self.dir, "door.log")
+        open(path, "w").close()
+        watcher = LogWatcher(use_inotify=use_inotify)
+        watcher.add_file(path)
+        watcher.poll()
+        changed = threading.Event()
+        watcher.start_notifier(changed.set)
+
+        append(path, "door forced\n")
+        assert changed.wait(3)
+        assert watcher.poll() == [(path, ["door forced"])]
+        watcher.close()
+
+
+    def test_file_in_missing_directory(self, use_inotify):
+        """Test that a file can be watched before its directory exists"""
+        path = os.path.join(self.dir, "site", "door", "door.log")
+        watcher = LogWatcher(use_inotify=use_inotify)
+        watcher.add_file(path)
+        assert watcher.poll() == []
+
+        os.makedirs(os.path.dirname(path))
+        append(path, "door forced\n")
+        results = poll_until(watcher, lambda r: path in r)
+        assert results == {path: ["door forced"]}
+        watcher.close()
+
+    def test_failed_watch_leaves_no_tailer(self, use_inotify):
+        """Test that a file is only tailed once its watch is in place"""
+        path = os.path.join(self.dir, "denied.log")
+        watcher = LogWatcher(use_inotify=use_inotify)
+        with patch.object(
+            watcher.backend, "watch_file", side_effect=OSError("denied")
+        ):
+            with pytest.raises(OSError):
+                watcher.add_file(path)
+        assert watcher.tailers == {}
+        watcher.close()
+
+
+class TestPollingBackoff:
+    def test_idle_files_back_off(self):
+        """Test that unchanged files are checked less and less often"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "idle.log")
+            open(path, "w").close()
+            backend = PollingBackend(min_interval=0.01, max_interval=0.08)
+            backend.watch_file(path)
+            backend.wait(0.2)
+            assert backend._intervals[path] == 0.08
+
+
+class TestSecurityAgentWatching:
+    def test_anomalies_tagged_with_source(self):
+        """Test that anomalies from watched files carry their source path"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            agent = SecurityAgent()
+            agent.watch_paths([temp_dir])
+            path = os.path.join(temp_dir, "security.log")
+            append(path, "ALERT: intrusion at gate 4\n")
+
+            anomalies = []
+            deadline = time.monotonic() + 3
+            while not anomalies and time.monotonic() < deadline:
+                anomalies = agent.monitor_watched_files(timeout=0.1)
+            agent.log_watcher.close()
+
+        assert len(anomalies) == 1
+        assert anomalies[0]["type"] == "security"
+        assert anomalies[0]["source_path"] == path
@@ -1,5 +1,10 @@
+import asyncio
+import threading
+import time
+
 import pytest
 from src.communication.message_queue import MessageQueue
+from src.communication.priority_queue import BLOCK, SHED, MultiLevelQueue
 from src.agents.base_agent import Message, MessageType, MessagePriority
 
 
@@ -102,3 +107,280 @@ class TestMessageQueue:
         assert messages[0].priority == MessagePriority.HIGH
         assert messages[1].priority == MessagePriority.MEDIUM
         assert messages[2].priority == MessagePriority.LOW
+
+    def _message(self, text, priority=MessagePriority.HIGH):
+        return Message(
+            sender="agent1",
+            receiver="agent2",
+            message_type=MessageType.ALERT,
+            content={"message": text},
+            priority=priority,
+        )
+
+    def test_equal_priority_is_fifo(self):
+        """Test that messages of equal priority keep their send order"""
+        for index in range(100):
+            self.queue.send_message(self._message(f"alert {index}"))
+
+        messages = self.queue.get_messages("agent2")
+        assert [m.content["message"] for m in messages] == [
+            f"alert {index}" for index in range(100)
+        ]
+
+    def test_mixed_priorities_fifo_within_level(self):
+        """Test priority order across levels and FIFO within each level"""
+        sent = [
+            ("low 1", MessagePriority.LOW),
+            ("high 1", MessagePriority.HIGH),
+            ("medium 1", MessagePriority.MEDIUM),
+            ("high 2", MessagePriority.HIGH),
+            ("low 2", MessagePriority.LOW),
+        ]
+        for text, priority in sent:
+            self.queue.send_message(self._message(text, priority))
+        assert self.queue.queue_depth("agent2") == 5
+
+        messages = self.queue.get_messages("agent2")
+        assert [m.content["message"] for m in messages] == [
+            "high 1",
+            "high 2",
+            "medium 1",
+            "low 1",
+            "low 2",
+        ]
+        assert self.queue.queue_depth("agent2") == 0
+
+    def test_concurrent_senders(self):
+        """Test that concurrent senders lose no messages"""
+        def send(worker):
+            for index in range(1000):
+                self.queue.send_message(self._message(f"{worker}-{index}"))
+
+        threads = [threading.Thread(target=send, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        messages = self.queue.get_messages("agent2")
+        assert len(messages) == 4000
+        # Each sender's messages stay in order
+        for worker in range(4):
+            own = [
+                m.content["message"]
+                for m in messages
+                if m.content["message"].startswith(f"{worker}-")
+            ]
+            assert own == [f"{worker}-{index}" for index in range(1000)]
+
+    def test_send_many(self):
+        """Test bulk send delivers in priority order and skips unknown agents"""
+        batch = [
+            self._message("low", MessagePriority.LOW),
+            self._message("high 1"),
+            self._message("high 2"),
+        ]
+        stray = self._message("stray")
+        stray.receiver = "unknown"
+        batch.append(stray)
+
+        assert self.queue.send_many(batch) == 3
+        messages = self.queue.get_messages("agent2")
+        assert [m.content["message"] for m in messages] == [
+            "high 1",
+            "high 2",
+            "low",
+        ]
+
+    def test_bounded_get_messages(self):
+        """Test that get_messages returns at most max_n messages"""
+        self.queue.send_many(self._message(f"alert {i}") for i in range(10))
+
+        first = self.queue.get_messages("agent2", 4)
+        assert [m.content["message"] for m in first] == [
+            f"alert {i}" for i in range(4)
+        ]
+        assert self.queue.queue_depth("agent2") == 6
+        assert len(self.queue.get_messages("agent2", 100)) == 6
+        assert self.queue.get_messages("agent2", 4) == []
+
+    def test_wait_for_messages(self):
+        """Test that a blocked receiver wakes when a message lands"""
+        assert self.queue.wait_for_messages("agent2", timeout=0.01) is False
+        assert self.queue.wait_for_messages("unknown", timeout=0.01) is False
+
+        timer = threading.Timer(0.05, self.queue.send_message, [self._message("x")])
+        timer.start()
+        start = time.monotonic()
+        assert self.queue.wait_for_messages("agent2", timeout=5) is True
+        assert time.monotonic() - start < 1
+        timer.join()
+        # Already waiting messages return immediately
+        assert self.queue.wait_for_messages("agent2", timeout=0) is True
+
+    def test_wait_for_messages_async(self):
+        """Test the coroutine wait, woken by a sender on another thread"""
+
+        async def scenario():
+            timed_out = await self.queue.wait_for_messages_async(
+                "agent2", timeout=0.01
+            )
+            timer = threading.Timer(
+                0.05, self.queue.send_message, [self._message("x")]
+            )
+            timer.start()
+            woken = await self.queue.wait_for_messages_async("agent2", timeout=5)
+            timer.join()
+            return timed_out, woken
+
+        assert asyncio.run(scenario()) == (False, True)
+        assert self.queue._async_waiters == {}
+
+    def test_wait_for_any(self):
+        """Test waiting for a delivery to any agent"""
+        assert self.queue.wait_for_any(timeout=0.01) is False
+        self.queue.send_message(self._message("x"))
+        assert self.queue.wait_for_any(timeout=0) is True
+        assert self.queue.pending_agents() == ["agent2"]
+        # The wakeup is consumed once seen
+        assert self.queue.wait_for_any(timeout=0.01) is False
+
+
+class TestBoundedMessageQueue:
+    def _message(self, text, priority=MessagePriority.HIGH):
+        return Message(
+            sender="agent1",
+            receiver="agent2",
+            message_type=MessageType.ALERT,
+            content={"message": text},
+            priority=priority,
+        )
+
+    def test_reject_when_full(self):
+        """Test that the reject policy refuses messages once at capacity"""
+        queue = MessageQueue(capacity=2)
+        queue.register_agent("agent2")
+
+        assert queue.send_message(self._message("1")) is True
+        assert queue.send_message(self._message("2")) is True
+        assert queue.send_message(self._message("3")) is False
+        assert queue.send_many([self._message("4"), self._message("5")]) == 0
+        assert queue.queue_depth("agent2") == 2
+        assert queue.drop_counts("agent2")["rejected"] == 3
+
+        queue.get_messages("agent2", 1)
+        assert queue.send_message(self._message("6")) is True
+
+    def test_shed_oldest_lower_priority(self):
+        """Test that HIGH messages displace the oldest LOW, then MEDIUM"""
+        queue = MessageQueue(capacity=3, overflow_policy="shed")
+        queue.register_agent("agent2")
+        queue.send_message(self._message("medium", MessagePriority.MEDIUM))
+        queue.send_message(self._message("low 1", MessagePriority.LOW))
+        queue.send_message(self._message("low 2", MessagePriority.LOW))
+
+        assert queue.send_message(self._message("high 1")) is True
+        assert queue.send_message(self._message("high 2")) is True
+        assert queue.send_message(self._message("high 3")) is True
+        # Nothing left to shed below HIGH, and LOW can never displace
+        assert queue.send_message(self._message("high 4")) is False
+        assert (
+            queue.send_message(self._message("low 3", MessagePriority.LOW))
+            is False
+        )
+
+        messages = queue.get_messages("agent2")
+        assert [m.content["message"] for m in messages] == [
+            "high 1",
+            "high 2",
+            "high 3",
+        ]
+        assert queue.drop_counts() == {"rejected": 2, "shed": 3, "timed_out": 0}
+
+    def test_block_until_room(self):
+        """Test that the block policy waits for a consumer, then times out"""
+        queue = MessageQueue(capacity=1, overflow_policy="block", block_timeout=5)
+        queue.register_agent("agent2")
+        queue.send_message(self._message("1"))
+
+        timer = threading.Timer(0.05, queue.get_messages, ["agent2"])
+        timer.start()
+        assert queue.send_message(self._message("2")) is True
+        timer.join()
+
+        queue.queues["agent2"].block_timeout = 0.01
+        assert queue.send_message(self._message("3")) is False
+        assert queue.drop_counts()["timed_out"] == 1
+        assert [m.content["message"] for m in queue.get_messages("agent2")] == [
+            "2"
+        ]
+
+    def test_per_agent_capacity(self):
+        """Test per-agent capacity overrides and metrics"""
+        queue = MessageQueue(capacity=5, agent_capacities={"agent2": 1})
+        queue.register_agent("agent1")
+        queue.register_agent("agent2")
+
+        metrics = queue.metrics()
+        assert metrics["agent1"]["capacity"] == 5
+        assert metrics["agent2"] == {
+            "depth": 0,
+            "capacity": 1,
+            "policy": "reject",
+            "rejected": 0,
+            "shed": 0,
+            "timed_out": 0,
+        }
+
+    def test_unknown_policy(self):
+        """Test that an unknown overflow policy is rejected"""
+        queue = MessageQueue(capacity=1, overflow_policy="drop-everything")
+        with pytest.raises(ValueError):
+            queue.register_agent("agent2")
+
+
+class TestMultiLevelQueue:
+    def setup_method(self):
+        self.queue = MultiLevelQueue(levels=3)
+
+    def test_get_and_drain(self):
+        """Test single gets and bounded drains across levels"""
+        for item, level in [("c", 2), ("a1", 0), ("b", 1), ("a2", 0)]:
+            self.queue.put(item, level)
+        assert len(self.queue) == 4
+        assert self.queue.get() == "a1"
+        assert self.queue.drain(2) == ["a2", "b"]
+        assert self.queue.drain() == ["c"]
+        assert self.queue.get() is None
+        assert self.queue.empty()
+
+    def test_put_many(self):
+        """Test bulk put keeps levels and order"""
+        assert self.queue.put_many([("b", 1), ("a1", 0), ("a2", 0)]) == 3
+        assert len(self.queue) == 3
+        assert self.queue.drain() == ["a1", "a2", "b"]
+
+    def test_bounded_put_many_blocks_for_consumer(self):
+        """Test that a blocked bulk put wakes consumers and then completes"""
+        queue = MultiLevelQueue(levels=3, maxsize=2, policy=BLOCK, block_timeout=5)
+        received = []
+
+        def consume():
+            while len(received) < 5:
+                if queue.wait(timeout=5):
+                    received.extend(queue.drain())
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        assert queue.put_many((i, 0) for i in range(5)) == 5
+        consumer.join()
+        assert received == [0, 1, 2, 3, 4]
+
+    def test_shed_prefers_lowest_level(self):
+        """Test that shedding evicts from the lowest-priority level first"""
+        queue = MultiLevelQueue(levels=3, maxsize=2, policy=SHED)
+        queue.put("medium", 1)
+        queue.put("low", 2)
+        assert queue.put("high", 0) is True
+        assert queue.drain() == ["high", "medium"]
+        assert queue.dropped["shed"] == 1
@@ -0,0 +1,103 @@
+import pytest
+
+from src.agents import SecurityAgent
+from src.monitoring.rate_detector import RateDetector
+
+
+class TestRateDetector:
+    def test_fires_above_threshold(self):
+        """Test that more than threshold events in the window trigger"""
+        detector = RateDetector(threshold=3, window_seconds=60)
+        assert not detector.record("10.0.0.1", 0)
+        assert not detector.record("10.0.0.1", 10)
+        assert not detector.record("10.0.0.1", 20)
+        assert detector.record("10.0.0.1", 30)
+
+    def test_old_events_expire(self):
+        """Test that events outside the window are not counted"""
+        detector = RateDetector(threshold=3, window_seconds=60)
+        for timestamp in (0, 10, 20):
+            detector.record("10.0.0.1", timestamp)
+        assert not detector.record("10.0.0.1", 75)
+        assert detector.count("10.0.0.1", now=75) == 2
+
+    def test_keys_are_independent(self):
+        """Test that each key has its own window"""
+        detector = RateDetector(threshold=1, window_seconds=60)
+        assert not detector.record("a", 0)
+        assert not detector.record("b", 1)
+        assert detector.record("a", 2)
+
+    def test_alerts_once_per_crossing(self):
+        """Test that a sustained burst does not alert on every event"""
+        detector = RateDetector(threshold=2, window_seconds=60)
+        results = [detector.record("k", t) for t in range(6)]
+        assert results == [False, False, True, False, False, True]
+
+    def test_lru_eviction_bounds_keys(self):
+        """Test that the least recently seen key is evicted at max_keys"""
+        detector = RateDetector(threshold=3, window_seconds=60, max_keys=2)
+        detector.record("a", 0)
+        detector.record("b", 0)
+        detector.record("a", 1)
+        detector.record("c", 2)
+        assert len(detector) == 2
+        assert detector.evictions == 1
+        assert detector.count("b", now=2) == 0
+        assert detector.count("a", now=2) == 2
+
+    def test_invalid_threshold(self):
+        """Test that a non-positive threshold is rejected"""
+        with pytest.raises(ValueError):
+            RateDetector(threshold=0)
+
+
+class TestSecurityAgentLoginFailures:
+    def test_detects_repeated_failures(self):
+        """Test that >3 failures/minute from one IP raise a security anomaly"""
+        agent = SecurityAgent()
+        log = "\n".join(
+            f"[2024-01-20 10:30:0{i}] WARNING: Failed login for user bob from 192.168.1.100"
+            for i in range(3)
+        )
+        assert agent.detect_login_failures(log) == []
+
+        anomalies = agent.detect_login_failures(
+            "[2024-01-20 10:30:03] WARNING: Failed login for user bob from 192.168.1.100"
+        )
+        assert len(anomalies) == 2
+        assert {a["source"] for a in anomalies} == {
+            "ip 192.168.1.100",
+            "user bob",
+        }
+        assert all(a["type"] == "security" for a in anomalies)
+        event_time = agent.log_parser.parse_timestamp("2024-01-20 10:30:03")
+        assert all(a["timestamp"] == event_time for a in anomalies)
+
+    def test_uses_log_event_time(self):
+        """Test that failures logged hours apart do not trigger, however fast they are read"""
+        agent = SecurityAgent()
+        log = "\n".join(
+            f"[2024-01-20 1{i}:00:00] WARNING: Failed login for user bob from 192.168.1.100"
+            for i in range(5)
+        )
+        assert agent.detect_login_failures(log) == []
+
+    def test_unstamped_lines_use_given_time(self):
+        """Test that lines without a timestamp are counted at the given time"""
+        agent = SecurityAgent()
+        line = "WARNING: Failed login from 192.168.1.100"
+        for i in range(3):
+            assert agent.detect_login_failures(line, timestamp=100.0 + i) == []
+        anomalies = agent.detect_login_failures(line, timestamp=103.0)
+        assert [a["timestamp"] for a in anomalies] == [103.0]
+
+    def test_ignores_other_lines(self):
+        """Test that lines without a login failure are not counted"""
+        agent = SecurityAgent()
+        log = "\n".join(
+            "INFO: Successful login for user bob from 192.168.1.100"
+            for _ in range(10)
+        )
+        assert agent.detect_login_failures(log) == []
+        assert len(agent.rate_detector) == 0
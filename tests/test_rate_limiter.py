@@ -0,0 +1,161 @@
+import threading
+import time
+from email.utils import formatdate
+from unittest.mock import MagicMock, patch
+
+from src.routing.llm_client import LLMRoutingClient
+from src.routing.rate_limiter import (
+    RateLimiter,
+    estimate_tokens,
+    parse_retry_after,
+    priority_of,
+)
+
+
+class TestRateLimiter:
+    def test_requests_per_minute(self):
+        """Test that requests beyond the per-minute quota have to wait"""
+        limiter = RateLimiter(requests_per_minute=60)
+        for _ in range(60):
+            assert limiter.acquire(timeout=0)
+        assert not limiter.acquire(timeout=0.05)
+        # One request refills every second
+        assert limiter.metrics()["timeouts"] == 1
+
+    def test_tokens_per_minute(self):
+        """Test that the token quota refills continuously"""
+        limiter = RateLimiter(tokens_per_minute=6000)
+        assert limiter.acquire(6000, timeout=0)
+        # 100 tokens refill per second
+        assert not limiter.acquire(50, timeout=0.1)
+        assert limiter.acquire(50, timeout=1.0)
+
+    def test_urgent_waiters_go_first(self):
+        """Test that a HIGH waiter is served before an earlier LOW one"""
+        limiter = RateLimiter(requests_per_minute=600)
+        for _ in range(600):
+            limiter.acquire(timeout=0)
+        order = []
+
+        def wait(name, priority):
+            limiter.acquire(priority=priority, timeout=2.0)
+            order.append(name)
+
+        low = threading.Thread(target=wait, args=("low", 2))
+        high = threading.Thread(target=wait, args=("high", 0))
+        low.start()
+        time.sleep(0.02)
+        high.start()
+        low.join()
+        high.join()
+        assert order == ["high", "low"]
+
+    def test_defer_blocks_requests(self):
+        """Test that Retry-After deferral holds back every request"""
+        limiter = RateLimiter(requests_per_minute=1000)
+        limiter.defer(0.2)
+        start = time.monotonic()
+        assert limiter.acquire(timeout=1.0)
+        assert time.monotonic() - start >= 0.15
+        assert limiter.metrics()["deferrals"] == 1
+
+    def test_parse_retry_after(self):
+        """Test Retry-After in seconds and HTTP-date form"""
+        assert parse_retry_after("2") == 2.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        later = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+        assert 25 < later <= 30
+
+    def test_estimate_tokens_and_priority(self):
+        """Test token estimates grow with the prompt and severity ranking"""
+        short = estimate_tokens([{"role": "user", "content": "x" * 40}])
+        long = estimate_tokens([{"role": "user", "content": "x" * 400}])
+        assert long - short == 90
+        assert priority_of({"severity": "HIGH"}) < priority_of({"severity": "low"})
+
+
+def _response(status_code, content=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = {"choices": [{"message": {"content": content}}]}
+    return response
+
+
+class TestLLMRoutingClientRateLimits:
+    @patch("requests.Session.post")
+    def test_retry_after_429(self, mock_post):
+        """Test that a 429 is retried after Retry-After instead of failing"""
+        mock_post.side_effect = [
+            _response(429, headers={"Retry-After": "0.1"}),
+            _response(200, "police"),
+        ]
+        limiter = RateLimiter(requests_per_minute=600)
+        client = LLMRoutingClient("key", "http://stub", "m", rate_limiter=limiter)
+        start = time.monotonic()
+        assert client.classify({"type": "security", "severity": "high"}) == "police"
+        assert time.monotonic() - start >= 0.1
+        assert mock_post.call_count == 2
+        assert limiter.metrics()["deferrals"] == 1
+
+    @patch("requests.Session.post")
+    def test_retries_are_bounded(self, mock_post):
+        """Test that persistent 429s give up after max_retries"""
+        mock_post.return_value = _response(429, headers={"Retry-After": "0"})
+        client = LLMRoutingClient(
+            "key", "http://stub", "m", rate_limiter=RateLimiter(), max_retries=2
+        )
+        assert client.classify({"type": "fire"}) is None
+        assert mock_post.call_count == 3
+
+    @patch("requests.Session.post")
+    def test_retry_uses_remaining_deadline(self, mock_post):
+        """Test that a retry's HTTP timeout is what is left of the deadline"""
+        mock_post.side_effect = [
+            _response(429, headers={"Retry-After": "0.3"}),
+            _response(200, "police"),
+        ]
+        client = LLMRoutingClient("key", "http://stub", "m", timeout=1)
+        assert client.classify({"type": "security"}) == "police"
+        first, retry = (call.kwargs["timeout"] for call in mock_post.call_args_list)
+        assert first <= 1
+        assert retry <= 0.7
+
+    @patch("requests.Session.post")
+    def test_expired_deadline_skips_retry(self, mock_post):
+        """Test that no request is sent once the deadline has passed"""
+        mock_post.return_value = _response(429, headers={"Retry-After": "0"})
+        limiter = RateLimiter()
+
+        def slow_acquire(tokens, priority, timeout):
+            # Admitted, but only after most of the deadline has gone
+            time.sleep(0.06)
+            return True
+
+        client = LLMRoutingClient(
+            "key", "http://stub", "m", timeout=0.1, rate_limiter=limiter
+        )
+        with patch.object(limiter, "acquire", side_effect=slow_acquire):
+            assert client.classify({"type": "fire"}) is None
+        assert mock_post.call_count == 1
+
+    @patch("requests.Session.post")
+    def test_urgent_incidents_sent_first(self, mock_post):
+        """Test that classify_many sends HIGH incidents before LOW ones"""
+        sent = []
+
+        def post(url, data, timeout):
+            sent.append("zone-" + data.split("zone-")[1][0])
+            return _response(200, "police")
+
+        mock_post.side_effect = post
+        client = LLMRoutingClient("key", "http://stub", "m", max_concurrency=1)
+        anomalies = [
+            {"description": "zone-a", "severity": "low"},
+            {"description": "zone-b", "severity": "high"},
+            {"description": "zone-c", "severity": "medium"},
+        ]
+        client.classify_many(anomalies, priorities=[2, 0, 1])
+        client.close()
+        assert sent == ["zone-b", "zone-c", "zone-a"]
@@ -69,6 +69,32 @@ class TestFirefighterAgent:
         assert "resolution" in admin_messages[0].content
         assert "original_request" in admin_messages[0].content
 
+    def test_process_messages_is_bounded(self):
+        """Test that one cycle handles at most max_messages_per_cycle"""
+        self.firefighter.max_batch_size = 50
+        self.firefighter.max_messages_per_cycle = 120
+        self.message_queue.send_many(
+            Message(
+                sender="admin_test",
+                receiver="firefighter_test",
+                message_type=MessageType.REQUEST,
+                content={"message": f"Fire {i}", "severity": "high"},
+                priority=MessagePriority.HIGH,
+            )
+            for i in range(250)
+        )
+
+        with patch("builtins.print"):
+            self.firefighter.process_messages()
+        assert len(self.message_queue.get_messages("admin_test")) == 120
+        assert self.message_queue.queue_depth("firefighter_test") == 130
+
+        with patch("builtins.print"):
+            self.firefighter.process_messages()
+            self.firefighter.process_messages()
+        assert len(self.message_queue.get_messages("admin_test")) == 130
+        assert self.message_queue.queue_depth("firefighter_test") == 0
+
 
 class TestPoliceAgent:
     def setup_method(self):
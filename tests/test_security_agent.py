@@ -92,3 +92,20 @@ class TestSecurityAgent:
         # Check that no message was sent to admin
         messages = self.message_queue.get_messages(self.admin_id)
         assert len(messages) == 0
+
+    def test_anomaly_detection_multiple_categories(self):
+        """Test that a line matching both categories yields both anomalies"""
+        sample_log = "ALERT: intrusion attempt set off fire suppression"
+
+        anomalies = self.security_agent.detect_anomalies(sample_log)
+
+        assert [a["type"] for a in anomalies] == ["fire", "security"]
+
+    def test_anomaly_patterns_update(self):
+        """Test that edits to anomaly_patterns are picked up by detection"""
+        self.security_agent.anomaly_patterns["fire"].append("sprinkler")
+
+        anomalies = self.security_agent.detect_anomalies("sprinkler activated")
+
+        assert len(anomalies) == 1
+        assert anomalies[0]["type"] == "fire"
@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+from src.storage.segmented_log import SegmentedLog
+
+
+class TestSegmentedLog:
+    def setup_method(self):
+        self.logs = []
+
+    def teardown_method(self):
+        for log in self.logs:
+            log.close()
+
+    def _open(self, directory, **kwargs):
+        log = SegmentedLog(str(directory), **kwargs)
+        self.logs.append(log)
+        return log
+
+    def test_group_commit(self, tmp_path):
+        """Test that buffered records reach disk on commit"""
+        log = self._open(tmp_path, commit_interval=60)
+        segment_id, ticket = log.append(b"one")
+        _, ticket = log.append_many([b"two", b"three"])
+        assert log.wait_committed(ticket, timeout=5)
+        assert list(log.read(segment_id)) == [b"one", b"two", b"three"]
+
+    def test_background_commit(self, tmp_path):
+        """Test that the flusher commits without being asked"""
+        log = self._open(tmp_path, commit_interval=0.01)
+        segment_id, _ = log.append(b"record")
+        for _ in range(500):
+            if list(log.read(segment_id)):
+                break
+            time.sleep(0.01)
+        assert list(log.read(segment_id)) == [b"record"]
+
+    def test_segments_roll_and_delete(self, tmp_path):
+        """Test rolling at segment_bytes and deleting sealed segments"""
+        log = self._open(tmp_path, segment_bytes=64, commit_interval=60)
+        segment_ids, _ = log.append_many([b"x" * 40 for _ in range(4)])
+        log.commit()
+        assert segment_ids == [0, 1, 2, 3]
+        assert log.segment_ids() == [0, 1, 2, 3]
+
+        log.delete(0)
+        assert log.segment_ids() == [1, 2, 3]
+        with pytest.raises(ValueError):
+            log.delete(log.active_segment)
+
+    def test_reopen_starts_new_segment(self, tmp_path):
+        """Test that a reopened log reads old records and appends after them"""
+        log = self._open(tmp_path)
+        log.append(b"before")
+        log.close()
+
+        reopened = self._open(tmp_path)
+        segment_id, _ = reopened.append(b"after")
+        reopened.commit()
+        assert reopened.segment_ids() == [0, 1]
+        assert segment_id == 1
+        assert list(reopened.read(0)) == [b"before"]
+
+    def test_torn_tail_is_ignored(self, tmp_path):
+        """Test that reads stop at a partially written record"""
+        log = self._open(tmp_path)
+        log.append_many([b"first", b"second"])
+        log.close()
+        path = os.path.join(str(tmp_path), "0000000000000000.log")
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        assert list(self._open(tmp_path).read(0)) == [b"first"]
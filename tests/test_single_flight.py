@@ -0,0 +1,130 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from src.agents.admin_agent import AdminAgent
+from src.routing.single_flight import SingleFlight
+
+
+def _ok_response(content):
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"choices": [{"message": {"content": content}}]}
+    return response
+
+
+class TestSingleFlight:
+    def setup_method(self):
+        self.flight = SingleFlight()
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent callers for one key run the work once"""
+        executions = []
+        results = []
+        barrier = threading.Barrier(8)
+
+        def work():
+            executions.append(1)
+            time.sleep(0.1)
+            return "police"
+
+        def caller():
+            barrier.wait()
+            results.append(self.flight.do("key", work))
+
+        threads = [threading.Thread(target=caller) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["police"] * 8
+        assert len(executions) == 1
+        metrics = self.flight.metrics()
+        assert metrics["collapsed"] == 7
+        assert metrics["executions"] == 1
+        assert metrics["in_flight"] == 0
+
+    def test_keys_are_independent(self):
+        """Test that different keys and later calls are not collapsed"""
+        assert self.flight.do("a", lambda: 1) == 1
+        assert self.flight.do("b", lambda: 2) == 2
+        assert self.flight.do("a", lambda: 3) == 3
+        assert self.flight.metrics()["collapsed"] == 0
+
+    def test_followers_get_the_leader_result(self):
+        """Test that a follower's future resolves with the leader's result"""
+        future, leader = self.flight.claim("key")
+        follower, is_leader = self.flight.claim("key")
+        assert leader and not is_leader
+        assert follower is future
+        self.flight.resolve("key", None)
+        assert follower.result(timeout=1) is None
+
+    def test_failed_leader_releases_key(self):
+        """Test that an exception in the leader does not leave the key stuck"""
+
+        def fail():
+            raise RuntimeError("boom")
+
+        try:
+            self.flight.do("key", fail)
+        except RuntimeError:
+            pass
+        assert self.flight.metrics()["in_flight"] == 0
+        assert self.flight.do("key", lambda: "police") == "police"
+
+
+class TestAdminAgentSingleFlight:
+    def setup_method(self):
+        self.admin_agent = AdminAgent()
+        self.admin_agent.openai_api_key = "test_key"
+        self.admin_agent.ai_config = {"batch_size": 1}
+        self.admin_agent.decision_cache.persist_path = None
+        self.admin_agent.decision_cache.clear()
+
+    def _anomaly(self, index):
+        return {
+            "type": "fire",
+            "description": f"Smoke detected in rack {index}",
+            "severity": "high",
+            "timestamp": time.time(),
+        }
+
+    @patch("requests.Session.post")
+    def test_duplicates_in_a_batch_share_one_call(self, mock_post):
+        """Test that identical incidents in one inbox cost a single call"""
+        mock_post.return_value = _ok_response("firefighter")
+        decisions = self.admin_agent.determine_response_agents_with_ai(
+            [self._anomaly(index) for index in range(5)]
+        )
+        assert decisions == ["firefighter"] * 5
+        assert mock_post.call_count == 1
+        assert self.admin_agent.routing_metrics()["single_flight"]["collapsed"] == 4
+
+    @patch("requests.Session.post")
+    def test_concurrent_routing_shares_one_call(self, mock_post):
+        """Test that concurrent threads routing the same incident share a call"""
+
+        def slow_post(*args, **kwargs):
+            time.sleep(0.2)
+            return _ok_response("firefighter")
+
+        mock_post.side_effect = slow_post
+        results = []
+        barrier = threading.Barrier(4)
+
+        def route(index):
+            barrier.wait()
+            results.append(
+                self.admin_agent.determine_response_agent_with_ai(self._anomaly(index))
+            )
+
+        threads = [threading.Thread(target=route, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["firefighter"] * 4
+        assert mock_post.call_count == 1
@@ -0,0 +1,74 @@
+import io
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.agents import MessageType, SecurityAgent
+from src.communication.message_queue import MessageQueue
+
+
+class TestStreamingDetection:
+    def setup_method(self):
+        self.security_agent = SecurityAgent(admin_id="admin")
+        self.message_queue = MessageQueue()
+        self.security_agent.connect_to_queue(self.message_queue)
+        self.message_queue.register_agent("admin")
+
+    def test_iter_anomalies_is_lazy(self):
+        """Test that anomalies are yielded before the source is exhausted"""
+        consumed = []
+
+        def lines():
+            for line in ["INFO: ok", "ALERT: smoke", "INFO: ok"]:
+                consumed.append(line)
+                yield line
+            raise AssertionError("source read past the first batch")
+
+        detector = self.security_agent.detector
+        anomaly = next(detector.iter_detect(lines(), batch_size=2))
+        assert anomaly["type"] == "fire"
+        assert consumed == ["INFO: ok", "ALERT: smoke"]
+
+    def test_bytes_lines(self):
+        """Test that byte lines with newlines are accepted"""
+        source = [b"ALERT: intrusion detected\n", b"INFO: ok\n"]
+        anomalies = list(self.security_agent.iter_anomalies(source))
+        assert len(anomalies) == 1
+        assert anomalies[0]["description"] == (
+            "Security issue detected: ALERT: intrusion detected"
+        )
+
+    def test_file_objects(self):
+        """Test that text and binary file objects can be streamed"""
+        text = "INFO: ok\nWARNING: fire in lab\n"
+        for source in (io.StringIO(text), io.BytesIO(text.encode())):
+            anomalies = list(self.security_agent.iter_anomalies(source))
+            assert [a["type"] for a in anomalies] == ["fire"]
+
+    def test_list_api_matches_stream(self):
+        """Test that detect_anomalies is equivalent to the streaming API"""
+        text = "smoke\nINFO: ok\nbreach\nfire and intrusion"
+        streamed = list(self.security_agent.iter_anomalies(text.split("\n")))
+        listed = self.security_agent.detect_anomalies(text)
+        assert [a["description"] for a in streamed] == [
+            a["description"] for a in listed
+        ]
+
+    def test_stream_alerts(self):
+        """Test that streamed lines are coalesced and sent as alerts"""
+        source = io.StringIO("ALERT: smoke in lab 1\n" * 100 + "ALERT: breach\n")
+        self.security_agent.send_alert = MagicMock()
+        sent = self.security_agent.stream_alerts(source)
+
+        assert sent == 2
+        alerts = [c.args[0] for c in self.security_agent.send_alert.call_args_list]
+        assert sorted(a["count"] for a in alerts) == [1, 100]
+
+    def test_stream_alerts_sends_messages(self):
+        """Test that streamed alerts reach the admin queue"""
+        self.security_agent.stream_alerts(["ALERT: smoke"] * 10)
+
+        messages = self.message_queue.get_messages("admin")
+        assert len(messages) == 1
+        assert messages[0].message_type == MessageType.ALERT
+        assert messages[0].content["anomaly"]["count"] == 10
@@ -0,0 +1,160 @@
+import socket
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.agents import MessageType, SecurityAgent
+from src.communication.message_queue import MessageQueue
+from src.monitoring.syslog_server import (
+    SyslogFramer,
+    SyslogServer,
+    parse_rfc5424,
+)
+
+FRAME = (
+    b'<165>1 2003-10-11T22:14:15.003Z mymachine.example.com evntslog - ID47 '
+    b'[exampleSDID@32473 iut="3" eventSource="App\\]lication"] '
+    b"\xef\xbb\xbfAn application event log entry"
+)
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestRfc5424Parsing:
+    def test_parse_full_frame(self):
+        """Test header, structured data and BOM-prefixed message parsing"""
+        record = parse_rfc5424(FRAME)
+        assert record.facility == 20
+        assert record.severity == 5
+        assert record.timestamp == pytest.approx(
+            datetime(2003, 10, 11, 22, 14, 15, 3000, timezone.utc).timestamp()
+        )
+        assert record.hostname == "mymachine.example.com"
+        assert record.app_name == "evntslog"
+        assert record.procid is None
+        assert record.msgid == "ID47"
+        assert record.structured_data.endswith('App\\]lication"]')
+        assert record.message == "An application event log entry"
+
+    def test_parse_nil_fields(self):
+        """Test a frame with nil timestamp, structured data and no message"""
+        record = parse_rfc5424("<34>1 - host app - - -")
+        assert record.timestamp is None
+        assert record.structured_data is None
+        assert record.message == ""
+
+    def test_parse_timezone_offset(self):
+        """Test that numeric offsets are applied"""
+        record = parse_rfc5424("<34>1 2003-08-24T05:14:15.000003-07:00 h a 1 - - m")
+        expected = datetime(2003, 8, 24, 12, 14, 15, 3, timezone.utc).timestamp()
+        assert record.timestamp == pytest.approx(expected)
+
+    def test_malformed(self):
+        """Test that non-RFC5424 input is rejected"""
+        assert parse_rfc5424(b"hello world") is None
+        assert parse_rfc5424(b"<999>1 - h a - - - msg") is None
+
+
+class TestSyslogFramer:
+    def test_octet_counted_across_reads(self):
+        """Test that octet-counted frames may be split across reads"""
+        framer = SyslogFramer()
+        stream = b"5 hello11 hello world"
+        assert framer.feed(stream[:4]) == []
+        assert framer.feed(stream[4:12]) == [b"hello"]
+        assert framer.feed(stream[12:]) == [b"hello world"]
+
+    def test_newline_delimited(self):
+        """Test non-transparent framing"""
+        framer = SyslogFramer()
+        assert framer.feed(b"<1>1 a\n<1>1 b\n<1>1") == [b"<1>1 a", b"<1>1 b"]
+        assert framer.feed(b" c\n") == [b"<1>1 c"]
+
+    def test_oversized_frame(self):
+        """Test that an oversized octet count is rejected"""
+        with pytest.raises(ValueError):
+            SyslogFramer(max_frame_size=10).feed(b"100 x")
+
+
+class TestSyslogServer:
+    def setup_method(self):
+        self.security_agent = SecurityAgent(admin_id="admin")
+        self.message_queue = MessageQueue()
+        self.security_agent.connect_to_queue(self.message_queue)
+        self.message_queue.register_agent("admin")
+        self.server = SyslogServer(
+            self.security_agent, udp_port=0, tcp_port=0, coalesce_window=0
+        )
+
+    def teardown_method(self):
+        self.server.stop()
+
+    def test_tcp_octet_counted_ingestion(self):
+        """Test that TCP frames are parsed and alerts reach the admin"""
+        self.server.start()
+        frames = [
+            b"<34>1 2024-01-20T10:30:%02dZ gw sshd - - - intrusion from 10.0.0.1"
+            % i
+            for i in range(50)
+        ] + [b"<14>1 - gw app - - - all quiet"]
+        payload = b"".join(b"%d %s" % (len(f), f) for f in frames)
+        with socket.create_connection(("127.0.0.1", self.server.tcp_port)) as s:
+            s.sendall(payload)
+
+        assert wait_for(lambda: self.server.stats["received"] == 51)
+        assert wait_for(lambda: self.message_queue.queue_depth("admin") == 1)
+        alert = self.message_queue.get_messages("admin")[0]
+        assert alert.message_type == MessageType.ALERT
+        anomaly = alert.content["anomaly"]
+        assert anomaly["type"] == "security"
+        assert anomaly["count"] == 50
+        assert anomaly["source_host"] == "gw"
+
+    def test_udp_ingestion(self):
+        """Test that UDP datagrams are ingested"""
+        self.server.start()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.sendto(
+                b"<34>1 - sensor smoked - - - smoke in sector A",
+                ("127.0.0.1", self.server.udp_port),
+            )
+        assert wait_for(lambda: self.message_queue.queue_depth("admin") == 1)
+        assert self.message_queue.get_messages("admin")[0].content["anomaly"][
+            "type"
+        ] == "fire"
+
+    def test_hosts_are_alerted_separately(self):
+        """Test that the same message from two hosts raises two alerts"""
+        alerts = self.server.process_frames(
+            [
+                b"<34>1 - hostA smoked - - - Smoke detected in lab",
+                b"<34>1 - hostB smoked - - - Smoke detected in lab",
+                b"<34>1 - hostA smoked - - - Smoke detected in lab",
+            ]
+        )
+        assert sorted((a["source_host"], a["count"]) for a in alerts) == [
+            ("hostA", 2),
+            ("hostB", 1),
+        ]
+
+    def test_backpressure_when_admin_saturated(self):
+        """Test that batches are held while the admin queue is saturated"""
+        self.server.max_admin_queue_depth = 1
+        self.security_agent.send_alert({"type": "fire", "description": "x"})
+        self.server.start()
+        with socket.create_connection(("127.0.0.1", self.server.tcp_port)) as s:
+            s.sendall(b"<34>1 - gw app - - - breach detected\n")
+
+        assert wait_for(lambda: self.server.stats["backpressure_waits"] > 2)
+        assert self.server.stats["received"] == 0
+
+        self.message_queue.get_messages("admin")
+        assert wait_for(lambda: self.server.stats["received"] == 1)
@@ -1,10 +1,13 @@
+import json
 import os
+import threading
 import tempfile
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from src.agents import AdminAgent, FirefighterAgent, PoliceAgent, SecurityAgent
+from src.communication.durable_queue import DurableMessageQueue
 from src.communication.message_queue import MessageQueue
 from src.system.system_controller import SystemController
 
@@ -65,6 +68,110 @@ class TestSystemIntegration:
         # Check that the message queue was created
         assert self.system.message_queue is not None
 
+    def test_responder_pools(self):
+        """Test that configured responder pools are created and registered"""
+        system = SystemController(self.temp_config.name)
+        system.config.set("responder_pool_sizes", {"firefighter": 3, "police": 2})
+        system.agents.clear()
+        system._initialize_agents()
+
+        admin_agent = system.agents["admin"]
+        assert admin_agent.responder_pools == {
+            "firefighter": ["firefighter", "firefighter-2", "firefighter-3"],
+            "police": ["police", "police-2"],
+        }
+        assert isinstance(system.agents["firefighter-3"], FirefighterAgent)
+        assert isinstance(system.agents["police-2"], PoliceAgent)
+        assert "police-2" in system.message_queue.queues
+
+    def test_messages_dispatched_between_cycles(self):
+        """Test that alerts are handled as they arrive, not at the next cycle"""
+        self.system.start()
+        security_agent = self.system.agents["security"]
+        admin_agent = self.system.agents["admin"]
+        anomaly = {
+            "type": "fire",
+            "description": "Fire detected in server room",
+            "severity": "high",
+        }
+        timer = threading.Timer(0.05, security_agent.send_alert, [anomaly])
+        timer.start()
+
+        self.system.wait_and_dispatch(0.5)
+        timer.join()
+
+        # Admin dispatched, firefighter responded and admin saw the response
+        assert len(admin_agent.incident_log) == 1
+        assert admin_agent.incident_log[0]["status"] == "resolved"
+        assert self.system.message_queue.pending_agents() == []
+        self.system.stop()
+
+    def test_log_writes_wake_dispatch(self, tmp_path):
+        """Test that a write to a watched log is handled before the next cycle"""
+        sensors = tmp_path / "sensors"
+        sensors.mkdir()
+        with open(self.temp_config.name, "w") as f:
+            json.dump(
+                {
+                    "simulation_mode": False,
+                    "log_file_path": str(tmp_path / "system.log"),
+                    "watch_paths": [str(sensors)],
+                    "watch_checkpoint_dir": str(tmp_path / "checkpoints"),
+                    "incident_store": {"path": str(tmp_path / "incidents.db")},
+                },
+                f,
+            )
+        system = SystemController(self.temp_config.name)
+        system.start()
+        admin_agent = system.agents["admin"]
+        log_path = str(sensors / "hvac.log")
+
+        def write_log():
+            with open(log_path, "a") as log:
+                log.write("[2024-01-20 10:30:00] ALERT: Smoke detected\n")
+
+        timer = threading.Timer(0.05, write_log)
+        timer.start()
+        system.wait_and_dispatch(1.0)
+        timer.join()
+        system.stop()
+
+        assert len(admin_agent.incident_log) == 1
+        assert admin_agent.incident_log[0]["anomaly"]["source_path"] == log_path
+
+    def test_message_queue_limits(self):
+        """Test that queue capacity and overflow policy come from config"""
+        system = SystemController(self.temp_config.name)
+        metrics = system.message_queue.metrics()
+        assert metrics["admin"]["capacity"] == 10000
+        assert metrics["admin"]["policy"] == "shed"
+
+    def test_durable_message_queue(self, tmp_path):
+        """Test that durable mode replays queued messages after a restart"""
+        with open(self.temp_config.name, "w") as f:
+            json.dump(
+                {
+                    "simulation_mode": True,
+                    "message_queue": {
+                        "durable": True,
+                        "wal_dir": str(tmp_path / "wal"),
+                    },
+                },
+                f,
+            )
+        system = SystemController(self.temp_config.name)
+        assert isinstance(system.message_queue, DurableMessageQueue)
+        system.agents["security"].send_alert(
+            {"type": "fire", "description": "Fire in lab", "severity": "high"}
+        )
+        # Crash before the admin processes the alert
+        system.message_queue.log.close()
+
+        restarted = SystemController(self.temp_config.name)
+        alert = restarted.message_queue.get_messages("admin")[0]
+        assert alert.content["anomaly"]["description"] == "Fire in lab"
+        restarted.message_queue.close()
+
     def test_agent_connections(self):
         """Test that all agents are connected to the message queue"""
         for agent in self.system.agents.values():